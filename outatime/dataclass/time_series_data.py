@@ -1,4 +1,4 @@
-import pickle
+from copy import deepcopy
 from dataclasses import dataclass
 from datetime import date
 
@@ -8,5 +8,6 @@ class TimeSeriesData:
     day: date
     data: ...
 
-    def __deepcopy__(self, *args):
-        return pickle.loads(pickle.dumps(self))
+    def __deepcopy__(self, memo=None):
+        # dates are immutable, only the data needs to be copied
+        return TimeSeriesData(day=self.day, data=deepcopy(self.data, memo))
@@ -1,5 +1,6 @@
 from datetime import date
 from abc import abstractmethod, ABC
+from typing import List
 
 from ..util.agenda import *
 from ..util.relativedelta import relativedelta
@@ -61,6 +62,25 @@ class Granularity(ABC):
         """
         pass
 
+    def period_key(self, day: date) -> int:
+        """
+        Map the given date to an integer that identifies its granularity
+        period. Keys are increasing with the periods, so sorted dates get
+        sorted keys and two dates share a period only if they share the key.
+
+        Example:
+            (with a Monthly granularity)
+            day = 2022-04-16
+            returns 24267 (2022 * 12 + 3)
+
+        Args:
+            day (date): Input date.
+
+        Returns:
+            int: Key of the granularity step.
+        """
+        return self.get_beginning_of_granularity(day).toordinal()
+
     def get_n_day_of_granularity(self, day: date, idx: int) -> date:
         """
         Move the given date to N-th day of its granularity period.
@@ -104,12 +124,32 @@ class Granularity(ABC):
         Returns:
             date: N-th day of the week of the granularity step.
         """
-        assert 0 <= weekday <= 6, "Weekday must be between 0 and 6."
         first_day = self.get_beginning_of_granularity(day)
         last_day = self.get_end_of_granularity(day)
-        n_days, days = weekdays_of_range(first_day, last_day, weekday)
-        assert -1 <= idx < n_days, "Index must be between -1 and the total number of the specific weekday in the granularity."
-        return days[idx]
+        return nth_weekday_of_range(first_day, last_day, weekday, idx)
+
+    def get_n_weekdays_of_granularity(self, start_date: date, end_date: date, weekday: int, idx: int) -> List[date]:
+        """
+        Batched version of get_n_weekday_of_granularity: searches the N-th
+        required day of the week of each granularity period between the
+        given dates at once.
+
+        Args:
+            start_date (date): A day of the first period.
+            end_date (date): A day of the last period.
+            weekday (int): Number of the day of the week (0-indexed).
+            idx (int): Number of the day to retrieve (0-indexed).
+
+        Returns:
+            List[date]: N-th day of the week of each granularity step.
+        """
+        first_days, last_days = [], []
+        day = self.get_beginning_of_granularity(start_date)
+        while day <= end_date:
+            first_days.append(day)
+            last_days.append(self.get_end_of_granularity(day))
+            day = self.get_beginning_of_granularity(day + self.delta)
+        return nth_weekdays_of_ranges(first_days, last_days, weekday, idx)
 
 
 class YearlyGranularity(Granularity):
@@ -122,6 +162,9 @@ class YearlyGranularity(Granularity):
     def get_end_of_granularity(self, day: date) -> date:
         return last_day_of_year(day)
 
+    def period_key(self, day: date) -> int:
+        return day.year
+
     def assert_included_day(self, day: date, days: int):
         assert -1 <= days < days_of_year(day), assertion_err_msg
 
@@ -136,6 +179,9 @@ class QuarterlyGranularity(Granularity):
     def get_end_of_granularity(self, day: date) -> date:
         return last_day_of_quarter(day)
 
+    def period_key(self, day: date) -> int:
+        return day.year * 4 + (day.month - 1) // 3
+
     def assert_included_day(self, day: date, days: int):
         assert -1 <= days < days_of_quarter(day), assertion_err_msg
 
@@ -150,6 +196,9 @@ class MonthlyGranularity(Granularity):
     def get_end_of_granularity(self, day: date) -> date:
         return last_day_of_month(day)
 
+    def period_key(self, day: date) -> int:
+        return day.year * 12 + day.month - 1
+
     def assert_included_day(self, day: date, days: int):
         assert -1 <= days < days_of_month(day), assertion_err_msg
 
@@ -164,6 +213,10 @@ class WeeklyGranularity(Granularity):
     def get_end_of_granularity(self, day: date) -> date:
         return last_day_of_week(day)
 
+    def period_key(self, day: date) -> int:
+        # ordinal 1 (0001-01-01) is a Monday
+        return (day.toordinal() - 1) // 7
+
     def assert_included_day(self, day: date, days: int):
         assert -1 <= days < 7, assertion_err_msg
 
@@ -186,3 +239,6 @@ class DailyGranularity(Granularity):
 
     def get_end_of_granularity(self, day: date) -> date:
         return day
+
+    def period_key(self, day: date) -> int:
+        return day.toordinal()
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from typing import Callable, Any, List, Optional, Tuple, Union
+
+from dateutil import relativedelta as rd
+
+from ..granularity.granularity import Granularity
+from ..util.agenda import shift_months
+from ..util.relativedelta import relativedelta
+
+
+def calendar_steps(offset) -> Optional[Tuple[int, int]]:
+    """
+    Number of months and days of a relativedelta made only of years, months
+    and days, None for any other offset.
+    """
+    if not isinstance(offset, rd.relativedelta):
+        return None
+    months = offset.years * 12 + offset.months
+    if not rd.relativedelta.__eq__(offset, rd.relativedelta(months=months, days=offset.days)):
+        return None
+    return months, offset.days
+
+
+def to_delta(span: Union[Granularity, relativedelta, timedelta, int]) -> Union[relativedelta, timedelta]:
+    """
+    Length of time of a granularity step, a relativedelta or a number of
+    days. Lengths with a fixed number of days are returned as timedelta,
+    faster to add to dates.
+    """
+    if isinstance(span, Granularity):
+        span = span.delta
+    if isinstance(span, int):
+        return timedelta(days=span)
+    steps = calendar_steps(span)
+    if steps is not None and steps[0] == 0:
+        return timedelta(days=span.days)
+    return span
+
+
+def shifted_indexes(length: int, periods: int) -> List[Optional[int]]:
+    """
+    Index of the element 'periods' rows before each element, None when out
+    of range (negative periods look forward).
+    """
+    return [idx - periods if 0 <= idx - periods < length else None for idx in range(length)]
+
+
+def lagged_indexes(dates: List[date], offset: Union[relativedelta, timedelta]) -> List[Optional[int]]:
+    """
+    Index of the element of the day 'offset' before each date, None when the
+    day is not available (negative offsets look forward).
+    Shifted dates are still sorted, so they are merged with the dates in a
+    single pass.
+
+    Args:
+        dates (List[date]): Sorted list of dates.
+        offset (Union[relativedelta, timedelta]): Distance of the days to
+        look for.
+
+    Returns:
+        List[Optional[int]]: Index of the lagged day of each date.
+    """
+    steps = calendar_steps(offset)
+    if steps is None:
+        targets = (day - offset for day in dates)
+    else:
+        months, days = steps
+        targets = (shift_months(day, -months) - timedelta(days=days) for day in dates)
+
+    idxs, j = [], 0
+    for target in targets:
+        while j < len(dates) and dates[j] < target:
+            j += 1
+        idxs.append(j if j < len(dates) and dates[j] == target else None)
+    return idxs
+
+
+def source_indexes(dates: List[date], periods: int = 1, offset=None) -> List[Optional[int]]:
+    """
+    Index of the element to compare with each date: 'periods' rows before,
+    or the day 'offset' before if given (see to_delta for the offset types).
+    """
+    if offset is None:
+        return shifted_indexes(len(dates), periods)
+    return lagged_indexes(dates, to_delta(offset))
+
+
+def pct_change(current, previous):
+    """Relative change between two values, None if the previous one is 0."""
+    if previous == 0:
+        return None
+    return current / previous - 1
+
+
+def compare_sources(
+        values: List[Any],
+        idxs: List[Optional[int]],
+        method: Callable[[Any, Any], Any]
+) -> List[Any]:
+    """
+    Apply the method to each value and the value of its source index, None
+    when any of them is missing.
+    """
+    return [
+        None if idx is None or value is None or values[idx] is None else method(value, values[idx])
+        for value, idx in zip(values, idxs)
+    ]
@@ -1,15 +1,20 @@
 from copy import deepcopy
-from typing import List, Callable, Any
+from typing import Iterator, List, Callable, Any, Union
+
+import numpy as np
+
 from ..dataclass.time_series_data import TimeSeriesData
 from ..granularity.granularity import Granularity, WeeklyGranularity
-from ..granularity.utils import get_first_available_beginning
+from ..timeseries.columnar import ColumnarTimeSeries, is_dict_data, to_day_array
+from ..timeseries.groupby import group_by_granularity, iter_batches
 from ..timeseries.time_series import TimeSeries
-from ..util.bisect import *
+from ..timeseries.view import TimeSeriesView
+from ..util.bisect import indexes_of
 
 
 def aggregate(
         ts: TimeSeries,
-        method: Callable[[List[Any]], Any],
+        method: Union[str, Callable[[List[Any]], Any]],
         granularity: Granularity = WeeklyGranularity(),
         first_day_of_batch: int = 0,
         last_day_of_batch: int = -1,
@@ -21,11 +26,22 @@ def aggregate(
     of the given granularity. Then aggregates each sub-set data into a single 
     TimeSeriesData to generate a new TimeSeries output.
 
+    A ColumnarTimeSeries input is aggregated by columns, applying the method
+    separately to the values of each column (see
+    ColumnarTimeSeries.reduce_batches), and generates a ColumnarTimeSeries.
+
+    The method can be the name of a built-in reducer: 'sum', 'mean', 'min',
+    'max', 'count', 'first', 'last' or 'std'. Numeric data (or each numeric
+    key of dict data) is then reduced for all batches with a single array
+    operation. None values are skipped. 'first' and 'last' keep the original
+    values of a TimeSeries input.
+
     Args:
         ts (TimeSeries): Input time series.
         granularity (Granularity, optional): Time step to use to divide the 
         input series. Defaults to WeeklyGranularity().
-        method (Callable[[List[Any]], Any]): Aggregation function to apply.
+        method (Union[str, Callable[[List[Any]], Any]]): Aggregation
+        function, or reducer name, to apply.
         first_day_of_batch (int, optional): The day of the time step to use as
         first delimiter (0-indexed). Defaults to 0.
         last_day_of_batch (int, optional): The day of the time step to use as
@@ -46,42 +62,139 @@ def aggregate(
 
     res = []
 
-    end_date = ts.end_date if drop_tails else granularity.get_end_of_granularity(ts.end_date)
-
-    if drop_tails:
-        start_date = get_first_available_beginning(
-            day=ts.start_date,
-            input_granularity=ts.data_granularity,
-            output_granularity=granularity
+    batches = group_by_granularity(
+        dates=ts.dates,
+        granularity=granularity,
+        first_day_of_batch=first_day_of_batch,
+        last_day_of_batch=last_day_of_batch,
+        drop_tails=drop_tails,
+        data_granularity=ts.data_granularity,
+    )
+
+    days = [granularity.get_n_day_of_granularity(day=batch.first_day, idx=store_day_of_batch) for batch in batches]
+    starts = [batch.start for batch in batches]
+    stops = [batch.stop for batch in batches]
+
+    if isinstance(ts, ColumnarTimeSeries):
+        return ts.reduce_batches(days, starts, stops, method, data_granularity=granularity)
+    if method in ('first', 'last'):
+        # picked from the elements: numeric columns would turn mixed int and float values to float
+        is_dict = is_dict_data([element.data for element in ts])
+        for day, start, stop in zip(days, starts, stops):
+            idxs = range(start, stop) if method == 'first' else range(stop - 1, start - 1, -1)
+            res.append(TimeSeriesData(day=day, data=pick_first([ts[idx].data for idx in idxs], is_dict)))
+        return TimeSeries(res, data_granularity=granularity)
+    if isinstance(method, str):
+        columnar_ts = ColumnarTimeSeries.from_time_series(ts)
+        return columnar_ts.reduce_batches(days, starts, stops, method, data_granularity=granularity).to_time_series()
+
+    for day, start, stop in zip(days, starts, stops):
+        res.append(
+            TimeSeriesData(
+                day=day,
+                data=method([ts[idx].data for idx in range(start, stop)])
+            )
         )
-    else:
-        start_date = ts.start_date
 
-    batch_beginning = granularity.get_n_day_of_granularity(start_date, first_day_of_batch)
-    batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+    return TimeSeries(res, data_granularity=granularity)
 
-    temp_ts = deepcopy(ts)
 
-    while batch_end <= end_date:
-        reference_day = granularity.get_n_day_of_granularity(day=batch_beginning, idx=store_day_of_batch)
+def pick_first(payloads: List[Any], is_dict: bool = False) -> Any:
+    """
+    First value of a list of payloads, skipping None values as the reducers
+    do. Dict payloads are picked key by key.
 
-        idx_min, idx_max = find_delimiters(temp_ts.dates, batch_beginning, batch_end)
+    Args:
+        payloads (List[Any]): Input payloads.
+        is_dict (bool, optional): Payloads are dicts (or None). Defaults to
+        False.
 
-        subset = temp_ts[idx_min:idx_max+1]
-        if len(subset) > 0:
-            res.append(
-                TimeSeriesData(
-                    day=reference_day,
-                    data=method([element.data for element in subset])
-                )
-            )
+    Returns:
+        Any: The first value, a dict of the first value of each key for dict
+        payloads.
+    """
+    if not is_dict:
+        return next((payload for payload in payloads if payload is not None), None)
+
+    res = {}
+    for payload in payloads:
+        for key, value in (payload or {}).items():
+            if value is not None:
+                res.setdefault(key, value)
+    return res
+
+
+def days_of_batches(
+        start_date,
+        end_date,
+        granularity: Granularity,
+        day_of_batch: int = -1,
+) -> list:
+    """
+    Generates the n-th day of each time step of the given granularity
+    included in the [start_date, end_date] range.
 
-        temp_ts = temp_ts[idx_max+1:]
-        batch_beginning += granularity.delta
-        batch_beginning = granularity.get_n_day_of_granularity(batch_beginning, first_day_of_batch)
-        batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+    Args:
+        start_date (date): First date of the range.
+        end_date (date): Last date of the range.
+        granularity (Granularity): Time step to use to divide the range.
+        day_of_batch (int, optional): The day of the time step to retrieve
+        (0-indexed). Defaults to -1.
 
-    return TimeSeries(res)
+    Returns:
+        list: The sorted list of days.
+    """
+    res = []
+
+    f_day = granularity.get_n_day_of_granularity(start_date, day_of_batch)
+    if f_day < start_date:
+        f_day += granularity.delta
+
+    while f_day <= end_date:
+        res.append(f_day)
+
+        f_day += granularity.delta
+        f_day = granularity.get_n_day_of_granularity(f_day, day_of_batch)
+
+    return res
+
+
+def select_days(
+        ts: TimeSeries,
+        days: list,
+        default=None,
+        copy: bool = False,
+) -> List[TimeSeriesData]:
+    """
+    Searches the elements of the time series for many sorted days at once.
+
+    Args:
+        ts (TimeSeries): Input time series.
+        days (list): Sorted list of days to search.
+        default (optional): Set a default value for missing days.
+        Defaults to None.
+        copy (bool, optional): Copy the found elements, otherwise they are
+        shared with the input time series. Defaults to False.
+
+    Returns:
+        List[TimeSeriesData]: An element for each day.
+    """
+    if isinstance(ts, ColumnarTimeSeries):
+        targets = to_day_array(days)
+        idxs = np.searchsorted(ts.days, targets).clip(max=len(ts) - 1)
+        found = ts.days[idxs] == targets if len(ts) else np.zeros(len(days), dtype=bool)
+        idxs = [int(idx) if is_found else None for idx, is_found in zip(idxs, found)]
+    else:
+        idxs = indexes_of(ts.dates, days)
+
+    res = []
+    for day, idx in zip(days, idxs):
+        if idx is None:
+            res.append(TimeSeriesData(day=day, data=deepcopy(default) if copy else default))
+        else:
+            res.append(deepcopy(ts[idx]) if copy else ts[idx])
+
+    return res
 
 
 def pick_a_day(
@@ -89,6 +202,7 @@ def pick_a_day(
         granularity: Granularity = WeeklyGranularity(),
         day_of_batch: int = -1,
         default=None,
+        copy: bool = False,
 ) -> TimeSeries:
     """
     Divides the input time series in many sub-sets for each contained time step 
@@ -103,6 +217,8 @@ def pick_a_day(
         (0-indexed). Defaults to -1.
         default (optional): Set a default value for missing days.
         Defaults to None.
+        copy (bool, optional): Copy the picked elements, otherwise they are
+        shared with the input time series. Defaults to False.
 
     Returns:
         TimeSeries: A new time series with only a day for each step.
@@ -110,21 +226,10 @@ def pick_a_day(
     assert day_of_batch >= -1, "'day_of_batch' can't be lesser than -1."
     assert ts.data_granularity.delta <= granularity.delta, "Can't shrink the time series to a lower level granularity."
 
-    res = []
-
-    f_day = granularity.get_n_day_of_granularity(ts.start_date, day_of_batch)
-    if f_day < ts.start_date:
-        f_day += granularity.delta
-
-    while f_day <= ts.end_date:
-        res.append(
-            deepcopy(ts.get(day=f_day, value=default))
-        )
-
-        f_day += granularity.delta
-        f_day = granularity.get_n_day_of_granularity(f_day, day_of_batch)
+    days = days_of_batches(ts.start_date, ts.end_date, granularity, day_of_batch)
+    res = select_days(ts, days, default=default, copy=copy)
 
-    return TimeSeries(res)
+    return TimeSeries(res, data_granularity=granularity)
 
 
 def pick_a_weekday(
@@ -133,6 +238,7 @@ def pick_a_weekday(
         day_of_batch: int = -1,
         weekday: int = 0,
         default=None,
+        copy: bool = False,
 ) -> TimeSeries:
     """
     Divides the input time series in many sub-sets for each contained time step
@@ -149,6 +255,8 @@ def pick_a_weekday(
         first delimiter (1-indexed). Defaults to 1.
         default (optional): Set a default value for missing days.
         Defaults to None.
+        copy (bool, optional): Copy the picked elements, otherwise they are
+        shared with the input time series. Defaults to False.
 
     Returns:
         TimeSeries: A new time series with only a day for each step.
@@ -156,20 +264,11 @@ def pick_a_weekday(
     assert day_of_batch >= -1, "'day_of_batch' can't be lesser than -1."
     assert ts.data_granularity.delta <= granularity.delta, "Can't shrink the time series to a lower level granularity."
 
-    res = []
-    f_day = granularity.get_n_weekday_of_granularity(day=ts.start_date, weekday=weekday, idx=day_of_batch)
-    if f_day < ts.start_date:
-        f_day = granularity.get_n_weekday_of_granularity(day=ts.start_date+granularity.delta, weekday=weekday, idx=day_of_batch)
-
-    while f_day <= ts.end_date:
-        res.append(
-            deepcopy(ts.get(day=f_day, value=default))
-        )
-
-        f_day += granularity.delta
-        f_day = granularity.get_n_weekday_of_granularity(day=f_day, weekday=weekday, idx=day_of_batch)
+    days = granularity.get_n_weekdays_of_granularity(ts.start_date, ts.end_date, weekday=weekday, idx=day_of_batch)
+    days = [day for day in days if ts.start_date <= day <= ts.end_date]
+    res = select_days(ts, days, default=default, copy=copy)
 
-    return TimeSeries(res)
+    return TimeSeries(res, data_granularity=granularity)
 
 
 def split(
@@ -201,36 +300,62 @@ def split(
     assert last_day_of_batch >= -1 and last_day_of_batch != 0, "'last_day_of_batch' can't be lesser than -1 or equal to 0."
     assert ts.data_granularity.delta <= granularity.delta, "Can't shrink the time series to a lower level granularity."
 
-    res = []
-
-    end_date = ts.end_date if drop_tails else granularity.get_end_of_granularity(ts.end_date)
-
-    if drop_tails:
-        start_date = get_first_available_beginning(
-            day=ts.start_date,
-            input_granularity=ts.data_granularity,
-            output_granularity=granularity
-        )
-    else:
-        start_date = ts.start_date
+    batches = group_by_granularity(
+        dates=ts.dates,
+        granularity=granularity,
+        first_day_of_batch=first_day_of_batch,
+        last_day_of_batch=last_day_of_batch,
+        drop_tails=drop_tails,
+        data_granularity=ts.data_granularity,
+    )
 
-    batch_beginning = granularity.get_n_day_of_granularity(start_date, first_day_of_batch)
-    batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+    # only the elements of the batches are copied
+    return [deepcopy(ts[batch.start:batch.stop]) for batch in batches]
 
-    temp_ts = deepcopy(ts)
 
-    while batch_end <= end_date:
-        idx_min, idx_max = find_delimiters(temp_ts.dates, batch_beginning, batch_end)
+def iter_split(
+        ts: TimeSeries,
+        granularity: Granularity = WeeklyGranularity(),
+        first_day_of_batch: int = 0,
+        last_day_of_batch: int = -1,
+        drop_tails: bool = False
+) -> Iterator[TimeSeriesView]:
+    """
+    Lazy version of split: yields a read-only view over the elements of each
+    time step of the given granularity, one at a time.
+    No element is copied, so the input time series must not be changed while
+    iterating. A ColumnarTimeSeries input yields columnar time series whose
+    arrays are views of the input ones.
 
-        subset = temp_ts[idx_min:idx_max+1]
-        if len(subset) > 0:
-            res.append(
-                subset
-            )
+    Args:
+        ts (TimeSeries): Input time series.
+        granularity (Granularity, optional): Time step to use to divide the
+        input series. Defaults to WeeklyGranularity().
+        first_day_of_batch (int, optional): The day of the time step to use as
+        first delimiter (0-indexed). Defaults to 0.
+        last_day_of_batch (int, optional): The day of the time step to use as
+        last delimiter (0-indexed). Defaults to -1.
+        drop_tails (bool, optional): Choose to remove initial and final days if
+        the granularity step is not complete.
 
-        temp_ts = temp_ts[idx_max+1:]
-        batch_beginning += granularity.delta
-        batch_beginning = granularity.get_n_day_of_granularity(batch_beginning, first_day_of_batch)
-        batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+    Returns:
+        Iterator[TimeSeriesView]: A view (or columnar time series) for each
+        time step.
+    """
+    assert first_day_of_batch >= 0, "'first_day_of_batch' can't be lesser than 0."
+    assert last_day_of_batch >= -1 and last_day_of_batch != 0, "'last_day_of_batch' can't be lesser than -1 or equal to 0."
+    assert ts.data_granularity.delta <= granularity.delta, "Can't shrink the time series to a lower level granularity."
 
-    return res
+    # columnar rows are sliced directly, they can't be read as list items by a view
+    view = ts if isinstance(ts, (TimeSeriesView, ColumnarTimeSeries)) else TimeSeriesView(ts)
+
+    # a generator expression, so that the arguments are checked on call
+    batches = iter_batches(
+        dates=ts.dates,
+        granularity=granularity,
+        first_day_of_batch=first_day_of_batch,
+        last_day_of_batch=last_day_of_batch,
+        drop_tails=drop_tails,
+        data_granularity=ts.data_granularity,
+    )
+    return (view[batch.start:batch.stop] for batch in batches)
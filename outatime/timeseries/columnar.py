@@ -0,0 +1,1002 @@
+import statistics
+from copy import deepcopy
+from datetime import date, timedelta
+from functools import cached_property
+from typing import Dict, List, Iterable, Tuple, Callable, Any, Union
+
+import numpy as np
+
+from .align import to_delta, calendar_steps
+from .filter_parser import date_window
+from .groupby import group_by_granularity
+from .inference import infer_granularity
+from .time_series import TimeSeries, default_granularity_set, conflict_policies, get_day, merge_sorted
+from ..dataclass.time_series_data import TimeSeriesData
+from ..granularity.granularity import Granularity, DailyGranularity
+from ..util.agenda import calendar_fields, add_months
+
+NUMERIC_KINDS = 'biuf'
+
+# key of the validity mask of the single 'values' array in the 'masks' dictionary
+VALUES_KEY = '__values__'
+
+REDUCERS = ('sum', 'mean', 'min', 'max', 'count', 'first', 'last', 'std')
+
+# named reducers applied to columns that don't hold numbers
+PYTHON_REDUCERS = {
+    'sum': sum,
+    'mean': statistics.fmean,
+    'min': min,
+    'max': max,
+    'count': len,
+    'first': lambda values: values[0],
+    'last': lambda values: values[-1],
+    'std': statistics.pstdev,
+}
+
+
+def to_day_array(dates: Iterable[date]) -> np.ndarray:
+    """Convert the given dates to a datetime64[D] array."""
+    return np.array(list(dates), dtype='datetime64[D]')
+
+
+def to_column(values: list) -> np.ndarray:
+    """
+    Convert a list of values to a typed array (bool, int64 or float64) when
+    all values are numbers, or all are booleans, else to an object array
+    holding the values. Integers that don't fit a float exactly, mixed with
+    floats, are kept in an object array too.
+    """
+    n_bools = sum(isinstance(value, (bool, np.bool_)) for value in values)
+    if n_bools in (0, len(values)) and all(isinstance(value, (int, float, np.number)) for value in values):
+        column = np.array(values)
+        if column.dtype.kind == 'f' and any(type(value) is int and abs(value) > 2 ** 53 for value in values):
+            column = column.astype(object)
+        if column.dtype.kind in NUMERIC_KINDS:
+            return column
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def merge_dtype(array: np.ndarray, other: np.ndarray) -> np.dtype:
+    """Type of an array holding the values of both arrays, without losing precision."""
+    if array.dtype == other.dtype:
+        return array.dtype
+    if array.dtype.kind in 'iuf' and other.dtype.kind in 'iuf':
+        return np.result_type(array, other)
+    return np.dtype(object)
+
+
+def splice(array: np.ndarray, new_array: np.ndarray, positions: np.ndarray, replaced: np.ndarray,
+           inserted: np.ndarray) -> np.ndarray:
+    """
+    New array with the rows of 'new_array' flagged by 'replaced' copied to
+    their positions, and the rows flagged by 'inserted' inserted before their
+    positions. The input array is not changed: it can be shared with other
+    time series.
+    """
+    array = array.astype(merge_dtype(array, new_array))
+    array[positions[replaced]] = new_array[replaced]
+    return np.insert(array, positions[inserted], new_array[inserted])
+
+
+def unique_days(elements: List[TimeSeriesData], conflict: str) -> List[TimeSeriesData]:
+    """Sort the elements by day, keeping one for each day as per the conflict policy ('keep_old' or 'keep_new')."""
+    res = []
+    for element in sorted(elements, key=get_day):
+        if res and res[-1].day == element.day:
+            if conflict == 'keep_new':
+                res[-1] = element
+        else:
+            res.append(element)
+    return res
+
+
+def empty_column(length: int, dtype: np.dtype) -> np.ndarray:
+    """Placeholder array of the given type, for values flagged as missing by a mask."""
+    if dtype.kind in NUMERIC_KINDS:
+        return np.zeros(length, dtype=dtype)
+    return np.full(length, None, dtype=object)
+
+
+def is_dict_data(payloads: list) -> bool:
+    """Check that the payloads are dicts (or None), stored by columns."""
+    return any(isinstance(payload, dict) for payload in payloads) and \
+        all(payload is None or isinstance(payload, dict) for payload in payloads)
+
+
+def to_masked_column(values: list, mask: List[bool]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a list of values to an array where only the values flagged by the
+    mask are valid. None values are never valid, so they don't change the
+    type of the array. Returns the array and its validity mask, None if all
+    values are valid.
+    """
+    mask = [is_valid and value is not None for value, is_valid in zip(values, mask)]
+    if all(mask):
+        return to_column(values), None
+
+    mask = np.array(mask, dtype=bool)
+    valid = to_column([value for value, is_valid in zip(values, mask) if is_valid])
+    column = empty_column(len(values), valid.dtype)
+    column[mask] = valid
+    return column, mask
+
+
+def to_columns(payloads: List[dict]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Convert a list of dicts to an array for each key found in the dicts.
+    Keys missing in some dicts, or with None values, get a validity mask.
+    Keys with None values, and None dicts (under VALUES_KEY), are flagged by
+    a second mask, so that they are not read as missing keys.
+
+    Args:
+        payloads (List[dict]): Input dicts, or None.
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        Arrays, validity masks and None masks by key.
+    """
+    nulls = {}
+    if any(payload is None for payload in payloads):
+        nulls[VALUES_KEY] = np.array([payload is None for payload in payloads], dtype=bool)
+        payloads = [{} if payload is None else payload for payload in payloads]
+
+    keys = dict.fromkeys(key for payload in payloads for key in payload)
+    columns, masks = {}, {}
+    for key in keys:
+        values = [payload.get(key) for payload in payloads]
+        column, mask = to_masked_column(values, [key in payload for payload in payloads])
+        columns[key] = column
+        if mask is not None:
+            masks[key] = mask
+            is_null = np.array([key in payload and value is None for payload, value in zip(payloads, values)], dtype=bool)
+            if is_null.any():
+                nulls[key] = is_null
+    return columns, masks, nulls
+
+
+def sum_may_overflow(values: np.ndarray, counts: np.ndarray) -> bool:
+    """Check if the sum of segments of an integer array, of the given lengths, can exceed its type."""
+    if values.dtype.kind not in 'iu':
+        return False
+    largest = max(abs(int(values.min())), abs(int(values.max())))
+    return largest * int(counts.max()) > np.iinfo(values.dtype).max
+
+
+def segment_sums(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sum of each segment, exact with Python integers when the integer type could overflow."""
+    if sum_may_overflow(values, counts):
+        values = values.astype(object)
+    return np.add.reduceat(values, offsets)
+
+
+def segment_means(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Mean of each segment."""
+    return (segment_sums(values, offsets, counts) / counts).astype(np.float64)
+
+
+def segment_stds(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Population standard deviation of each segment."""
+    deviations = values - np.repeat(segment_means(values, offsets, counts), counts)
+    return np.sqrt(np.add.reduceat(deviations * deviations, offsets) / counts)
+
+
+# reducers of the contiguous segments of an array, starting at the given offsets
+SEGMENT_REDUCERS = {
+    'sum': segment_sums,
+    'mean': segment_means,
+    'min': lambda values, offsets, counts: np.minimum.reduceat(values, offsets),
+    'max': lambda values, offsets, counts: np.maximum.reduceat(values, offsets),
+    'first': lambda values, offsets, counts: values[offsets],
+    'last': lambda values, offsets, counts: values[offsets + counts - 1],
+    'std': segment_stds,
+}
+
+
+def reduce_segments(
+        column: np.ndarray,
+        starts: List[int],
+        stops: List[int],
+        reducer: str,
+        mask: np.ndarray = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces all the [start, stop) segments of a numeric array at once with
+    a named reducer: 'sum', 'mean', 'min', 'max', 'count', 'first', 'last'
+    or 'std' (population standard deviation).
+
+    Args:
+        column (np.ndarray): Input numeric array.
+        starts (List[int]): First index of each segment.
+        stops (List[int]): Index after the last one of each segment.
+        reducer (str): Name of the reducer. Integer sums that could
+        overflow are computed with Python integers.
+        mask (np.ndarray, optional): Validity mask of the array values,
+        invalid values are ignored. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Result of each segment and a mask of
+        the segments with a result (the ones with valid values, or all of
+        them when counting).
+    """
+    if reducer != 'count' and reducer not in SEGMENT_REDUCERS:
+        raise ValueError(f'Invalid reducer: {reducer}')
+
+    starts = np.asarray(starts, dtype=np.intp)
+    stops = np.asarray(stops, dtype=np.intp)
+    lengths = stops - starts
+
+    # gather the rows of all segments contiguously
+    ids = np.repeat(np.arange(len(starts)), lengths)
+    rows = np.arange(len(ids)) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    if mask is not None:
+        keep = mask[rows]
+        ids, rows = ids[keep], rows[keep]
+
+    values = column[rows]
+    if values.dtype.kind == 'b' and reducer in ('sum', 'mean', 'std'):
+        values = values.astype(np.int64)
+
+    counts = np.bincount(ids, minlength=len(starts))
+    if reducer == 'count':
+        return counts, np.ones(len(starts), dtype=bool)
+
+    valid = counts > 0
+    if not valid.any():
+        dtype = np.float64 if reducer in ('mean', 'std') else values.dtype
+        return np.zeros(len(starts), dtype=dtype), valid
+
+    counts = counts[valid]
+    offsets = np.cumsum(counts) - counts
+
+    results = SEGMENT_REDUCERS[reducer](values, offsets, counts)
+    output = np.zeros(len(starts), dtype=results.dtype)
+    output[valid] = results
+    return output, valid
+
+
+def compare_rows(
+        column: np.ndarray,
+        idxs: np.ndarray,
+        found: np.ndarray,
+        method: str,
+        mask: np.ndarray = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compares each value of an array with the value at the given index, for
+    all the rows at once: 'diff' subtracts the other value, 'pct_change'
+    gives the relative change from it.
+
+    Args:
+        column (np.ndarray): Input array.
+        idxs (np.ndarray): Index of the value to compare with each row.
+        found (np.ndarray): Mask of the rows with a value to compare with.
+        method (str): 'diff' or 'pct_change'.
+        mask (np.ndarray, optional): Validity mask of the array values,
+        invalid values are ignored. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Result of each row and a mask of the
+        rows with a result (both values valid, and the other one not 0 for
+        'pct_change').
+    """
+    present = np.ones(len(column), dtype=bool) if mask is None else mask
+    if column.dtype.kind == 'b':
+        column = column.astype(np.int64)
+    elif column.dtype.kind not in NUMERIC_KINDS:
+        present = present & np.array([value is not None for value in column.tolist()], dtype=bool)
+
+    valid = found & present & present[idxs]
+    current, previous = column[valid], column[idxs[valid]]
+    if method == 'diff':
+        results = current - previous
+    elif method == 'pct_change':
+        nonzero = np.asarray(previous != 0, dtype=bool)
+        valid[valid] = nonzero
+        results = current[nonzero] / previous[nonzero] - 1
+    else:
+        raise ValueError(f'Invalid comparison method: {method}')
+
+    if results.dtype.kind in NUMERIC_KINDS:
+        output = np.zeros(len(column), dtype=results.dtype)
+    else:
+        output = np.full(len(column), None, dtype=object)
+    output[valid] = results
+    return output, valid
+
+
+def asof_indexes(days: np.ndarray, targets: np.ndarray, direction: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search at once the day available as of each target day in a sorted
+    datetime64 array. See TimeSeries.asof_many for the directions.
+
+    Args:
+        days (np.ndarray): Sorted datetime64[D] array.
+        targets (np.ndarray): datetime64[D] array of the days to search.
+        direction (str): 'backward', 'forward' or 'nearest'.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Index of the day found for each
+        target and a mask of the targets with a day.
+    """
+    before = np.searchsorted(days, targets, side='right') - 1
+    after = np.searchsorted(days, targets, side='left')
+    if direction == 'backward':
+        return before.clip(min=0), before >= 0
+    if direction == 'forward':
+        return after.clip(max=max(len(days) - 1, 0)), after < len(days)
+    if direction != 'nearest':
+        raise ValueError(f'Invalid direction: {direction}')
+
+    has_before, has_after = before >= 0, after < len(days)
+    before, after = before.clip(min=0), after.clip(max=max(len(days) - 1, 0))
+    if not len(days):
+        return before, has_before
+    use_before = has_before & (~has_after | (targets - days[before] <= days[after] - targets))
+    return np.where(use_before, before, after), has_before | has_after
+
+
+def column_item(column: np.ndarray, idx: int):
+    """Get an element of the given array as a Python object."""
+    value = column[idx]
+    return value.item() if column.dtype.kind in NUMERIC_KINDS else value
+
+
+class ColumnarTimeSeries:
+    """
+    Time series stored by columns instead of TimeSeriesData objects.
+
+    Dates are kept in a sorted datetime64[D] array. Data is kept either in a
+    single 'values' array (one value per day) or, for dict data, in a
+    'columns' dictionary with an array for each key. Arrays are typed
+    (bool, int64 or float64) when all their values are numbers, otherwise
+    they hold Python objects. Keys missing in some days, and None values, get
+    a boolean validity array in the 'masks' dictionary (under VALUES_KEY for
+    the 'values' array): invalid values are read as missing keys, or None,
+    and are skipped by the reducers. Keys with None values, and None dict
+    data (under VALUES_KEY), are flagged in the 'nulls' dictionary, so that
+    they are read back as they were.
+
+    The class exposes the methods of TimeSeries to read, search, query,
+    cut, update, shift and aggregate the elements, returning TimeSeriesData
+    objects built on the fly when single elements are read. 'view',
+    'rolling' and item assignment are not supported: convert the time series
+    with 'to_time_series' to use them.
+    """
+    query_parser_generator = TimeSeries.query_parser_generator
+    filter_parser = query_parser_generator.get_parser()
+    vectorized_query_parser_generator = TimeSeries.vectorized_query_parser_generator
+    vectorized_filter_parser = vectorized_query_parser_generator.get_parser()
+    bounds_query_parser_generator = TimeSeries.bounds_query_parser_generator
+    bounds_filter_parser = bounds_query_parser_generator.get_parser()
+
+    def __init__(self,
+                 days: np.ndarray,
+                 values: np.ndarray = None,
+                 columns: Dict[str, np.ndarray] = None,
+                 masks: Dict[str, np.ndarray] = None,
+                 possible_granularity_list=None,
+                 data_granularity: Granularity = None,
+                 nulls: Dict[str, np.ndarray] = None,
+                 ):
+        assert (values is None) != (columns is None), "Exactly one between 'values' and 'columns' must be given."
+        if possible_granularity_list is None:
+            possible_granularity_list = default_granularity_set
+
+        self.days = np.asarray(days, dtype='datetime64[D]')
+        self.values = values
+        self.columns = columns
+        self.masks = {} if masks is None else masks
+        self.nulls = {} if nulls is None else nulls
+        self.possible_granularity_list = list(possible_granularity_list)
+
+        for array in self.__arrays():
+            assert len(array) == len(self.days), "Data arrays must have the same length of days."
+
+        if data_granularity is not None and len(self) > 1:
+            self.data_granularity = data_granularity
+
+    @classmethod
+    def from_elements(cls,
+                      elements: List[TimeSeriesData],
+                      possible_granularity_list=None,
+                      data_granularity: Granularity = None,
+                      ) -> 'ColumnarTimeSeries':
+        """
+        Convert a list of TimeSeriesData sorted by day to the columnar
+        storage. Dict data (with None data too) is stored by columns, any
+        other data in a single array.
+
+        Args:
+            elements (List[TimeSeriesData]): Input elements.
+            possible_granularity_list (optional): Granularity list used for
+            inference. Defaults to None.
+            data_granularity (Granularity, optional): Known granularity of
+            the elements. Defaults to None.
+
+        Returns:
+            ColumnarTimeSeries: The converted time series.
+        """
+        payloads = [element.data for element in elements]
+        days = to_day_array(element.day for element in elements)
+        kwargs = dict(possible_granularity_list=possible_granularity_list, data_granularity=data_granularity)
+
+        if is_dict_data(payloads):
+            columns, masks, nulls = to_columns(payloads)
+            return cls(days, columns=columns, masks=masks, nulls=nulls, **kwargs)
+
+        values, mask = to_masked_column(payloads, [True] * len(payloads))
+        return cls(days, values=values, masks={} if mask is None else {VALUES_KEY: mask}, **kwargs)
+
+    @classmethod
+    def from_time_series(cls, ts) -> 'ColumnarTimeSeries':
+        """
+        Convert a time series to the columnar storage.
+        See from_elements for the conversion rules.
+
+        Args:
+            ts (TimeSeries): Input time series.
+
+        Returns:
+            ColumnarTimeSeries: The converted time series.
+        """
+        return cls.from_elements(
+            list(ts),
+            possible_granularity_list=ts.possible_granularity_list,
+            data_granularity=ts.__dict__.get('data_granularity')
+        )
+
+    def to_time_series(self) -> TimeSeries:
+        """Convert the columnar time series to a TimeSeries."""
+        return TimeSeries(
+            list(self),
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__dict__.get('data_granularity')
+        )
+
+    def __arrays(self) -> List[np.ndarray]:
+        return list(self.__data().values())
+
+    def __data(self) -> Dict[str, np.ndarray]:
+        """Data arrays by key, the 'values' array under VALUES_KEY."""
+        if self.columns is None:
+            return {VALUES_KEY: self.values}
+        return self.columns
+
+    def __select(self, idx) -> 'ColumnarTimeSeries':
+        """Generate a new columnar time series with the given rows."""
+        if self.columns is None:
+            values, columns = self.values[idx], None
+        else:
+            values, columns = None, {key: column[idx] for key, column in self.columns.items()}
+
+        # a contiguous subset keeps the (already known) granularity
+        is_contiguous = isinstance(idx, slice) and idx.step in (None, 1)
+        return self.__class__(
+            self.days[idx],
+            values=values,
+            columns=columns,
+            masks={key: mask[idx] for key, mask in self.masks.items()},
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__dict__.get('data_granularity') if is_contiguous else None,
+            nulls={key: is_null[idx] for key, is_null in self.nulls.items()}
+        )
+
+    def __with_data(self, data: Dict[str, np.ndarray], masks: Dict[str, np.ndarray], days: np.ndarray = None,
+                    data_granularity: Granularity = None,
+                    nulls: Dict[str, np.ndarray] = None) -> 'ColumnarTimeSeries':
+        """
+        Generate a new columnar time series with the given data arrays by key
+        (see __data), the same storage and the days of this one if not given.
+        """
+        if days is None:
+            days, data_granularity = self.days, self.__dict__.get('data_granularity')
+        if self.columns is None:
+            values, columns = data[VALUES_KEY], None
+        else:
+            values, columns = None, data
+        return self.__class__(
+            days,
+            values=values,
+            columns=columns,
+            masks=masks,
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=data_granularity,
+            nulls=nulls
+        )
+
+    def __source_indexes(self, periods: int = 1, offset=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Index of the row to compare with each row, 'periods' rows before or
+        the day 'offset' before, and the mask of the rows that have one.
+        """
+        if offset is None:
+            idxs = np.arange(len(self)) - periods
+            found = (idxs >= 0) & (idxs < len(self))
+        else:
+            offset = to_delta(offset)
+            if isinstance(offset, timedelta):
+                targets = self.days - np.timedelta64(offset.days, 'D')
+            elif calendar_steps(offset) is not None:
+                months, days = calendar_steps(offset)
+                targets = add_months(self.days, -months) - np.timedelta64(days, 'D')
+            else:
+                targets = to_day_array(day - offset for day in self.dates)
+            idxs = np.searchsorted(self.days, targets)
+            found = idxs < len(self)
+            found[found] = self.days[idxs[found]] == targets[found]
+        return idxs.clip(0, max(len(self) - 1, 0)), found
+
+    def __gather(self, idxs: np.ndarray, found: np.ndarray) -> 'ColumnarTimeSeries':
+        """Move to each row the data of the given index, rows not found get None data."""
+        data, masks = {}, {}
+        for key, column in self.__data().items():
+            data[key] = column[idxs]
+            valid = found & self.masks[key][idxs] if key in self.masks else found
+            if not valid.all():
+                masks[key] = valid
+        nulls = {key: found & is_null[idxs] for key, is_null in self.nulls.items()}
+        if self.columns is not None and not found.all():
+            # as in TimeSeries, rows not found get None data
+            nulls[VALUES_KEY] = ~found | nulls.get(VALUES_KEY, False)
+        return self.__with_data(data, masks, nulls=nulls)
+
+    def __compare_rows(self, method: str, periods: int, offset) -> 'ColumnarTimeSeries':
+        idxs, found = self.__source_indexes(periods, offset)
+        data, masks = {}, {}
+        for key, column in self.__data().items():
+            data[key], valid = compare_rows(column, idxs, found, method, mask=self.masks.get(key))
+            if not valid.all():
+                masks[key] = valid
+        return self.__with_data(data, masks)
+
+    def __replace(self, other: 'ColumnarTimeSeries'):
+        """Replace the content of the time series with the other one."""
+        self.days, self.values, self.columns, self.masks = other.days, other.values, other.columns, other.masks
+        self.nulls = other.nulls
+        self.__dict__.pop('dates', None)
+        self.__dict__.pop('calendar_fields', None)
+        self.__dict__.pop('data_granularity', None)
+
+    def __spliced(self, new: 'ColumnarTimeSeries', conflict: str) -> 'ColumnarTimeSeries':
+        """
+        Generate a new columnar time series with the rows of the other one (with the
+        same storage) inserted, or replacing the rows of the same days as per the
+        conflict policy.
+        """
+        positions = np.searchsorted(self.days, new.days)
+        existing = positions < len(self)
+        existing[existing] = self.days[positions[existing]] == new.days[existing]
+        replaced = existing if conflict == 'keep_new' else np.zeros(len(new), dtype=bool)
+
+        def _splice(array, new_array):
+            return splice(array, new_array, positions, replaced, ~existing)
+
+        self_data, new_data = self.__data(), new.__data()
+        data, masks = {}, {}
+        for key in dict.fromkeys([*self_data, *new_data]):
+            column = self_data.get(key)
+            new_column = new_data.get(key)
+            if column is None:
+                column = empty_column(len(self), new_column.dtype)
+            if new_column is None:
+                new_column = empty_column(len(new), column.dtype)
+            data[key] = _splice(column, new_column)
+
+            mask = _splice(
+                self.masks.get(key, np.full(len(self), key in self_data)),
+                new.masks.get(key, np.full(len(new), key in new_data))
+            )
+            if not mask.all():
+                masks[key] = mask
+
+        nulls = {
+            key: _splice(
+                self.nulls.get(key, np.zeros(len(self), dtype=bool)),
+                new.nulls.get(key, np.zeros(len(new), dtype=bool))
+            )
+            for key in dict.fromkeys([*self.nulls, *new.nulls])
+        }
+        days = np.insert(self.days, positions[~existing], new.days[~existing])
+        return self.__with_data(data, masks, days=days, nulls=nulls)
+
+    def __iter_masked(self):
+        """Iterate the elements of dict data with missing keys, or None values."""
+        columns = [
+            (key, column.tolist(), self.masks[key].tolist() if key in self.masks else None,
+             self.nulls[key].tolist() if key in self.nulls else None)
+            for key, column in self.columns.items()
+        ]
+        is_none = self.nulls[VALUES_KEY].tolist() if VALUES_KEY in self.nulls else [False] * len(self)
+        for idx, day in enumerate(self.dates):
+            if is_none[idx]:
+                yield TimeSeriesData(day=day, data=None)
+                continue
+            data = {}
+            for key, values, mask, is_null in columns:
+                if mask is None or mask[idx]:
+                    data[key] = values[idx]
+                elif is_null is not None and is_null[idx]:
+                    data[key] = None
+            yield TimeSeriesData(day=day, data=data)
+
+    def __deepcopy__(self, memo=None):
+        def _copy(column):
+            return column.copy() if column.dtype.kind in NUMERIC_KINDS else deepcopy(column, memo)
+
+        return self.__class__(
+            self.days.copy(),
+            values=None if self.values is None else _copy(self.values),
+            columns=None if self.columns is None else {key: _copy(column) for key, column in self.columns.items()},
+            masks={key: mask.copy() for key, mask in self.masks.items()},
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__dict__.get('data_granularity'),
+            nulls={key: is_null.copy() for key, is_null in self.nulls.items()}
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.__select(item)
+        day = self.days[item].item()
+        if self.columns is None:
+            is_valid = VALUES_KEY not in self.masks or self.masks[VALUES_KEY][item]
+            return TimeSeriesData(day=day, data=column_item(self.values, item) if is_valid else None)
+        if VALUES_KEY in self.nulls and self.nulls[VALUES_KEY][item]:
+            return TimeSeriesData(day=day, data=None)
+        return TimeSeriesData(
+            day=day,
+            data={
+                key: column_item(column, item) if key not in self.masks or self.masks[key][item] else None
+                for key, column in self.columns.items()
+                if key not in self.masks or self.masks[key][item] or (key in self.nulls and self.nulls[key][item])
+            }
+        )
+
+    def __iter__(self):
+        if self.columns is None:
+            values = self.values.tolist()
+            if VALUES_KEY in self.masks:
+                values = [value if is_valid else None for value, is_valid in zip(values, self.masks[VALUES_KEY].tolist())]
+            for day, value in zip(self.dates, values):
+                yield TimeSeriesData(day=day, data=value)
+        elif not self.masks and not self.nulls:
+            keys = list(self.columns)
+            columns = [column.tolist() for column in self.columns.values()]
+            for day, *values in zip(self.dates, *columns):
+                yield TimeSeriesData(day=day, data=dict(zip(keys, values)))
+        else:
+            yield from self.__iter_masked()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def __add__(self, other):
+        """New time series with the elements of both, the other one's data kept on shared days."""
+        res = self.copy()
+        res.update(list(other))
+        return res
+
+    @property
+    def start_date(self) -> date:
+        """First date of the time series."""
+        return self.days[0].item()
+
+    @property
+    def end_date(self) -> date:
+        """Last date of the time series."""
+        return self.days[-1].item()
+
+    @cached_property
+    def dates(self) -> List[date]:
+        """List of all dates available in the time series."""
+        return self.days.tolist()
+
+    @cached_property
+    def calendar_fields(self) -> dict:
+        """Arrays of 'year', 'month' and 'day' of all dates in the time series."""
+        return calendar_fields(self.days)
+
+    @cached_property
+    def data_granularity(self) -> Granularity:
+        """Granularity of the time series, inferred from its dates."""
+        return infer_granularity(self.dates, self.possible_granularity_list)
+
+    def append(self, object_: TimeSeriesData):
+        """Add a new TimeSeriesData object to the time series."""
+        assert isinstance(object_, TimeSeriesData), "Only TimeSeriesData objects can be appended."
+        self.update([object_])
+
+    def asof_many(self, days: List[date], direction: str = 'backward') -> List[TimeSeriesData]:
+        """
+        Search the element available as of each of the given days, with a
+        single binary search of all the days (see asof_indexes).
+        See TimeSeries.asof_many for the arguments.
+        """
+        idxs, found = asof_indexes(self.days, to_day_array(days), direction)
+        return [self[idx] if is_found else None for idx, is_found in zip(idxs.tolist(), found.tolist())]
+
+    def copy(self, deep: bool = True):
+        """
+        Return a copy of the time series.
+
+        Args:
+            deep (bool, optional): Copy the arrays too, otherwise they are
+            shared with the original time series. Defaults to True.
+        """
+        if deep:
+            return self.__deepcopy__()
+        return self.__select(slice(None))
+
+    def cut(self, min_date: date, max_date: date, inplace: bool = False):
+        """
+        Cut the time series selecting only the available days between the
+        input delimiters. Arrays of the new time series are views of the
+        original ones.
+
+        Args:
+            min_date (date): Minimum date of range.
+            max_date (date): Maximum date of range.
+            inplace (bool, optional): Original time series is overwritten
+            if set to True. Defaults to False.
+        """
+        idx_min = np.searchsorted(self.days, np.datetime64(min_date, 'D'), side='left')
+        idx_max = np.searchsorted(self.days, np.datetime64(max_date, 'D'), side='right')
+        res = self.__select(slice(idx_min, idx_max))
+
+        if inplace:
+            data_granularity = self.__dict__.get('data_granularity')
+            self.__replace(res)
+            if data_granularity is not None and len(self) > 1:
+                self.data_granularity = data_granularity
+        else:
+            return res
+
+    def delete(self, day: date):
+        """Delete item by day."""
+        idx = self.index_of(day)
+        if idx is None:
+            raise ValueError
+        keep = np.ones(len(self), dtype=bool)
+        keep[idx] = False
+        self.__replace(self.__select(keep))
+
+    def diff(self, periods: int = 1, offset=None, key: Callable[[Any], Any] = None):
+        """
+        Difference between each row and the row 'periods' rows before, or
+        of the day 'offset' before if given, for each column at once.
+        See TimeSeries.diff for the arguments. Rows without both values have
+        no result. With a key the elements are compared one by one, as by
+        TimeSeries.diff.
+        """
+        if key is not None:
+            return self.from_time_series(self.to_time_series().diff(periods=periods, offset=offset, key=key))
+        return self.__compare_rows('diff', periods, offset)
+
+    def empty_like(self, days: List[date], data_granularity: Granularity = None) -> 'ColumnarTimeSeries':
+        """Generate a time series of the same class with the given days and None values."""
+        return self.__class__(
+            to_day_array(days),
+            values=empty_column(len(days), np.dtype(object)),
+            masks={VALUES_KEY: np.zeros(len(days), dtype=bool)},
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=data_granularity
+        )
+
+    def get(self, day: date, value: ... = None) -> TimeSeriesData:
+        """
+        Search the time series element for the given day.
+
+        Args:
+            day (date): The day to search in the time series.
+            value (None, optional): Give a default value to set as 'data' when
+            the day is not found. Defaults to None.
+
+        Returns:
+            TimeSeriesData: A time series element for the searched day.
+        """
+        idx = self.index_of(day)
+        if idx is None:
+            return TimeSeriesData(day=day, data=value)
+        return self[idx]
+
+    def get_many(self, days: List[date], value: ... = None) -> List[TimeSeriesData]:
+        """
+        Search the time series elements for many days at once, with a single
+        binary search of all the days. See TimeSeries.get_many for the
+        arguments.
+        """
+        targets = to_day_array(days)
+        idxs = np.searchsorted(self.days, targets).clip(max=max(len(self) - 1, 0))
+        found = self.days[idxs] == targets if len(self) else np.zeros(len(targets), dtype=bool)
+        return [
+            self[idx] if is_found else TimeSeriesData(day=day, data=value)
+            for day, idx, is_found in zip(targets.tolist(), idxs.tolist(), found.tolist())
+        ]
+
+    def index_of(self, day: date):
+        """Index of the given day in the time series, None if not found."""
+        day = np.datetime64(day, 'D')
+        idx = int(np.searchsorted(self.days, day, side='left'))
+        if idx < len(self) and self.days[idx] == day:
+            return idx
+        return None
+
+    def lag(self, offset):
+        """
+        Move to each day the data of the day 'offset' before, with a single
+        binary search of all the shifted days. See TimeSeries.lag for the
+        arguments.
+        """
+        return self.__gather(*self.__source_indexes(offset=offset))
+
+    def pct_change(self, periods: int = 1, offset=None, key: Callable[[Any], Any] = None):
+        """
+        Relative change between each row and the row 'periods' rows before,
+        or of the day 'offset' before if given, for each column at once.
+        See TimeSeries.diff for the arguments. Rows without both values, or
+        with a previous value of 0, have no result. With a key the elements
+        are compared one by one, as by TimeSeries.pct_change.
+        """
+        if key is not None:
+            return self.from_time_series(self.to_time_series().pct_change(periods=periods, offset=offset, key=key))
+        return self.__compare_rows('pct_change', periods, offset)
+
+    def query(self, expr: str, inplace: bool = False):
+        """
+        Query the time series data with a boolean expression.
+        See TimeSeries.query for the syntax.
+
+        Args:
+            expr (str): The query string to evaluate.
+            inplace (bool, optional): Original time series is overwritten
+            if set to True. Defaults to False.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+
+        bounds, _ = self.bounds_filter_parser(expr)
+        window = date_window(bounds)
+        if window is not None:
+            start = np.searchsorted(self.days, np.datetime64(window[0], 'D'), side='left')
+            stop = np.searchsorted(self.days, np.datetime64(window[1], 'D'), side='right')
+            query_mask, _ = self.vectorized_filter_parser(expr)
+            mask[start:stop] = query_mask(calendar_fields(self.days[start:stop]))
+
+        res = self.__select(mask)
+
+        if inplace:
+            self.__replace(res)
+        else:
+            return res
+
+    def reduce_batches(self,
+                       days: List[date],
+                       starts: List[int],
+                       stops: List[int],
+                       method: Union[str, Callable[[List[Any]], Any]],
+                       data_granularity: Granularity = None,
+                       ) -> 'ColumnarTimeSeries':
+        """
+        Generate a new columnar time series with a row for each batch of
+        rows in the [start, stop) ranges. The method is applied separately
+        to each column, receiving the list of its valid values in the batch.
+        A column has no value for a batch without valid values.
+
+        The method can also be the name of a reducer ('sum', 'mean', 'min',
+        'max', 'count', 'first', 'last' or 'std'): numeric columns are then
+        reduced for all batches at once (see reduce_segments).
+
+        Args:
+            days (List[date]): Day of each output row.
+            starts (List[int]): First row index of each batch.
+            stops (List[int]): Index after the last row of each batch.
+            method (Union[str, Callable[[List[Any]], Any]]): Aggregation
+            function, or reducer name, to apply.
+            data_granularity (Granularity, optional): Known granularity of
+            the output. Defaults to None.
+
+        Returns:
+            ColumnarTimeSeries: A new time series with aggregated values.
+        """
+        if isinstance(method, str) and method not in REDUCERS:
+            raise ValueError(f'Invalid aggregation method: {method}')
+
+        def _reduce(column, mask):
+            if isinstance(method, str) and column.dtype.kind in NUMERIC_KINDS:
+                return reduce_segments(column, starts, stops, method, mask=mask)
+
+            function = PYTHON_REDUCERS[method] if isinstance(method, str) else method
+            results, is_valid = [], []
+            for start, stop in zip(starts, stops):
+                values = column[start:stop]
+                if mask is not None:
+                    values = values[mask[start:stop]]
+                is_valid.append(len(values) > 0)
+                results.append(function(values.tolist()) if len(values) > 0 else None)
+
+            column, mask = to_masked_column(results, is_valid)
+            return column, np.ones(len(column), dtype=bool) if mask is None else mask
+
+        data, masks = {}, {}
+        for key, column in self.__data().items():
+            data[key], valid = _reduce(column, self.masks.get(key))
+            if not valid.all():
+                masks[key] = valid
+        return self.__with_data(data, masks, days=to_day_array(days), data_granularity=data_granularity)
+
+    def resample(self,
+                 granularity: Granularity = DailyGranularity(),
+                 method: Callable[[List[Any]], Any] = None,
+                 index_of_granularity: int = 0,
+                 inplace: bool = False,
+                 ):
+        """
+        Select only needed days for the given granularity.
+        See TimeSeries.resample for the arguments: the method is applied to
+        each column separately (see reduce_batches). Without a method, or for
+        days without data, the values are None.
+        """
+        batches = group_by_granularity(dates=self.dates, granularity=granularity, keep_empty=True)
+
+        days = [granularity.get_n_day_of_granularity(day=batch.first_day, idx=index_of_granularity) for batch in batches]
+        starts = [batch.start for batch in batches]
+        stops = [batch.stop for batch in batches]
+
+        if method is None:
+            res = self.empty_like(days, data_granularity=granularity)
+        else:
+            res = self.reduce_batches(days, starts, stops, method, data_granularity=granularity)
+
+        if inplace:
+            self.__replace(res)
+            if len(self) > 1:
+                self.data_granularity = granularity
+        else:
+            return res
+
+    def shift(self, periods: int = 1):
+        """
+        Move the data of each row 'periods' rows forward (backward if
+        negative), keeping the days. See TimeSeries.shift.
+        """
+        return self.__gather(*self.__source_indexes(periods=periods))
+
+    def update(self,
+               __list: List[TimeSeriesData],
+               conflict: Union[str, Callable[[Any, Any], Any]] = 'keep_new',
+               ):
+        """
+        Add all elements of the given list of TimeSeriesData to the time series.
+        Updates existing elements if already in the time series.
+        Only the new elements are converted: their rows are found with a
+        binary search and spliced into the arrays. A conflict method is
+        applied to the data of each shared day, so the whole time series is
+        merged element by element.
+
+        Args:
+            __list (List[TimeSeriesData]): Input list of new elements.
+            conflict (Union[str, Callable[[Any, Any], Any]], optional): Policy
+            to apply to days available both in the time series and in the
+            input list. It can be 'keep_old', 'keep_new' or a method that
+            receives the old and the new data and returns the data to keep.
+            Defaults to 'keep_new'.
+        """
+        if not callable(conflict) and conflict not in conflict_policies:
+            raise ValueError(f'Invalid conflict policy: {conflict}')
+        assert all(isinstance(element, TimeSeriesData) for element in __list), "Only TimeSeriesData objects can be added."
+        if not __list:
+            return
+
+        elements = sorted(__list, key=get_day) if callable(conflict) else unique_days(__list, conflict)
+        new = self.from_elements(elements, possible_granularity_list=self.possible_granularity_list)
+        if callable(conflict) or len(self) == 0 or (self.columns is None) != (new.columns is None):
+            # data merged element by element, or storage changing from single values to columns (or vice
+            # versa): rebuild it
+            merged = merge_sorted(list(self), elements, conflict)
+            self.__replace(self.from_elements(merged, possible_granularity_list=self.possible_granularity_list))
+        else:
+            self.__replace(self.__spliced(new, conflict))
@@ -1,13 +1,33 @@
-from typing import Callable, Any
+from heapq import merge
+from itertools import groupby
+from typing import Callable, Any, List
 
 from ..dataclass.time_series_data import TimeSeriesData
-from ..timeseries.time_series import TimeSeries
+from ..timeseries.time_series import TimeSeries, get_day
+
+
+def known_granularity(tsl: TimeSeries):
+    """Granularity of the time series if already evaluated, else None."""
+    return tsl.__dict__.get('data_granularity')
+
+
+def intersection_granularity(tsl_list: List[TimeSeries]):
+    """
+    Coarsest granularity of the given time series, if known for all of them.
+    The shared days are a subset of each series, so a step of this
+    granularity can't contain more than one of them.
+    """
+    granularity_list = [known_granularity(tsl) for tsl in tsl_list]
+    if not granularity_list or any(granularity is None for granularity in granularity_list):
+        return None
+    return max(granularity_list, key=lambda g: g.delta)
 
 
 def intersection(tsl_a: TimeSeries, tsl_b: TimeSeries, conflict_method: Callable[[Any, Any], Any]) -> TimeSeries:
     """
-    Given two input time series, generates a new time series with only shared 
+    Given two input time series, generates a new time series with only shared
     days and all the contained values.
+    Both series are walked once, in the order of their dates.
 
     Args:
         tsl_a (TimeSeries): First input time series.
@@ -18,41 +38,139 @@ def intersection(tsl_a: TimeSeries, tsl_b: TimeSeries, conflict_method: Callable
     Returns:
         TimeSeries: Output timeseries with shared days.
     """
-    intersection_dates = list(set(tsl_a.dates) & set(tsl_b.dates))
-    intersection_dates.sort()
+    dates_a, dates_b = tsl_a.dates, tsl_b.dates
+    len_a, len_b = len(dates_a), len(dates_b)
     intersection_result = []
-    for int_date in intersection_dates:
-        intersection_result.append(
-            TimeSeriesData(
-                day=int_date,
-                data=conflict_method(tsl_a.get(day=int_date).data, tsl_b.get(day=int_date).data)
+
+    i, j = 0, 0
+    while i < len_a and j < len_b:
+        if dates_a[i] < dates_b[j]:
+            i += 1
+        elif dates_b[j] < dates_a[i]:
+            j += 1
+        else:
+            intersection_result.append(
+                TimeSeriesData(
+                    day=dates_a[i],
+                    data=conflict_method(tsl_a[i].data, tsl_b[j].data)
+                )
             )
-        )
-    return TimeSeries(intersection_result)
+            i += 1
+            j += 1
+
+    return TimeSeries(intersection_result, data_granularity=intersection_granularity([tsl_a, tsl_b]))
 
 
-def union(tsl_a: TimeSeries, tsl_b: TimeSeries, conflict_method: Callable[[Any, Any], Any]) -> TimeSeries:
+def union(
+        tsl_a: TimeSeries,
+        tsl_b: TimeSeries,
+        conflict_method: Callable[[Any, Any], Any],
+        only_conflicts: bool = False
+) -> TimeSeries:
     """
-    Given two input time series, generates a new time series with the union of 
+    Given two input time series, generates a new time series with the union of
     all days of both series.
+    Both series are walked once, in the order of their dates.
 
     Args:
         tsl_a (TimeSeries): First input time series.
         tsl_b (TimeSeries): Second input time series.
         conflict_method (Callable[[Any, Any], Any]): Method to apply
         when choosing data for matching days.
+        only_conflicts (bool, optional): Apply the method only to the days
+        of both series, keeping the elements of the days of a single series.
+        Otherwise the method receives None for the missing data. Defaults to
+        False.
+
+    Returns:
+        TimeSeries: Output timeseries with all days.
+    """
+    dates_a, dates_b = tsl_a.dates, tsl_b.dates
+    len_a, len_b = len(dates_a), len(dates_b)
+    union_result = []
+
+    i, j = 0, 0
+    while i < len_a or j < len_b:
+        if j == len_b or (i < len_a and dates_a[i] < dates_b[j]):
+            element = tsl_a[i]
+            if not only_conflicts:
+                element = TimeSeriesData(day=element.day, data=conflict_method(element.data, None))
+            i += 1
+        elif i == len_a or dates_b[j] < dates_a[i]:
+            element = tsl_b[j]
+            if not only_conflicts:
+                element = TimeSeriesData(day=element.day, data=conflict_method(None, element.data))
+            j += 1
+        else:
+            element = TimeSeriesData(day=dates_a[i], data=conflict_method(tsl_a[i].data, tsl_b[j].data))
+            i += 1
+            j += 1
+        union_result.append(element)
+
+    return TimeSeries(union_result)
+
+
+def merge_by_day(tsl_list: List[TimeSeries]):
+    """
+    Merge the elements of many sorted time series in a single pass with a
+    heap, grouping the elements of the same day in the order of the series.
+    """
+    return groupby(merge(*tsl_list, key=get_day), key=get_day)
+
+
+def intersection_all(tsl_list: List[TimeSeries], conflict_method: Callable[[List[Any]], Any]) -> TimeSeries:
+    """
+    Given many input time series, generates a new time series with only the
+    days shared by all of them.
+
+    Args:
+        tsl_list (List[TimeSeries]): Input time series.
+        conflict_method (Callable[[List[Any]], Any]): Method to apply
+        to the list of data of each shared day, in the order of the series.
+
+    Returns:
+        TimeSeries: Output timeseries with shared days.
+    """
+    intersection_result = []
+    for day, elements in merge_by_day(tsl_list):
+        elements = list(elements)
+        if len(elements) == len(tsl_list):
+            intersection_result.append(
+                TimeSeriesData(day=day, data=conflict_method([element.data for element in elements]))
+            )
+
+    return TimeSeries(intersection_result, data_granularity=intersection_granularity(tsl_list))
+
+
+def union_all(
+        tsl_list: List[TimeSeries],
+        conflict_method: Callable[[List[Any]], Any],
+        only_conflicts: bool = False
+) -> TimeSeries:
+    """
+    Given many input time series, generates a new time series with the union
+    of all days of the series.
+
+    Args:
+        tsl_list (List[TimeSeries]): Input time series.
+        conflict_method (Callable[[List[Any]], Any]): Method to apply
+        to the list of data available for each day, in the order of the
+        series.
+        only_conflicts (bool, optional): Apply the method only to the days
+        of more than one series, keeping the elements of the days of a
+        single series. Defaults to False.
 
     Returns:
         TimeSeries: Output timeseries with all days.
     """
-    union_dates = list(set(tsl_a.dates) | set(tsl_b.dates))
-    union_dates.sort()
     union_result = []
-    for uni_date in union_dates:
-        union_result.append(
-            TimeSeriesData(
-                day=uni_date,
-                data=conflict_method(tsl_a.get(day=uni_date).data, tsl_b.get(day=uni_date).data)
+    for day, elements in merge_by_day(tsl_list):
+        elements = list(elements)
+        if only_conflicts and len(elements) == 1:
+            union_result.append(elements[0])
+        else:
+            union_result.append(
+                TimeSeriesData(day=day, data=conflict_method([element.data for element in elements]))
             )
-        )
+
     return TimeSeries(union_result)
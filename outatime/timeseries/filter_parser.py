@@ -1,3 +1,8 @@
+import re
+from calendar import monthrange
+from datetime import date, MINYEAR, MAXYEAR
+from functools import lru_cache
+
 import lark
 from lark import v_args
 
@@ -132,25 +137,329 @@ class FilterParser(lark.Transformer):
         return _f, period
 
 
+@v_args(inline=True)
+class VectorizedFilterParser(FilterParser):
+    """
+    Transformer generating filters that evaluate the query for all the
+    elements at once: a filter receives a dict of 'year', 'month' and 'day'
+    arrays (see agenda.calendar_fields) and returns a boolean mask.
+    """
+
+    @staticmethod
+    def negate_expr(_, expr):
+        """Parse a negated expression."""
+        expr, _ = expr
+
+        def _f(fields):
+            return ~expr(fields)
+
+        return _f, None
+
+    def make_filter(self, period, op, value):
+        """Parse a filter in the order KEY - OPERATOR - VALUE."""
+        operator, value = self.operators[op], int(value)
+
+        def _f(fields):
+            return operator(fields[period], value)
+
+        return _f, period
+
+    def make_rev_filter(self, value, op, period):
+        """Parse a filter in the order VALUE - OPERATOR - KEY."""
+        operator, value = self.operators[op], int(value)
+
+        def _f(fields):
+            return operator(value, fields[period])
+
+        return _f, period
+
+    def combine_filters(self, filter_res, op, value):
+        """Parse a combination of filters."""
+        _filter, period = filter_res
+        operator, value = self.operators[op], int(value)
+
+        def _f(fields):
+            return _filter(fields) & operator(fields[period], value)
+
+        return _f, period
+
+
+@v_args(inline=True)
+class CompiledFilterParser(FilterParser):
+    """
+    Transformer generating the Python source of the query: a boolean
+    expression of the 'y', 'm' and 'd' variables (year, month and day of
+    the element). See compile_filter.
+    """
+    variables = {"year": "y", "month": "m", "day": "d"}
+
+    bin_sources = {
+        "&": "and",
+        "|": "or",
+        "^": "^",
+        "and": "and",
+        "or": "or",
+        "xor": "^"
+    }
+
+    def make_expr(self, expr_a, bin_op, expr_b):
+        """Parse a binary expression."""
+        return f"({expr_a[0]} {self.bin_sources[bin_op]} {expr_b[0]})", None
+
+    @staticmethod
+    def negate_expr(_, expr):
+        """Parse a negated expression."""
+        return f"(not {expr[0]})", None
+
+    def make_filter(self, period, op, value):
+        """Parse a filter in the order KEY - OPERATOR - VALUE."""
+        return f"({self.variables[period]} {op} {int(value)})", period
+
+    def make_rev_filter(self, value, op, period):
+        """Parse a filter in the order VALUE - OPERATOR - KEY."""
+        return f"({int(value)} {op} {self.variables[period]})", period
+
+    def combine_filters(self, filter_res, op, value):
+        """Parse a combination of filters."""
+        source, period = filter_res
+        return f"({source} and {self.variables[period]} {op} {int(value)})", period
+
+
+def compile_filter(source: str):
+    """
+    Compile the source of a query (see CompiledFilterParser) to a filter
+    function of TimeSeriesData elements.
+
+    Args:
+        source (str): Boolean expression of the 'y', 'm' and 'd' variables.
+
+    Returns:
+        Callable[[TimeSeriesData], bool]: The compiled filter.
+    """
+    lines = ["def _filter(x):", "    day = x.day"]
+    for period, variable in CompiledFilterParser.variables.items():
+        # only the fields used by the query are read
+        if re.search(rf"\b{variable}\b", source):
+            lines.append(f"    {variable} = day.{period}")
+    lines.append(f"    return {source}")
+
+    namespace = {}
+    exec(compile("\n".join(lines), "<query>", "exec"), namespace)
+    return namespace["_filter"]
+
+
+def value_bounds(op: str, value: int) -> tuple:
+    """Range of values (None if unbounded) satisfying a comparison with the given value."""
+    return {
+        "==": (value, value),
+        ">": (value + 1, None),
+        ">=": (value, None),
+        "<": (None, value - 1),
+        "<=": (None, value),
+    }.get(op, (None, None))
+
+
+def intersect_bounds(bounds_a: dict, bounds_b: dict) -> dict:
+    """Ranges of values of each period satisfying both the given bounds."""
+    res = dict(bounds_a)
+    for period, (lo_b, hi_b) in bounds_b.items():
+        lo_a, hi_a = res.get(period, (None, None))
+        res[period] = (
+            lo_b if lo_a is None else lo_a if lo_b is None else max(lo_a, lo_b),
+            hi_b if hi_a is None else hi_a if hi_b is None else min(hi_a, hi_b),
+        )
+    return res
+
+
+def hull_bounds(bounds_a: dict, bounds_b: dict) -> dict:
+    """Smallest ranges of values of each period including both the given bounds."""
+    res = {}
+    for period in bounds_a.keys() & bounds_b.keys():
+        (lo_a, hi_a), (lo_b, hi_b) = bounds_a[period], bounds_b[period]
+        res[period] = (
+            None if lo_a is None or lo_b is None else min(lo_a, lo_b),
+            None if hi_a is None or hi_b is None else max(hi_a, hi_b),
+        )
+    return res
+
+
+def date_window(bounds: dict):
+    """
+    Range of dates including all the dates that satisfy the given bounds of
+    year, month and day (see BoundsFilterParser).
+
+    Args:
+        bounds (dict): Range of values of each period.
+
+    Returns:
+        tuple: First and last date of the range, None if no date satisfies
+        the bounds.
+    """
+    first, last = [], []
+    for period, min_value, max_value in [("year", MINYEAR, MAXYEAR), ("month", 1, 12), ("day", 1, 31)]:
+        lo, hi = bounds.get(period, (None, None))
+        lo = min_value if lo is None else max(lo, min_value)
+        hi = max_value if hi is None else min(hi, max_value)
+        if lo > hi:
+            return None
+        first.append(lo)
+        last.append(hi)
+
+    # dates are ordered as (year, month, day) tuples, so the bounds of the
+    # single fields are also bounds of the dates
+    first_day = date(first[0], first[1], min(first[2], monthrange(first[0], first[1])[1]))
+    last_day = date(last[0], last[1], min(last[2], monthrange(last[0], last[1])[1]))
+    return first_day, last_day
+
+
+@v_args(inline=True)
+class BoundsFilterParser(FilterParser):
+    """
+    Transformer evaluating the range of values of year, month and day that
+    can satisfy the query: a dict of (min, max) tuples, where None means
+    unbounded. Periods without bounds are not included.
+    Negations, 'xor' and '!=' don't set any bound.
+    """
+    reversed_operators = {"==": "==", "!=": "!=", ">": "<", ">=": "<=", "<": ">", "<=": ">="}
+
+    def make_expr(self, expr_a, bin_op, expr_b):
+        """Parse a binary expression."""
+        bounds_a, _ = expr_a
+        bounds_b, _ = expr_b
+
+        if bin_op in ("&", "and"):
+            return intersect_bounds(bounds_a, bounds_b), None
+        if bin_op in ("|", "or"):
+            return hull_bounds(bounds_a, bounds_b), None
+        return {}, None
+
+    @staticmethod
+    def negate_expr(_, expr):
+        """Parse a negated expression."""
+        return {}, None
+
+    def make_filter(self, period, op, value):
+        """Parse a filter in the order KEY - OPERATOR - VALUE."""
+        return {period: value_bounds(op, int(value))}, period
+
+    def make_rev_filter(self, value, op, period):
+        """Parse a filter in the order VALUE - OPERATOR - KEY."""
+        return {period: value_bounds(self.reversed_operators[op], int(value))}, period
+
+    def combine_filters(self, filter_res, op, value):
+        """Parse a combination of filters."""
+        bounds, period = filter_res
+        return intersect_bounds(bounds, {period: value_bounds(op, int(value))}), period
+
+
+def combine_cache_info(generators: list):
+    """
+    Hits, misses, maximum and current size of the caches of parsed queries
+    of the given parser generators, summed.
+    """
+    infos = [generator.cache_info() for generator in generators]
+    maxsizes = [info.maxsize for info in infos]
+    return infos[0]._replace(
+        hits=sum(info.hits for info in infos),
+        misses=sum(info.misses for info in infos),
+        maxsize=None if None in maxsizes else sum(maxsizes),
+        currsize=sum(info.currsize for info in infos)
+    )
+
+
 class FilterParserGenerator:
     gen_grammar = grammar
     gen_parser = 'lalr'
     gen_transformer_class = FilterParser
-    lark_parser = lark.Lark(gen_grammar, parser=gen_parser, transformer=gen_transformer_class())
+    # store the analysed grammar in a temporary file, reused by other processes
+    gen_cache = True
+    # built on first use, see get_lark_parser
+    lark_parser = None
+
+    def __init__(self, cache_size: int = 128):
+        """
+        Args:
+            cache_size (int, optional): Number of parsed queries to keep in
+            the LRU cache, None for no limit or 0 to disable the cache.
+            Defaults to 128.
+        """
+        self.set_cache_size(cache_size)
+
+    def set_cache_size(self, cache_size: int):
+        """Resize the LRU cache of parsed queries, clearing it."""
+        self.cache_size = cache_size
+        self.__cached_parse = lru_cache(maxsize=cache_size)(self.__parse)
+
+    @classmethod
+    def get_lark_parser(cls) -> lark.Lark:
+        """Build the lark parser of the class on first use."""
+        if cls.__dict__.get('lark_parser') is None:
+            cls.lark_parser = lark.Lark(
+                cls.gen_grammar,
+                parser=cls.gen_parser,
+                transformer=cls.gen_transformer_class(),
+                cache=cls.gen_cache
+            )
+        return cls.lark_parser
+
+    def cache_info(self):
+        """Hits, misses, maximum and current size of the cache of parsed queries."""
+        return self.__cached_parse.cache_info()
+
+    def cache_clear(self):
+        """Clear the cache of parsed queries and its statistics."""
+        self.__cached_parse.cache_clear()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Collapse the whitespaces of a query, used as cache key."""
+        return " ".join(query.split())
+
+    def __parse(self, query: str):
+        lark_parser = self.get_lark_parser()
+        try:
+            res = lark_parser.parse(query)
+        except:
+            raise FilterParserError("Bad query string.")
+        return self.finalize(res)
+
+    def finalize(self, res):
+        """Build the output of the parser from the transformed query."""
+        return res
+
+    def parse(self, query: str):
+        """Parse a query, or get it from the cache if already parsed."""
+        if not isinstance(query, str):
+            raise FilterParserError("Bad query string.")
+        return self.__cached_parse(self.normalize(query))
 
     def get_parser(self):
         """Generate a parser method to use with the given grammar."""
 
         @staticmethod
         def _parse(query):
-            try:
-                return self.lark_parser.parse(query)
-            except:
-                raise FilterParserError("Bad query string.")
+            return self.parse(query)
 
         return _parse
 
 
+class CompiledFilterParserGenerator(FilterParserGenerator):
+    gen_transformer_class = CompiledFilterParser
+
+    def finalize(self, res):
+        """Compile the source of the transformed query."""
+        source, period = res
+        return compile_filter(source), period
+
+
+class VectorizedFilterParserGenerator(FilterParserGenerator):
+    gen_transformer_class = VectorizedFilterParser
+
+
+class BoundsFilterParserGenerator(FilterParserGenerator):
+    gen_transformer_class = BoundsFilterParser
+
+
 class FilterParserError(Exception):
     msg = "Bad query string."
 
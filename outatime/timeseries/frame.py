@@ -0,0 +1,153 @@
+from datetime import date
+from heapq import merge
+from typing import Dict, List, Callable, Any, Union
+
+import numpy as np
+
+from . import batches
+from .columnar import ColumnarTimeSeries, to_day_array, to_masked_column, column_item
+from .time_series import TimeSeries
+from ..dataclass.time_series_data import TimeSeriesData
+from ..granularity.granularity import Granularity, WeeklyGranularity
+from ..util.bisect import indexes_of
+
+
+class TimeSeriesFrame(ColumnarTimeSeries):
+    """
+    Many named time series sharing a single index of dates.
+
+    Each series is a column of the frame, with a validity mask for the dates
+    it doesn't contain: dates are stored once, and the granularity steps are
+    evaluated once for all the series. Rows are read as TimeSeriesData with a
+    dict of the available series' data.
+    All the methods of ColumnarTimeSeries (cut, query, resample, ...) work
+    on all the series at once.
+    """
+
+    @classmethod
+    def from_series(cls, series: Dict[str, TimeSeries], possible_granularity_list=None) -> 'TimeSeriesFrame':
+        """
+        Generate a frame from many named time series, indexed by the union of
+        their dates.
+
+        Args:
+            series (Dict[str, TimeSeries]): Input time series by name.
+            possible_granularity_list (optional): Granularity list used for
+            inference. Defaults to None.
+
+        Returns:
+            TimeSeriesFrame: The frame of the series.
+        """
+        dates = []
+        for day in merge(*[ts.dates for ts in series.values()]):
+            if not dates or dates[-1] != day:
+                dates.append(day)
+
+        columns, masks = {}, {}
+        for name, ts in series.items():
+            values, mask = [None] * len(dates), [False] * len(dates)
+            for idx, element in zip(indexes_of(dates, ts.dates), ts):
+                values[idx], mask[idx] = element.data, True
+            columns[name], masks[name] = to_masked_column(values, mask)
+            if masks[name] is None:
+                del masks[name]
+
+        return cls(to_day_array(dates), columns=columns, masks=masks, possible_granularity_list=possible_granularity_list)
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the series in the frame."""
+        return list(self.columns)
+
+    def series(self, name: str) -> TimeSeries:
+        """
+        Extract a series of the frame.
+
+        Args:
+            name (str): Name of the series.
+
+        Returns:
+            TimeSeries: A new time series with the available days of the series.
+        """
+        column, mask = self.columns[name], self.masks.get(name)
+        idxs = range(len(self)) if mask is None else np.flatnonzero(mask)
+        return TimeSeries(
+            [TimeSeriesData(day=self.days[idx].item(), data=column_item(column, idx)) for idx in idxs],
+            possible_granularity_list=self.possible_granularity_list
+        )
+
+    def empty_like(self, days: List[date], data_granularity: Granularity = None) -> 'TimeSeriesFrame':
+        """Generate a frame with the same series, without data for the given days."""
+        columns = {name: np.full(len(days), None, dtype=object) for name in self.columns}
+        return self.__class__(
+            to_day_array(days),
+            columns=columns,
+            masks={name: np.zeros(len(days), dtype=bool) for name in columns},
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=data_granularity
+        )
+
+    def aggregate(
+            self,
+            method: Union[str, Callable[[List[Any]], Any]],
+            granularity: Granularity = WeeklyGranularity(),
+            first_day_of_batch: int = 0,
+            last_day_of_batch: int = -1,
+            drop_tails: bool = False,
+            store_day_of_batch: int = 0,
+    ) -> 'TimeSeriesFrame':
+        """
+        Aggregate all the series of the frame for each time step of the given
+        granularity. See batches.aggregate for the arguments: the method
+        receives the available data of a single series.
+
+        Returns:
+            TimeSeriesFrame: A new frame with aggregated values.
+        """
+        return batches.aggregate(
+            self,
+            method=method,
+            granularity=granularity,
+            first_day_of_batch=first_day_of_batch,
+            last_day_of_batch=last_day_of_batch,
+            drop_tails=drop_tails,
+            store_day_of_batch=store_day_of_batch,
+        )
+
+    def pick_a_day(
+            self,
+            granularity: Granularity = WeeklyGranularity(),
+            day_of_batch: int = -1,
+            default=None,
+    ) -> 'TimeSeriesFrame':
+        """
+        Select the n-th day of each time step of the given granularity for all
+        the series of the frame. See batches.pick_a_day for the arguments: the
+        default value is set for the series without data for a day.
+
+        Returns:
+            TimeSeriesFrame: A new frame with only a day for each step.
+        """
+        assert day_of_batch >= -1, "'day_of_batch' can't be lesser than -1."
+        assert self.data_granularity.delta <= granularity.delta, "Can't shrink the time series to a lower level granularity."
+
+        days = batches.days_of_batches(self.start_date, self.end_date, granularity, day_of_batch)
+        targets = to_day_array(days)
+        idxs = np.searchsorted(self.days, targets).clip(max=len(self) - 1)
+        found = self.days[idxs] == targets
+
+        columns, masks = {}, {}
+        for name, column in self.columns.items():
+            valid = found if name not in self.masks else found & self.masks[name][idxs]
+            values = [column_item(column, idx) if is_valid else default for idx, is_valid in zip(idxs, valid)]
+            columns[name], masks[name] = to_masked_column(values, valid if default is None else [True] * len(days))
+            if masks[name] is None:
+                del masks[name]
+
+        return self.__class__(
+            targets,
+            columns=columns,
+            masks=masks,
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=granularity
+        )
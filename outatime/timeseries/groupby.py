@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List
+
+from ..granularity.granularity import Granularity
+from ..granularity.utils import get_first_available_beginning
+from ..util.bisect import find_delimiters
+
+
+@dataclass
+class Batch:
+    """
+    Range of days of a granularity step, with the [start, stop) range of
+    indexes of the time series elements included in it.
+    """
+    first_day: date
+    last_day: date
+    start: int
+    stop: int
+
+    def __len__(self):
+        return self.stop - self.start
+
+
+def iter_batches(
+        dates: List[date],
+        granularity: Granularity,
+        first_day_of_batch: int = 0,
+        last_day_of_batch: int = -1,
+        drop_tails: bool = False,
+        data_granularity: Granularity = None,
+        keep_empty: bool = False,
+) -> Iterator[Batch]:
+    """
+    Divides a sorted list of dates in batches, one for each time step of the
+    given granularity.
+
+    Batch ranges are generated once for each step, while dates are assigned
+    to them moving forward only: each search starts from the end of the
+    previous batch, so the whole list is scanned once.
+
+    Args:
+        dates (List[date]): Sorted list of dates.
+        granularity (Granularity): Time step to use to divide the dates.
+        first_day_of_batch (int, optional): The day of the time step to use as
+        first delimiter (0-indexed). Defaults to 0.
+        last_day_of_batch (int, optional): The day of the time step to use as
+        last delimiter (0-indexed). Defaults to -1.
+        drop_tails (bool, optional): Choose to remove initial and final days if
+        the granularity step is not complete. Defaults to False.
+        data_granularity (Granularity, optional): Granularity of the dates,
+        needed to drop the tails. Defaults to None.
+        keep_empty (bool, optional): Return also the batches without any
+        date. Defaults to False.
+
+    Returns:
+        Iterator[Batch]: The batches in chronological order.
+    """
+    if not dates:
+        return
+
+    end_date = dates[-1] if drop_tails else granularity.get_end_of_granularity(dates[-1])
+
+    if drop_tails:
+        start_date = get_first_available_beginning(
+            day=dates[0],
+            input_granularity=data_granularity,
+            output_granularity=granularity
+        )
+    else:
+        start_date = dates[0]
+
+    batch_beginning = granularity.get_n_day_of_granularity(start_date, first_day_of_batch)
+    batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+
+    lo = 0
+
+    while batch_end <= end_date:
+        idx_min, idx_max = find_delimiters(dates, batch_beginning, batch_end, lo=lo)
+
+        if keep_empty or idx_max >= idx_min:
+            yield Batch(first_day=batch_beginning, last_day=batch_end, start=idx_min, stop=idx_max + 1)
+
+        lo = idx_max + 1
+        batch_beginning += granularity.delta
+        batch_beginning = granularity.get_n_day_of_granularity(batch_beginning, first_day_of_batch)
+        batch_end = granularity.get_n_day_of_granularity(day=batch_beginning, idx=last_day_of_batch)
+
+
+def group_by_granularity(
+        dates: List[date],
+        granularity: Granularity,
+        first_day_of_batch: int = 0,
+        last_day_of_batch: int = -1,
+        drop_tails: bool = False,
+        data_granularity: Granularity = None,
+        keep_empty: bool = False,
+) -> List[Batch]:
+    """
+    Divides a sorted list of dates in batches, one for each time step of the
+    given granularity. See iter_batches for the arguments.
+
+    Returns:
+        List[Batch]: The batches in chronological order.
+    """
+    return list(iter_batches(
+        dates=dates,
+        granularity=granularity,
+        first_day_of_batch=first_day_of_batch,
+        last_day_of_batch=last_day_of_batch,
+        drop_tails=drop_tails,
+        data_granularity=data_granularity,
+        keep_empty=keep_empty,
+    ))
@@ -1,38 +1,58 @@
 from outatime.dataclass.time_series_data import TimeSeriesData
 from outatime.granularity.granularity import *
-from ..util.bisect import *
 
 
-def infer_ts_granularity(
-        data: List[TimeSeriesData],
+def has_unique_steps(dates: List[date], granularity: Granularity) -> bool:
+    """
+    Checks that each step of the given granularity contains at most one of
+    the given sorted dates. Dates are mapped to their period keys in a single
+    pass that stops at the first pair of consecutive dates sharing a key.
+
+    Args:
+        dates (List[date]): Sorted list of dates.
+        granularity (Granularity): Granularity to check.
+
+    Returns:
+        bool: True if no granularity step contains more than one date.
+    """
+    keys = map(granularity.period_key, dates)
+    previous = next(keys, None)
+    for key in keys:
+        if key == previous:
+            return False
+        previous = key
+    return True
+
+
+def infer_granularity(
+        dates: List[date],
         granularity_list: list
 ):
-    if len(data) < 2:
+    """
+    Searches the widest granularity of the list whose steps contain at most
+    one of the given sorted dates.
+    """
+    if len(dates) < 2:
         return None
 
     granularity_list = sorted(granularity_list, key=lambda gr: gr.delta, reverse=True)
 
-    dates = [element.day for element in data]
-    dates.sort()
-
-    output_granularity: Granularity
-
     for granularity in granularity_list:
         g = granularity()
-        f_day = g.get_beginning_of_granularity(dates[0])
-        l_day = g.get_end_of_granularity(dates[-1])
+        if has_unique_steps(dates, g):
+            return g
 
-        step_lengths = []
-        while f_day <= l_day:
-            step_l_day = g.get_end_of_granularity(f_day)
-            low_d, high_d = find_delimiters(dates, f_day, step_l_day)
-            batch = dates[low_d:high_d+1]
-            step_lengths.append(len(batch))
+    raise Exception("Unexpected granularity found in time series data.")
 
-            f_day += g.delta
 
-        if max(step_lengths) == 1:
-            output_granularity = g
-            return output_granularity
+def infer_ts_granularity(
+        data: List[TimeSeriesData],
+        granularity_list: list
+):
+    if len(data) < 2:
+        return None
 
-    raise Exception("Unexpected granularity found in time series data.")
+    dates = [element.day for element in data]
+    dates.sort()
+
+    return infer_granularity(dates, granularity_list)
@@ -0,0 +1,196 @@
+from collections import deque
+from datetime import date, timedelta
+from itertools import accumulate
+from operator import gt, lt
+from typing import Callable, Any, Iterator, List, Tuple, Union
+
+from .align import to_delta
+from .view import TimeSeriesView
+from ..dataclass.time_series_data import TimeSeriesData
+from ..granularity.granularity import Granularity
+from ..util.relativedelta import relativedelta
+
+
+def window_bounds(
+        dates: List[date],
+        size: int = None,
+        span: Union[relativedelta, timedelta] = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    Generate the [start, stop) range of indexes of the window ending on each
+    date: the last 'size' records, or the records of the dates in the
+    (day - span, day] range.
+    Dates are walked once, since both delimiters only move forward.
+
+    Args:
+        dates (List[date]): Sorted list of dates.
+        size (int, optional): Number of records of each window. Defaults to
+        None.
+        span (Union[relativedelta, timedelta], optional): Length of time of
+        each window. Defaults to None.
+
+    Returns:
+        Iterator[Tuple[int, int]]: Start and stop indexes of each window.
+    """
+    start = 0
+    for stop, day in enumerate(dates, 1):
+        if size is not None:
+            start = max(0, stop - size)
+        else:
+            limit = day - span
+            while dates[start] <= limit:
+                start += 1
+        yield start, stop
+
+
+class Rolling:
+    """
+    Moving window over the elements of a time series, ending on each element.
+    The window is a number of records, or a span of time: a span window only
+    contains the available days in the span, so gaps in the dates are taken
+    into account.
+    Each method generates a new time series with the result of each window,
+    stored on its last day. Windows with less values than 'min_periods' get
+    None as result.
+    """
+
+    def __init__(self,
+                 ts,
+                 size: int = None,
+                 span: Union[Granularity, relativedelta, int] = None,
+                 key: Callable[[Any], Any] = None,
+                 min_periods: int = None,
+                 ):
+        """
+        Args:
+            ts (TimeSeries): Input time series.
+            size (int, optional): Number of records of each window. Defaults
+            to None.
+            span (Union[Granularity, relativedelta, int], optional): Length of
+            time of each window, as the step of a granularity, a relativedelta
+            or a number of days. Defaults to None.
+            key (Callable[[Any], Any], optional): Function to get the value
+            of each element data. Defaults to None (the data itself).
+            min_periods (int, optional): Minimum number of values of a window
+            to get a result. Defaults to None ('size' for record windows, 1
+            for span windows).
+        """
+        if (size is None) == (span is None):
+            raise ValueError("Exactly one of 'size' and 'span' must be given.")
+        assert size is None or size > 0, "'size' must be greater than 0."
+        if isinstance(span, int):
+            assert span > 0, "'span' must be greater than 0."
+        if span is not None:
+            span = to_delta(span)
+        if min_periods is None:
+            min_periods = 1 if size is None else size
+        assert min_periods >= 0, "'min_periods' can't be lesser than 0."
+
+        self.ts = ts
+        self.min_periods = min_periods
+        self.values = [
+            None if element.data is None else element.data if key is None else key(element.data) for element in ts
+        ]
+        self.bounds = list(window_bounds(ts.dates, size=size, span=span))
+
+        valid = list(accumulate((value is not None for value in self.values), initial=0))
+        self.counts = [valid[stop] - valid[start] for start, stop in self.bounds]
+
+    def __slide(self) -> Iterator[Tuple[Any, List[Any], int]]:
+        """Yield the value entering each window, the values leaving it and its count of values."""
+        lo = 0
+        for (start, stop), count in zip(self.bounds, self.counts):
+            yield self.values[stop - 1], [value for value in self.values[lo:start] if value is not None], count
+            lo = start
+
+    def __is_valid(self, count: int) -> bool:
+        return count > 0 and count >= self.min_periods
+
+    def __to_series(self, results: List[Any]):
+        return self.ts.__class__(
+            [TimeSeriesData(day=element.day, data=result) for element, result in zip(self.ts, results)],
+            possible_granularity_list=self.ts.possible_granularity_list,
+            data_granularity=self.ts.__dict__.get('data_granularity')
+        )
+
+    def __running_sums(self) -> Iterator[Tuple[Any, int]]:
+        total = 0
+        for entering, leaving, count in self.__slide():
+            if entering is not None:
+                total += entering
+            for value in leaving:
+                total -= value
+            if count == 0:
+                total = 0
+            yield total, count
+
+    def __extremum(self, better: Callable[[Any, Any], bool]):
+        window, results = deque(), []
+        for (start, stop), count in zip(self.bounds, self.counts):
+            value = self.values[stop - 1]
+            if value is not None:
+                while window and not better(self.values[window[-1]], value):
+                    window.pop()
+                window.append(stop - 1)
+            while window and window[0] < start:
+                window.popleft()
+            results.append(self.values[window[0]] if self.__is_valid(count) else None)
+        return self.__to_series(results)
+
+    def count(self):
+        """Number of values of each window."""
+        return self.__to_series(self.counts)
+
+    def sum(self):
+        """Sum of the values of each window."""
+        return self.__to_series([total if self.__is_valid(count) else None for total, count in self.__running_sums()])
+
+    def mean(self):
+        """Mean of the values of each window."""
+        return self.__to_series(
+            [total / count if self.__is_valid(count) else None for total, count in self.__running_sums()]
+        )
+
+    def std(self):
+        """Population standard deviation of the values of each window."""
+        n, mean, m2, results = 0, 0., 0., []
+        for entering, leaving, count in self.__slide():
+            if entering is not None:
+                n += 1
+                delta = entering - mean
+                mean += delta / n
+                m2 += delta * (entering - mean)
+            for value in leaving:
+                n -= 1
+                if n == 0:
+                    mean, m2 = 0., 0.
+                else:
+                    delta = value - mean
+                    mean -= delta / n
+                    m2 -= delta * (value - mean)
+            results.append(max(m2, 0.) / n if self.__is_valid(count) else None)
+        return self.__to_series([None if result is None else result ** 0.5 for result in results])
+
+    def min(self):
+        """Minimum value of each window."""
+        return self.__extremum(lt)
+
+    def max(self):
+        """Maximum value of each window."""
+        return self.__extremum(gt)
+
+    def apply(self, method: Callable[[TimeSeriesView], Any]):
+        """
+        Apply a function to each window.
+
+        Args:
+            method (Callable[[TimeSeriesView], Any]): Function receiving the
+            elements of a window, as a view over the time series.
+
+        Returns:
+            TimeSeries: A new time series with the result of each window.
+        """
+        return self.__to_series([
+            method(TimeSeriesView(self.ts, start, stop)) if count >= self.min_periods else None
+            for (start, stop), count in zip(self.bounds, self.counts)
+        ])
@@ -0,0 +1,157 @@
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Callable, Any, Union
+
+from .batches import pick_first
+from .columnar import ColumnarTimeSeries, REDUCERS, is_dict_data
+from ..dataclass.time_series_data import TimeSeriesData
+from ..granularity.granularity import Granularity, WeeklyGranularity
+
+
+class StreamAggregator:
+    """
+    Incremental version of batches.aggregate for elements received one at a
+    time in chronological order.
+    Only the elements of the open batch are kept: a batch is aggregated as
+    soon as its last day is received, or when an element of a following
+    batch arrives.
+    """
+
+    def __init__(self,
+                 method: Union[str, Callable[[List[Any]], Any]],
+                 granularity: Granularity = WeeklyGranularity(),
+                 first_day_of_batch: int = 0,
+                 last_day_of_batch: int = -1,
+                 store_day_of_batch: int = 0,
+                 ):
+        """
+        Args:
+            method (Union[str, Callable[[List[Any]], Any]]): Aggregation
+            function, or reducer name, to apply.
+            granularity (Granularity, optional): Time step to use to divide the
+            input elements. Defaults to WeeklyGranularity().
+            first_day_of_batch (int, optional): The day of the time step to use as
+            first delimiter (0-indexed). Defaults to 0.
+            last_day_of_batch (int, optional): The day of the time step to use as
+            last delimiter (0-indexed). Defaults to -1.
+            store_day_of_batch (int, optional): The day of the time step to store
+            aggregated data into (0-indexed). Defaults to 0.
+        """
+        assert first_day_of_batch >= 0, "'first_day_of_batch' can't be lesser than 0."
+        assert last_day_of_batch >= -1 and last_day_of_batch != 0, "'last_day_of_batch' can't be lesser than -1 or equal to 0."
+        assert store_day_of_batch >= -1, "'store_day_of_batch' can't be lesser than -1."
+        if isinstance(method, str) and method not in REDUCERS:
+            raise ValueError(f'Invalid aggregation method: {method}')
+
+        self.method = method
+        self.granularity = granularity
+        self.first_day_of_batch = first_day_of_batch
+        self.last_day_of_batch = last_day_of_batch
+        self.store_day_of_batch = store_day_of_batch
+
+        self.last_day: date = None
+        self.batch_beginning: date = None
+        self.batch_end: date = None
+        self.batch: List[TimeSeriesData] = []
+
+    def push(self, element: TimeSeriesData) -> List[TimeSeriesData]:
+        """
+        Add an element to the open batch.
+
+        Args:
+            element (TimeSeriesData): New element, following all the
+            elements already received.
+
+        Returns:
+            List[TimeSeriesData]: The aggregated batches closed by the
+            new element, if any.
+        """
+        assert isinstance(element, TimeSeriesData), "Only TimeSeriesData objects can be added."
+        day = element.day
+        if self.last_day is not None and day <= self.last_day:
+            raise ValueError(f'Elements must be in chronological order: {day} received after {self.last_day}.')
+        self.last_day = day
+
+        res = []
+        if self.batch and day > self.batch_end:
+            res += self.flush()
+
+        if not self.batch:
+            self.batch_beginning = self.granularity.get_n_day_of_granularity(day, self.first_day_of_batch)
+            self.batch_end = self.granularity.get_n_day_of_granularity(day=self.batch_beginning, idx=self.last_day_of_batch)
+
+        if self.batch_beginning <= day <= self.batch_end:
+            self.batch.append(element)
+            if day == self.batch_end:
+                res += self.flush()
+
+        return res
+
+    def flush(self) -> List[TimeSeriesData]:
+        """
+        Aggregate the open batch, if any.
+
+        Returns:
+            List[TimeSeriesData]: The aggregated open batch, if any.
+        """
+        if not self.batch:
+            return []
+
+        day = self.granularity.get_n_day_of_granularity(day=self.batch_beginning, idx=self.store_day_of_batch)
+        if self.method in ('first', 'last'):
+            # picked from the elements, as by batches.aggregate
+            payloads = [element.data for element in self.batch]
+            if self.method == 'last':
+                payloads.reverse()
+            element = TimeSeriesData(day=day, data=pick_first(payloads, is_dict_data(payloads)))
+        elif isinstance(self.method, str):
+            columnar_ts = ColumnarTimeSeries.from_elements(self.batch)
+            element = columnar_ts.reduce_batches([day], [0], [len(self.batch)], self.method)[0]
+        else:
+            element = TimeSeriesData(day=day, data=self.method([element.data for element in self.batch]))
+
+        self.batch = []
+        return [element]
+
+
+def stream_aggregate(
+        elements: Iterable[TimeSeriesData],
+        method: Union[str, Callable[[List[Any]], Any]],
+        granularity: Granularity = WeeklyGranularity(),
+        first_day_of_batch: int = 0,
+        last_day_of_batch: int = -1,
+        store_day_of_batch: int = 0,
+) -> Iterator[TimeSeriesData]:
+    """
+    Aggregates a chronological stream of TimeSeriesData like
+    batches.aggregate, yielding each aggregated batch as soon as it is closed.
+    See StreamAggregator for the arguments.
+
+    Returns:
+        Iterator[TimeSeriesData]: The aggregated batches.
+    """
+    aggregator = StreamAggregator(method, granularity, first_day_of_batch, last_day_of_batch, store_day_of_batch)
+    for element in elements:
+        yield from aggregator.push(element)
+    yield from aggregator.flush()
+
+
+async def astream_aggregate(
+        elements: AsyncIterable[TimeSeriesData],
+        method: Union[str, Callable[[List[Any]], Any]],
+        granularity: Granularity = WeeklyGranularity(),
+        first_day_of_batch: int = 0,
+        last_day_of_batch: int = -1,
+        store_day_of_batch: int = 0,
+) -> AsyncIterator[TimeSeriesData]:
+    """
+    Asynchronous version of stream_aggregate.
+
+    Returns:
+        AsyncIterator[TimeSeriesData]: The aggregated batches.
+    """
+    aggregator = StreamAggregator(method, granularity, first_day_of_batch, last_day_of_batch, store_day_of_batch)
+    async for element in elements:
+        for res in aggregator.push(element):
+            yield res
+    for res in aggregator.flush():
+        yield res
@@ -1,13 +1,21 @@
-import pickle
+from bisect import bisect_left
+from copy import deepcopy
 from datetime import date
 from functools import cached_property
-from typing import List, Callable, Any
-
-from .filter_parser import FilterParserGenerator
-from .inference import infer_ts_granularity
+from itertools import islice
+from typing import List, Callable, Any, Union
+
+from . import align
+from .filter_parser import CompiledFilterParserGenerator, VectorizedFilterParserGenerator, BoundsFilterParserGenerator, \
+    combine_cache_info
+from .groupby import group_by_granularity
+from .inference import infer_granularity
+from .rolling import Rolling
+from .view import TimeSeriesView
 from ..dataclass.time_series_data import TimeSeriesData
 from ..granularity.granularity import *
-from ..util.bisect import index_of, find_delimiters
+from ..util import agenda
+from ..util.bisect import index_of, find_delimiters, indexes_of, indexes_lte, indexes_gte, indexes_nearest
 
 
 def get_day(x):
@@ -16,19 +24,75 @@ def get_day(x):
 
 default_granularity_set = [YearlyGranularity, QuarterlyGranularity, MonthlyGranularity, WeeklyGranularity, DailyGranularity]
 
+conflict_policies = ('keep_old', 'keep_new')
+
+asof_searches = {'backward': indexes_lte, 'forward': indexes_gte, 'nearest': indexes_nearest}
+
+
+def resolve_conflict(old: TimeSeriesData, new: TimeSeriesData, conflict) -> TimeSeriesData:
+    """Choose the element to keep between two elements with the same day."""
+    if conflict == 'keep_old':
+        return old
+    elif conflict == 'keep_new':
+        return new
+    return TimeSeriesData(day=new.day, data=conflict(old.data, new.data))
+
+
+def merge_sorted(old: List[TimeSeriesData], new: List[TimeSeriesData], conflict) -> List[TimeSeriesData]:
+    """
+    Merge two lists of TimeSeriesData sorted by day into a new sorted list,
+    resolving elements with the same day with the given conflict policy.
+    Duplicated days in the 'new' list are resolved as well, in list order.
+    """
+    merged = []
+    i, j = 0, 0
+    len_old, len_new = len(old), len(new)
+
+    while i < len_old or j < len_new:
+        if j == len_new or (i < len_old and old[i].day < new[j].day):
+            element = old[i]
+            i += 1
+        elif i == len_old or new[j].day < old[i].day:
+            element = new[j]
+            j += 1
+        else:
+            element = resolve_conflict(old[i], new[j], conflict)
+            i += 1
+            j += 1
+
+        if merged and merged[-1].day == element.day:
+            merged[-1] = resolve_conflict(merged[-1], element, conflict)
+        else:
+            merged.append(element)
+
+    return merged
+
 
 class TimeSeries(List[TimeSeriesData]):
     """
     Class that inherits list to add useful methods for time series management.
     It contains only TimeSeriesData objects as elements.
+
+    The granularity of the data is inferred on first access to
+    'data_granularity' and inferred again after any change of the elements,
+    unless it is given when constructing the time series.
+    The cached properties are cleared by all the list methods changing the
+    elements, which also keep the elements sorted by date.
     """
-    data_granularity: Granularity
-    filter_parser = FilterParserGenerator().get_parser()
+    query_parser_generator = CompiledFilterParserGenerator()
+    filter_parser = query_parser_generator.get_parser()
+    vectorized_query_parser_generator = VectorizedFilterParserGenerator()
+    vectorized_filter_parser = vectorized_query_parser_generator.get_parser()
+    bounds_query_parser_generator = BoundsFilterParserGenerator()
+    bounds_filter_parser = bounds_query_parser_generator.get_parser()
+    # minimum length of the time series to evaluate queries on arrays
+    vectorized_query_threshold = 100
     possible_granularity_list = []
 
     def __init__(self,
                  data=None,
                  possible_granularity_list=None,
+                 data_granularity: Granularity = None,
                  ):
         if possible_granularity_list is None:
             possible_granularity_list = default_granularity_set
@@ -36,27 +100,47 @@ class TimeSeries(List[TimeSeriesData]):
             data = []
 
         super().__init__(data)
-        self.possible_granularity_list[:] = possible_granularity_list
+        if not self.__is_sorted():
+            # append and update search the sorted dates
+            self.__refresh()
+        # a copy for each time series: the granularity is inferred lazily, after other time series are created
+        self.possible_granularity_list = list(possible_granularity_list)
 
-        if len(data) > 1:
-            self.__infer_data_granularity()
-        else:
-            self.data_granularity = None
+        if data_granularity is not None and len(self) > 1:
+            self.data_granularity = data_granularity
 
     def __add__(self, other):
         ts = super(TimeSeries, self).__add__(other)
-        return self.__class__(ts)
+        return self.__class__(ts, possible_granularity_list=self.possible_granularity_list)
 
-    def __deepcopy__(self, *args):
-        return pickle.loads(pickle.dumps(self))
+    def __copy__(self):
+        return self.copy(deep=False)
+
+    def __deepcopy__(self, memo=None):
+        return self.__class__(
+            [deepcopy(element, memo) for element in self],
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__known_granularity()
+        )
 
     def __delitem__(self, idx):
         super().__delitem__(idx)
         self.__refresh()
 
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self.__refresh()
+        return self
+
     def __getitem__(self, item):
         if isinstance(item, slice):
-            return self.__class__(super(TimeSeries, self).__getitem__(item))
+            # a contiguous subset keeps the (already known) granularity
+            data_granularity = self.__known_granularity() if item.step in (None, 1) else None
+            return self.__class__(
+                super(TimeSeries, self).__getitem__(item),
+                possible_granularity_list=self.possible_granularity_list,
+                data_granularity=data_granularity
+            )
         else:
             return super(TimeSeries, self).__getitem__(item)
 
@@ -70,19 +154,70 @@ class TimeSeries(List[TimeSeriesData]):
 
     def __clear_cache(self):
         """Clear all cached properties."""
-        if hasattr(self, 'dates'):
-            del self.dates
+        self.__dict__.pop('dates', None)
+        self.__dict__.pop('calendar_fields', None)
+        self.__dict__.pop('data_granularity', None)
 
-    def __infer_data_granularity(self):
-        self.data_granularity = infer_ts_granularity(self, self.possible_granularity_list)
+    @classmethod
+    def __query_parser_generators(cls) -> list:
+        """Parser generators used by 'query', each with its own cache."""
+        return [cls.query_parser_generator, cls.vectorized_query_parser_generator, cls.bounds_query_parser_generator]
+
+    def __known_granularity(self):
+        """Granularity of the time series if already evaluated, else None."""
+        return self.__dict__.get('data_granularity')
+
+    def __is_locally_unique(self, idx: int) -> bool:
+        """
+        Check that the element at the given index doesn't share the current
+        granularity step with its neighbours.
+        """
+        period_key = self.data_granularity.period_key
+        key = period_key(self[idx].day)
+        if idx > 0 and period_key(self[idx - 1].day) == key:
+            return False
+        if idx < len(self) - 1 and period_key(self[idx + 1].day) == key:
+            return False
+        return True
+
+    def __is_sorted(self) -> bool:
+        """Check that the elements are sorted by date."""
+        return all(element.day <= next_element.day for element, next_element in zip(self, islice(self, 1, None)))
 
     def __refresh(self):
         """Sort the timeseries by date and reset its properties."""
         if self.__len__() > 1:
             self.__sort__()
-            self.__infer_data_granularity()
         self.__clear_cache()
 
+    def __from_values(self, values: List[Any]):
+        """Generate a new time series with the days of this one and the given values."""
+        return self.__class__(
+            [TimeSeriesData(day=day, data=value) for day, value in zip(self.dates, values)],
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__known_granularity()
+        )
+
+    def __search_many(self, days: List[date], search: Callable[[list, list], list]) -> list:
+        """
+        Apply a batched search of util.bisect to days in any order, with
+        results in the order of the days. Days are sorted first if needed, so
+        that the dates are scanned once.
+        """
+        if all(day <= next_day for day, next_day in zip(days, days[1:])):
+            return search(self.dates, days)
+        order = sorted(range(len(days)), key=days.__getitem__)
+        res = [None] * len(days)
+        for pos, idx in zip(order, search(self.dates, [days[pos] for pos in order])):
+            res[pos] = idx
+        return res
+
+    def __compare_sources(self, method, periods: int, offset, key):
+        values = [element.data if key is None or element.data is None else key(element.data) for element in self]
+        return self.__from_values(
+            align.compare_sources(values, align.source_indexes(self.dates, periods=periods, offset=offset), method)
+        )
+
     @property
     def start_date(self) -> date:
         """First date of the time series."""
@@ -98,25 +233,88 @@ class TimeSeries(List[TimeSeriesData]):
         """List of all dates available in the time series."""
         return [data.day for data in self]
 
+    @cached_property
+    def calendar_fields(self) -> dict:
+        """Arrays of 'year', 'month' and 'day' of all dates in the time series."""
+        return agenda.calendar_fields(self.dates)
+
+    @cached_property
+    def data_granularity(self) -> Granularity:
+        """Granularity of the time series, inferred from its dates."""
+        # sorting already sorted dates is linear, it only guards unsorted inputs
+        return infer_granularity(sorted(self.dates), self.possible_granularity_list)
+
     def append(self, object_: TimeSeriesData):
         """Add a new TimeSeriesData object to the time series."""
         assert isinstance(object_, TimeSeriesData), "Only TimeSeriesData objects can be appended."
-        try:
-            self.delete(day=object_.day)
-        except ValueError:
-            pass
-        finally:
-            super(TimeSeries, self).append(object_)
-            self.__refresh()
+        dates = self.dates
+        idx = bisect_left(dates, object_.day)
+
+        if idx < len(dates) and dates[idx] == object_.day:
+            super(TimeSeries, self).__setitem__(idx, object_)
+            return
+
+        super(TimeSeries, self).insert(idx, object_)
+        dates.insert(idx, object_.day)
+        self.__dict__.pop('calendar_fields', None)
+
+        # a new element can only make the granularity finer, so it is enough
+        # to check the steps of its neighbours
+        data_granularity = self.__known_granularity()
+        if data_granularity is None or not self.__is_locally_unique(idx):
+            self.__dict__.pop('data_granularity', None)
+
+    def asof_many(self, days: List[date], direction: str = 'backward') -> List[TimeSeriesData]:
+        """
+        Search the element available as of each of the given days, with a
+        single pass over the dates: the last one on or before the day
+        ('backward'), the first one on or after the day ('forward') or the
+        nearest one ('nearest', the previous one when two are equally near).
+
+        Args:
+            days (List[date]): The days to search in the time series.
+            direction (str, optional): Where to search the element of each
+            day, 'backward', 'forward' or 'nearest'. Defaults to 'backward'.
+
+        Returns:
+            List[TimeSeriesData]: The element found for each day, None if
+            there is none.
+        """
+        if direction not in asof_searches:
+            raise ValueError(f'Invalid direction: {direction}')
+        days = list(days)
+        return [None if idx is None else self[idx] for idx in self.__search_many(days, asof_searches[direction])]
+
+    def clear(self):
+        """Remove all elements of the time series."""
+        super().clear()
+        self.__clear_cache()
+
+    def copy(self, deep: bool = True):
+        """
+        Return a copy of the time series.
 
-    def copy(self):
-        """Return a deep copy of the list."""
-        return self.__deepcopy__()
+        A shallow copy shares the TimeSeriesData elements with the original
+        time series. No method of the time series changes an element in
+        place (elements are always replaced), so the two copies stay
+        independent as long as the elements' data is not modified in place.
+
+        Args:
+            deep (bool, optional): Copy the elements too. Defaults to True.
+        """
+        if deep:
+            return self.__deepcopy__()
+        return self.__class__(
+            self,
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.__known_granularity()
+        )
 
     def cut(self, min_date: date, max_date: date, inplace: bool = False):
         """
         Cut the time series selecting only the available days between the
         input delimiters.
+        Only the selected elements are copied to the new time series.
 
         Args:
             min_date (date): Minimum date of range.
@@ -127,16 +325,46 @@ class TimeSeries(List[TimeSeriesData]):
         idx_min, idx_max = find_delimiters(self.dates, min_date, max_date)
 
         if inplace:
+            data_granularity = self.__known_granularity()
             self[:] = self[idx_min:idx_max+1]
-            self.__clear_cache()
+            if data_granularity is not None and len(self) > 1:
+                self.data_granularity = data_granularity
         else:
-            return self.__deepcopy__()[idx_min:idx_max+1]
+            return self.view(min_date, max_date).materialize()
 
     def delete(self, day: date):
         """Delete item by day."""
         idx = index_of(self.dates, day)
         self.__delitem__(idx)
 
+    def diff(self, periods: int = 1, offset=None, key: Callable[[Any], Any] = None):
+        """
+        Difference between the data of each element and the data of the
+        element 'periods' rows before, or of the day 'offset' before if given.
+
+        Example:
+            ts.diff(offset=relativedelta(years=1))  # year over year change
+
+        Args:
+            periods (int, optional): Number of rows between the compared
+            elements. Defaults to 1.
+            offset (optional): Distance of the compared days, as a
+            relativedelta, a granularity step or a number of days. Defaults
+            to None.
+            key (Callable[[Any], Any], optional): Function to get the value
+            of each element data. Defaults to None (the data itself).
+
+        Returns:
+            TimeSeries: A new time series with the differences, None when
+            any of the compared values is missing.
+        """
+        return self.__compare_sources(lambda current, previous: current - previous, periods, offset, key)
+
+    def extend(self, iterable):
+        """Add the elements of the iterable, keeping the time series sorted by date."""
+        super().extend(iterable)
+        self.__refresh()
+
     def get(self, day: date, value: ... = None) -> TimeSeriesData:
         """
         Search the time series element for the given day.
@@ -149,10 +377,70 @@ class TimeSeries(List[TimeSeriesData]):
         Returns:
             TimeSeriesData: A time series element for the searched day.
         """
-        try:
-            return self[index_of(self.dates, day)]
-        except (KeyError, ValueError):
-            return TimeSeriesData(day=day, data=value)
+        dates = self.dates
+        idx = bisect_left(dates, day)
+        if idx < len(dates) and dates[idx] == day:
+            return self[idx]
+        return TimeSeriesData(day=day, data=value)
+
+    def get_many(self, days: List[date], value: ... = None) -> List[TimeSeriesData]:
+        """
+        Search the time series elements for many days at once, with a single
+        pass over the dates.
+
+        Args:
+            days (List[date]): The days to search in the time series.
+            value (None, optional): Give a default value to set as 'data' when
+            a day is not found. Defaults to None.
+
+        Returns:
+            List[TimeSeriesData]: A time series element for each searched day.
+        """
+        days = list(days)
+        return [
+            TimeSeriesData(day=day, data=value) if idx is None else self[idx]
+            for day, idx in zip(days, self.__search_many(days, indexes_of))
+        ]
+
+    def insert(self, index, object_):
+        """Add an element, keeping the time series sorted by date (the index is ignored)."""
+        super().insert(index, object_)
+        self.__refresh()
+
+    def lag(self, offset):
+        """
+        Move to each day the data of the day 'offset' before, None when that
+        day is not available.
+        The shifted dates are matched with the dates of the time series in a
+        single pass.
+
+        Args:
+            offset: Distance of the days, as a relativedelta, a granularity
+            step or a number of days (negative to look forward).
+
+        Returns:
+            TimeSeries: A new time series with the lagged data.
+        """
+        idxs = align.lagged_indexes(self.dates, align.to_delta(offset))
+        return self.__from_values([None if idx is None else self[idx].data for idx in idxs])
+
+    def pct_change(self, periods: int = 1, offset=None, key: Callable[[Any], Any] = None):
+        """
+        Relative change between the data of each element and the data of the
+        element 'periods' rows before, or of the day 'offset' before if given.
+        See diff for the arguments.
+
+        Returns:
+            TimeSeries: A new time series with the changes, None when any of
+            the compared values is missing or the previous one is 0.
+        """
+        return self.__compare_sources(align.pct_change, periods, offset, key)
+
+    def pop(self, index=-1):
+        """Remove and return the element at the given index."""
+        res = super().pop(index)
+        self.__clear_cache()
+        return res
 
     def query(self, expr: str, inplace: bool = False):
         """
@@ -170,19 +458,39 @@ class TimeSeries(List[TimeSeriesData]):
                 [TimeSeriesData(day=2022-01-14, data={'a': 1, 'b': 8}),
                 TimeSeriesData(day=2022-02-16, data={'a': 3, 'b': 8})]
 
+        The bounds set by the expression on year, month and day restrict the
+        search to a range of dates, found with a binary search (see
+        TimeSeriesView.select). Ranges with at least
+        'vectorized_query_threshold' elements evaluate the query at once on
+        the arrays of 'calendar_fields'.
+
         Args:
             expr (str): The query string to evaluate.
             inplace (bool, optional): Original time series is overwritten
             if set to True. Defaults to False.
         """
-        query_filter, _ = self.filter_parser(expr)
-        filtered = filter(lambda x: query_filter(x), self)
-        filtered_ts = list(filtered)
+        filtered_ts = self.view().select(expr)
 
         if inplace:
             self[:] = filtered_ts
         else:
-            return self.__class__(filtered_ts)
+            return self.__class__(filtered_ts, possible_granularity_list=self.possible_granularity_list)
+
+    @classmethod
+    def query_cache_clear(cls):
+        """Clear the caches of parsed queries of all parsers and their statistics."""
+        for generator in cls.__query_parser_generators():
+            generator.cache_clear()
+
+    @classmethod
+    def query_cache_info(cls):
+        """Hits, misses, maximum and current size of the caches of parsed queries, summed over all parsers."""
+        return combine_cache_info(cls.__query_parser_generators())
+
+    def remove(self, value):
+        """Remove the first occurrence of the given element."""
+        super().remove(value)
+        self.__clear_cache()
 
     def resample(self,
                  granularity: Granularity = DailyGranularity(),
@@ -217,45 +525,148 @@ class TimeSeries(List[TimeSeriesData]):
             if set to True. Defaults to False.
         """
         resampled = []
-        temp_ts = self.__deepcopy__()
-
-        resampling_end_date = granularity.get_end_of_granularity(self.end_date)
 
-        step_first_day = granularity.get_beginning_of_granularity(day=self.start_date)
-        step_last_day = granularity.get_end_of_granularity(day=step_first_day)
+        batches = group_by_granularity(dates=self.dates, granularity=granularity, keep_empty=True)
 
-        while step_last_day <= resampling_end_date:
-            day = granularity.get_n_day_of_granularity(day=step_first_day, idx=index_of_granularity)
-
-            idx_min, idx_max = find_delimiters(temp_ts.dates, step_first_day, step_last_day)
-            subset = temp_ts[idx_min:idx_max + 1]
-
-            data = method([element.data for element in subset]) if method else None
+        for batch in batches:
+            data = method([self[idx].data for idx in range(batch.start, batch.stop)]) if method else None
 
             resampled.append(
                 TimeSeriesData(
-                    day=day,
+                    day=granularity.get_n_day_of_granularity(day=batch.first_day, idx=index_of_granularity),
                     data=data
                 )
             )
 
-            temp_ts = temp_ts[idx_max + 1:]
-            step_first_day += granularity.delta
-            step_last_day = granularity.get_end_of_granularity(day=step_first_day)
-
         if inplace:
             self[:] = resampled
             self.data_granularity = granularity
         else:
-            return self.__class__(resampled, possible_granularity_list=self.possible_granularity_list)
+            return self.__class__(
+                resampled,
+                possible_granularity_list=self.possible_granularity_list,
+                data_granularity=granularity
+            )
 
-    def update(self, __list: List[TimeSeriesData]):
+    def reverse(self):
+        """Elements are kept sorted by date, so the order doesn't change."""
+        self.__refresh()
+
+    def rolling(self,
+                size: int = None,
+                span: Union[Granularity, relativedelta, int] = None,
+                key: Callable[[Any], Any] = None,
+                min_periods: int = None,
+                ) -> Rolling:
+        """
+        Generate a moving window ending on each element of the time series.
+        The window is the last 'size' records, or the records in the last
+        'span' of time (a granularity step or a number of days).
+
+        Example:
+            ts.rolling(span=7, key=lambda data: data['a']).mean()
+
+        Args:
+            size (int, optional): Number of records of each window. Defaults
+            to None.
+            span (Union[Granularity, relativedelta, int], optional): Length of
+            time of each window. Defaults to None.
+            key (Callable[[Any], Any], optional): Function to get the value
+            of each element data. Defaults to None (the data itself).
+            min_periods (int, optional): Minimum number of values of a window
+            to get a result. Defaults to None ('size' for record windows, 1
+            for span windows).
+
+        Returns:
+            Rolling: The windows, with the methods to reduce them.
+        """
+        return Rolling(self, size=size, span=span, key=key, min_periods=min_periods)
+
+    @classmethod
+    def set_query_cache_size(cls, cache_size: int):
+        """
+        Resize the LRU caches of parsed queries of all the parsers used by
+        'query' (compiled, vectorized and bounds), clearing them.
+
+        Args:
+            cache_size (int): Number of parsed queries to keep in each cache,
+            None for no limit or 0 to disable the caches.
+        """
+        for generator in cls.__query_parser_generators():
+            generator.set_cache_size(cache_size)
+
+    def shift(self, periods: int = 1):
+        """
+        Move the data of each element 'periods' rows forward (backward if
+        negative), keeping the days. Elements without data to move get None.
+
+        Args:
+            periods (int, optional): Number of rows to move the data.
+            Defaults to 1.
+
+        Returns:
+            TimeSeries: A new time series with the shifted data.
+        """
+        idxs = align.shifted_indexes(len(self), periods)
+        return self.__from_values([None if idx is None else self[idx].data for idx in idxs])
+
+    def sort(self, *, key=None, reverse=False):
+        """Sort the elements, like list.sort (update sorts them again by date)."""
+        super().sort(key=key, reverse=reverse)
+        self.__clear_cache()
+
+    def view(self, min_date: date = None, max_date: date = None) -> TimeSeriesView:
+        """
+        Generate a read-only view over the available days between the input
+        delimiters, without copying any element.
+        Use the view 'materialize' method to get a new time series.
+
+        Args:
+            min_date (date, optional): Minimum date of range. Defaults to
+            None (the start date).
+            max_date (date, optional): Maximum date of range. Defaults to
+            None (the end date).
+
+        Returns:
+            TimeSeriesView: A view over the selected range.
+        """
+        view = TimeSeriesView(self)
+        if len(self) == 0 or (min_date is None and max_date is None):
+            return view
+        return view.cut(
+            min_date=self.start_date if min_date is None else min_date,
+            max_date=self.end_date if max_date is None else max_date
+        )
+
+    def update(self,
+               __list: List[TimeSeriesData],
+               conflict: Union[str, Callable[[Any, Any], Any]] = 'keep_new',
+               ):
         """
         Add all elements of the given list of TimeSeriesData to the time series.
         Updates existing elements if already in the time series.
 
+        Only the input list is sorted (and the time series, if not sorted by
+        date already), then it is merged with the time series in a single pass and the granularity is inferred once at the end.
+
         Args:
             __list (List[TimeSeriesData]): Input list of new elements.
+            conflict (Union[str, Callable[[Any, Any], Any]], optional): Policy
+            to apply to days available both in the time series and in the
+            input list. It can be 'keep_old', 'keep_new' or a method that
+            receives the old and the new data and returns the data to keep.
+            Defaults to 'keep_new'.
         """
-        res_ts_data = super(TimeSeries, self).__add__(__list)
-        self[:] = res_ts_data
+        if not callable(conflict) and conflict not in conflict_policies:
+            raise ValueError(f'Invalid conflict policy: {conflict}')
+        assert all(isinstance(element, TimeSeriesData) for element in __list), "Only TimeSeriesData objects can be added."
+
+        new_elements = sorted(__list, key=get_day)
+        old_elements = list(self)
+        if not self.__is_sorted():
+            # after a sort with another key
+            old_elements.sort(key=get_day)
+        merged = merge_sorted(old_elements, new_elements, conflict)
+
+        super(TimeSeries, self).__setitem__(slice(None), merged)
+        self.__clear_cache()
@@ -0,0 +1,182 @@
+from bisect import bisect_left
+from copy import deepcopy
+from datetime import date
+from functools import cached_property
+from itertools import compress
+from typing import List, Sequence
+
+from .filter_parser import date_window
+from ..dataclass.time_series_data import TimeSeriesData
+from ..granularity.granularity import Granularity
+from ..util import agenda
+from ..util.bisect import find_delimiters
+
+
+class TimeSeriesView(Sequence[TimeSeriesData]):
+    """
+    Read-only view over the elements of a time series in the [start, stop)
+    range of indexes.
+    No element is copied: the view reads the elements of the parent time
+    series, so the parent must not be changed while the view is in use.
+    """
+
+    def __init__(self, ts, start: int = 0, stop: int = None):
+        start, stop, _ = slice(start, stop).indices(len(ts))
+        self.ts = ts
+        self.start = start
+        self.stop = max(start, stop)
+
+    def __deepcopy__(self, *args):
+        return self.materialize(deep=True)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:
+                return self.__class__(self.ts, self.start + start, self.start + stop)
+            return self.ts.__class__(
+                [self[idx] for idx in range(start, stop, step)],
+                possible_granularity_list=self.possible_granularity_list
+            )
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("TimeSeriesView index out of range")
+        return list.__getitem__(self.ts, self.start + item)
+
+    def __iter__(self):
+        get_item = list.__getitem__
+        for idx in range(self.start, self.stop):
+            yield get_item(self.ts, idx)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    @property
+    def possible_granularity_list(self) -> list:
+        """Granularity list of the parent time series."""
+        return self.ts.possible_granularity_list
+
+    @property
+    def data_granularity(self) -> Granularity:
+        """Granularity of the parent time series."""
+        if len(self) < 2:
+            return None
+        return self.ts.data_granularity
+
+    @property
+    def start_date(self) -> date:
+        """First date of the view."""
+        return self[0].day
+
+    @property
+    def end_date(self) -> date:
+        """Last date of the view."""
+        return self[-1].day
+
+    @cached_property
+    def dates(self):
+        """List of all dates available in the view."""
+        return self.ts.dates[self.start:self.stop]
+
+    @property
+    def calendar_fields(self) -> dict:
+        """Arrays of 'year', 'month' and 'day' of all dates in the view."""
+        if len(self) == len(self.ts) or 'calendar_fields' in self.ts.__dict__:
+            return {key: values[self.start:self.stop] for key, values in self.ts.calendar_fields.items()}
+        return agenda.calendar_fields(self.dates)
+
+    def cut(self, min_date: date, max_date: date):
+        """
+        Generate a new view with only the available days between the input
+        delimiters.
+
+        Args:
+            min_date (date): Minimum date of range.
+            max_date (date): Maximum date of range.
+
+        Returns:
+            TimeSeriesView: View over the selected range.
+        """
+        idx_min, idx_max = find_delimiters(self.ts.dates, min_date, max_date, lo=self.start, hi=self.stop)
+        return self.__class__(self.ts, idx_min, idx_max + 1)
+
+    def get(self, day: date, value: ... = None) -> TimeSeriesData:
+        """
+        Search the view element for the given day.
+
+        Args:
+            day (date): The day to search in the view.
+            value (None, optional): Give a default value to set as 'data' when
+            the day is not found. Defaults to None.
+
+        Returns:
+            TimeSeriesData: A time series element for the searched day.
+        """
+        dates = self.ts.dates
+        idx = bisect_left(dates, day, self.start, self.stop)
+        if idx < self.stop and dates[idx] == day:
+            return list.__getitem__(self.ts, idx)
+        return TimeSeriesData(day=day, data=value)
+
+    def materialize(self, deep: bool = True):
+        """
+        Generate a new time series with the elements of the view.
+
+        Args:
+            deep (bool, optional): Copy the elements too, otherwise they are
+            shared with the parent time series. Defaults to True.
+
+        Returns:
+            TimeSeries: A new time series.
+        """
+        ts = self.ts.__class__(
+            list(self),
+            possible_granularity_list=self.possible_granularity_list,
+            data_granularity=self.ts.__dict__.get('data_granularity')
+        )
+        return deepcopy(ts) if deep else ts
+
+    def query(self, expr: str):
+        """
+        Query the view data with a boolean expression.
+        See TimeSeries.query for the syntax.
+
+        Args:
+            expr (str): The query string to evaluate.
+
+        Returns:
+            TimeSeries: A new time series with the matching elements.
+        """
+        return self.ts.__class__(self.select(expr), possible_granularity_list=self.possible_granularity_list)
+
+    def select(self, expr: str) -> List[TimeSeriesData]:
+        """
+        Search the elements of the view matching a boolean expression.
+
+        The bounds set by the expression on year, month and day give a range
+        of dates, found with a binary search: the expression is evaluated
+        only on the elements in that range.
+
+        Args:
+            expr (str): The query string to evaluate.
+
+        Returns:
+            List[TimeSeriesData]: The matching elements.
+        """
+        bounds, _ = self.ts.bounds_filter_parser(expr)
+        window = date_window(bounds)
+        if window is None:
+            return []
+        view = self.cut(*window)
+
+        if len(view) >= self.ts.vectorized_query_threshold:
+            query_mask, _ = self.ts.vectorized_filter_parser(expr)
+            return list(compress(view, query_mask(view.calendar_fields)))
+
+        query_filter, _ = self.ts.filter_parser(expr)
+        return [element for element in view if query_filter(element)]
@@ -3,7 +3,6 @@ from datetime import date, datetime, timedelta
 from typing import List
 
 from dateutil.rrule import DAILY, rrule, MO, TU, WE, TH, FR, SA, SU
-import numpy as np
 
 from .decorators import day_or_datetime
 from ..util.relativedelta import relativedelta
@@ -20,6 +19,8 @@ WEEKMASK = [
 
 WEEKDAYS = [MO, TU, WE, TH, FR, SA, SU]
 
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
 
 @day_or_datetime
 def get_quarter(day: date) -> int:
@@ -119,6 +120,8 @@ def is_business_day(day: date, holidays: List[date] = []) -> bool:
     Returns:
         bool: True if the day is a business day.
     """
+    import numpy as np
+
     holidays_strings = [hd.strftime("%Y-%m-%d") for hd in holidays]
     return np.is_busday(day.strftime("%Y-%m-%d"), weekmask='1111100', holidays=holidays_strings)
 
@@ -151,6 +154,127 @@ def weekdays_of_range(start_date: date, end_date: date, weekday: int, exclusive:
     return n_days, days
 
 
+def nth_weekday_of_range(start_date: date, end_date: date, weekday: int, idx: int) -> date:
+    """
+    Searches the n-th occurrence of a given day of week in the given range of
+    dates, without generating the other ones.
+
+    Args:
+        start_date (date): First date of the range.
+        end_date (date): Last date of the range.
+        weekday (int): Number of the day of the week (0-indexed).
+        idx (int): Number of the occurrence to retrieve (0-indexed), -1 for
+        the last one.
+
+    Returns:
+        date: Found day.
+    """
+    assert 0 <= weekday <= 6, "Weekday must be between 0 and 6."
+    first_day = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+    last_day = end_date - timedelta(days=(end_date.weekday() - weekday) % 7)
+    n_days = (last_day - first_day).days // 7 + 1
+    assert -1 <= idx < n_days and n_days > 0, \
+        "Index must be between -1 and the total number of the specific weekday in the range."
+    if idx == -1:
+        return last_day
+    return first_day + timedelta(days=7 * idx)
+
+
+def nth_weekdays_of_ranges(start_dates: List[date], end_dates: List[date], weekday: int, idx: int) -> List[date]:
+    """
+    Batched version of nth_weekday_of_range: searches the n-th occurrence of
+    a given day of week in each of the given ranges of dates at once.
+
+    Args:
+        start_dates (List[date]): First date of each range.
+        end_dates (List[date]): Last date of each range.
+        weekday (int): Number of the day of the week (0-indexed).
+        idx (int): Number of the occurrence to retrieve (0-indexed), -1 for
+        the last one.
+
+    Returns:
+        List[date]: Found day of each range.
+    """
+    import numpy as np
+
+    assert 0 <= weekday <= 6, "Weekday must be between 0 and 6."
+    starts = np.array(start_dates, dtype='datetime64[D]').astype(np.int64)
+    ends = np.array(end_dates, dtype='datetime64[D]').astype(np.int64)
+
+    # 1970-01-01 was a Thursday
+    first_days = starts + (weekday - (starts + 3)) % 7
+    last_days = ends - ((ends + 3) - weekday) % 7
+    n_days = (last_days - first_days) // 7 + 1
+    assert -1 <= idx and bool(np.all(n_days > max(idx, 0))), \
+        "Index must be between -1 and the total number of the specific weekday in the range."
+
+    days = last_days if idx == -1 else first_days + 7 * idx
+    return days.astype('datetime64[D]').tolist()
+
+
+def calendar_fields(dates: List[date]) -> dict:
+    """
+    Splits the given dates in arrays of years, months and days of the month.
+
+    Args:
+        dates (List[date]): Input dates, or datetime64 array.
+
+    Returns:
+        dict: Arrays of 'year', 'month' and 'day' of each date.
+    """
+    import numpy as np
+
+    if isinstance(dates, np.ndarray):
+        days = dates.astype('datetime64[D]')
+    else:
+        # converting ordinals is much faster than parsing date objects
+        ordinals = np.fromiter(map(date.toordinal, dates), dtype=np.int64, count=len(dates))
+        days = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    return {
+        'year': months.astype('datetime64[Y]').astype(np.int64) + 1970,
+        'month': months.astype(np.int64) % 12 + 1,
+        'day': (days - months).astype(np.int64) + 1,
+    }
+
+
+def shift_months(day: date, months: int) -> date:
+    """
+    Adds a number of months to the given day, moving a day missing in the
+    target month to its last day (like relativedelta, but faster).
+
+    Args:
+        day (date): Input date.
+        months (int): Number of months to add (negative to subtract).
+
+    Returns:
+        date: The moved day.
+    """
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def add_months(days, months: int):
+    """
+    Batched version of shift_months: adds a number of months to each of the
+    given days at once.
+
+    Args:
+        days (np.ndarray): Input datetime64 array.
+        months (int): Number of months to add (negative to subtract).
+
+    Returns:
+        np.ndarray: datetime64[D] array of the moved days.
+    """
+    import numpy as np
+
+    days = days.astype('datetime64[D]')
+    day_of_month = days - days.astype('datetime64[M]').astype('datetime64[D]')
+    targets = days.astype('datetime64[M]') + months
+    month_lengths = (targets + 1).astype('datetime64[D]') - targets.astype('datetime64[D]')
+    return targets.astype('datetime64[D]') + np.minimum(day_of_month, month_lengths - 1)
+
+
 def calendar_by_steps(start_date: date, end_date: date, step: relativedelta) -> list:
     """
     Evaluates steps between start_date and end_date.
@@ -43,7 +43,7 @@ def find_gte(_list: list, value):
     raise ValueError
 
 
-def find_delimiters(_list: list, first_element, second_element) -> tuple:
+def find_delimiters(_list: list, first_element, second_element, lo: int = 0, hi: int = None) -> tuple:
     """
     Given a list of elements, searches:
         * the index of the first element included in the given range
@@ -53,10 +53,98 @@ def find_delimiters(_list: list, first_element, second_element) -> tuple:
         _list (list): Input data.
         first_element: Low limit of the range to search.
         second_element: High limit of the range to search.
+        lo (int, optional): First index of the list to search in.
+        Defaults to 0.
+        hi (int, optional): Index after the last one of the list to search
+        in. Defaults to None (the length of the list).
 
     Returns:
         tuple: First and last indexes of the searched range.
     """
-    idx_min = bisect_left(_list, first_element)
-    idx_max = bisect_right(_list[idx_min:], second_element) + idx_min - 1
+    if hi is None:
+        hi = len(_list)
+    idx_min = bisect_left(_list, first_element, lo, hi)
+    idx_max = bisect_right(_list, second_element, idx_min, hi) - 1
     return idx_min, idx_max
+
+
+def indexes_of(_list: list, values: list, lo: int = 0, hi: int = None) -> list:
+    """
+    Find the indexes of many sorted values in given sorted list, None for the
+    values not found. Each search starts from the result of the previous
+    one, so the list is scanned forward only.
+
+    Args:
+        _list (list): Input data.
+        values (list): Sorted values to search.
+        lo (int, optional): First index of the list to search in.
+        Defaults to 0.
+        hi (int, optional): Index after the last one of the list to search
+        in. Defaults to None (the length of the list).
+
+    Returns:
+        list: Index of each value, or None.
+    """
+    if hi is None:
+        hi = len(_list)
+    res = []
+    for value in values:
+        lo = bisect_left(_list, value, lo, hi)
+        res.append(lo if lo < hi and _list[lo] == value else None)
+    return res
+
+
+def indexes_lte(_list: list, values: list, lo: int = 0, hi: int = None) -> list:
+    """
+    Batched version of find_lte: find the index of the rightmost element less
+    than or equal to each of many sorted values in given sorted list, None if
+    there is none. The list is scanned forward only (see indexes_of).
+
+    Args:
+        _list (list): Input data.
+        values (list): Sorted values to search.
+        lo (int, optional): First index of the list to search in.
+        Defaults to 0.
+        hi (int, optional): Index after the last one of the list to search
+        in. Defaults to None (the length of the list).
+
+    Returns:
+        list: Index of each value, or None.
+    """
+    if hi is None:
+        hi = len(_list)
+    first, res = lo, []
+    for value in values:
+        lo = bisect_right(_list, value, lo, hi)
+        res.append(lo - 1 if lo > first else None)
+    return res
+
+
+def indexes_gte(_list: list, values: list, lo: int = 0, hi: int = None) -> list:
+    """
+    Batched version of find_gte: find the index of the leftmost element
+    greater than or equal to each of many sorted values in given sorted list,
+    None if there is none. See indexes_lte for the arguments.
+    """
+    if hi is None:
+        hi = len(_list)
+    res = []
+    for value in values:
+        lo = bisect_left(_list, value, lo, hi)
+        res.append(lo if lo < hi else None)
+    return res
+
+
+def indexes_nearest(_list: list, values: list, lo: int = 0, hi: int = None) -> list:
+    """
+    Find the index of the nearest element to each of many sorted values in
+    given sorted list, the lower one when two elements are equally near.
+    None if the list is empty. See indexes_lte for the arguments.
+    """
+    res = []
+    for value, before, after in zip(values, indexes_lte(_list, values, lo, hi), indexes_gte(_list, values, lo, hi)):
+        if before is None or after is None:
+            res.append(after if before is None else before)
+        else:
+            res.append(before if value - _list[before] <= _list[after] - value else after)
+    return res
@@ -127,6 +127,43 @@ def test_weekdays_of_range():
     assert expected_days == days, "Unexpected days returned."
 
 
+def test_nth_weekday_of_range():
+    day_sx = datetime.strptime("2020-01-01", "%Y-%m-%d").date()
+
+    for length in [0, 3, 6, 7, 20, 31]:
+        day_dx = day_sx + relativedelta(days=length)
+        for weekday in range(7):
+            n_days, days = weekdays_of_range(day_sx, day_dx, weekday)
+            for idx in range(-1 if n_days else 0, n_days):
+                day = nth_weekday_of_range(day_sx, day_dx, weekday, idx)
+                assert day == days[idx], "Unexpected day returned."
+
+            try:
+                _ = nth_weekday_of_range(day_sx, day_dx, weekday, n_days)
+                raise ValueError("Uncaught exception.")
+            except AssertionError:
+                pass
+
+
+def test_nth_weekdays_of_ranges():
+    days_sx = [datetime.strptime(f"2020-{month:02}-01", "%Y-%m-%d").date() for month in range(1, 13)]
+    days_dx = [last_day_of_month(day) for day in days_sx]
+
+    for weekday in range(7):
+        for idx in [-1, 0, 3]:
+            days = nth_weekdays_of_ranges(days_sx, days_dx, weekday, idx)
+            expected_days = [nth_weekday_of_range(sx, dx, weekday, idx) for sx, dx in zip(days_sx, days_dx)]
+            assert days == expected_days, "Unexpected days returned."
+
+    try:
+        _ = nth_weekdays_of_ranges(days_sx, days_dx, 0, 4)
+        raise ValueError("Uncaught exception.")
+    except AssertionError:
+        pass
+
+    assert nth_weekdays_of_ranges([], [], 0, 0) == [], "No days expected."
+
+
 def test_calendar_by_steps():
     day_sx = datetime.strptime("2020-01-01", "%Y-%m-%d").date()
     day_dx = datetime.strptime("2020-01-10", "%Y-%m-%d").date()
@@ -146,3 +183,14 @@ def test_calendar_by_steps():
         raise AssertionError("Inverted days exception not caught.")
     except AssertionError:
         pass
+
+
+def test_shift_months():
+    import numpy as np
+
+    days = [datetime.strptime("2020-01-01", "%Y-%m-%d").date() + timedelta(days=i) for i in range(0, 1500, 3)]
+    for months in [-25, -12, -1, 1, 7, 12]:
+        expected_days = [day + relativedelta(months=months) for day in days]
+        assert [shift_months(day, months) for day in days] == expected_days, "Unexpected shifted days."
+        assert add_months(np.array(days, dtype='datetime64[D]'), months).tolist() == expected_days, \
+            "Unexpected batched shifted days."
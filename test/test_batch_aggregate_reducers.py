@@ -0,0 +1,132 @@
+import statistics
+from datetime import date
+
+import numpy as np
+
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.batches import aggregate
+from outatime.timeseries.columnar import ColumnarTimeSeries, reduce_segments
+from outatime.timeseries.time_series import TimeSeries
+from test.utils import data_generation
+
+python_reducers = {
+    'sum': sum,
+    'mean': statistics.fmean,
+    'min': min,
+    'max': max,
+    'count': len,
+    'first': lambda values: values[0],
+    'last': lambda values: values[-1],
+    'std': statistics.pstdev,
+}
+
+
+def by_key(reducer):
+    def _f(batch):
+        res = {}
+        for key in ['pippo', 'pluto']:
+            values = [data[key] for data in batch if key in data]
+            if values or reducer is len:
+                res[key] = reducer(values)
+        return res
+    return _f
+
+
+def test_reduce_segments():
+    column = np.array([1, 2, 3, 4, 5, 6])
+    mask = np.array([True, True, False, True, True, True])
+
+    res, valid = reduce_segments(column, [0, 2, 3, 6], [2, 3, 6, 6], 'sum')
+    assert res.tolist() == [3, 3, 15, 0] and valid.tolist() == [True, True, True, False], "Unexpected sums."
+
+    res, valid = reduce_segments(column, [0, 2, 3], [2, 3, 6], 'sum', mask=mask)
+    assert res[valid].tolist() == [3, 15] and valid.tolist() == [True, False, True], "Unexpected masked sums."
+
+    res, valid = reduce_segments(column, [0, 2, 3], [2, 3, 6], 'count', mask=mask)
+    assert res.tolist() == [2, 0, 3] and valid.all(), "Unexpected counts."
+
+    res, _ = reduce_segments(column, [1, 4], [4, 6], 'first', mask=mask)
+    assert res.tolist() == [2, 5], "Unexpected first values."
+
+    res, _ = reduce_segments(column, [0, 3], [3, 6], 'last', mask=mask)
+    assert res.tolist() == [2, 6], "Unexpected last values."
+
+
+def test_aggregate_named_reducers():
+    tsl = data_generation()
+    for name, reducer in python_reducers.items():
+        res = aggregate(tsl, granularity=MonthlyGranularity(), method=name)
+        expected_res = aggregate(tsl, granularity=MonthlyGranularity(), method=by_key(reducer))
+
+        assert isinstance(res, TimeSeries), "Unexpected result type."
+        assert res.dates == expected_res.dates, f"Unexpected dates for '{name}' reducer."
+        for res_day, expected_day in zip(res, expected_res):
+            assert res_day.data.keys() == expected_day.data.keys(), f"Unexpected keys for '{name}' reducer."
+            for key in res_day.data:
+                assert np.isclose(res_day.data[key], expected_day.data[key]), f"Unexpected result for '{name}' reducer."
+
+
+def test_aggregate_named_reducers_scalar_data():
+    tsl = TimeSeries([TimeSeriesData(day=date(2022, 1, i), data=float(i)) for i in range(1, 32)])
+    res = aggregate(tsl, granularity=WeeklyGranularity(), method='mean')
+    assert res.data_granularity.__class__ is WeeklyGranularity, "Unexpected granularity."
+    assert [element.data for element in res] == [1.5, 6.0, 13.0, 20.0, 27.0, 31.0], "Unexpected weekly means."
+
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    res = aggregate(cts, granularity=WeeklyGranularity(), method='max')
+    assert res.values.tolist() == [2.0, 9.0, 16.0, 23.0, 30.0, 31.0], "Unexpected weekly maximums."
+
+
+def test_aggregate_bad_reducer():
+    tsl = data_generation()
+    try:
+        _ = aggregate(tsl, granularity=MonthlyGranularity(), method='median_of_medians')
+        raise AssertionError("Exception not caught.")
+    except ValueError:
+        pass
+
+
+def test_aggregate_named_reducers_none_data():
+    days = [date(2022, 1, i) for i in range(1, 32)]
+    tsl = TimeSeries([TimeSeriesData(day=day, data=None if day.day % 3 == 0 else day.day) for day in days])
+    for name in ['sum', 'mean', 'max']:
+        res = aggregate(tsl, granularity=WeeklyGranularity(), method=name)
+        expected_res = aggregate(
+            tsl, granularity=WeeklyGranularity(),
+            method=lambda batch: python_reducers[name]([x for x in batch if x is not None])
+        )
+        assert [element.data for element in res] == [element.data for element in expected_res], \
+            f"None values must be skipped by '{name}' reducer."
+
+    # resampled days without data get None
+    gapped_tsl = TimeSeries([element for element in tsl.cut(date(2022, 1, 10), date(2022, 1, 20)) if element.data is not None])
+    resampled_tsl = gapped_tsl.resample(method=lambda batch: batch[0] if batch else None)
+    res = aggregate(resampled_tsl, granularity=WeeklyGranularity(), method='sum')
+    assert [element.data for element in res] == [10 + 11 + 13 + 14 + 16, 17 + 19 + 20], "Unexpected sums of resampled data."
+
+    dict_tsl = TimeSeries([TimeSeriesData(day=day, data=None if day.day % 3 == 0 else {'pippo': day.day}) for day in days])
+    res = aggregate(dict_tsl, granularity=WeeklyGranularity(), method='max')
+    expected_data = [{'pippo': 2}, {'pippo': 8}, {'pippo': 16}, {'pippo': 23}, {'pippo': 29}, {'pippo': 31}]
+    assert [element.data for element in res] == expected_data, "None payloads must be skipped by dict reducers."
+
+
+def test_aggregate_first_last_keep_values():
+    tsl = TimeSeries([TimeSeriesData(day=date(2022, 1, i), data=i if i % 2 else i / 2) for i in range(1, 32)])
+    for name in ['first', 'last']:
+        res = aggregate(tsl, granularity=WeeklyGranularity(), method=name)
+        expected_res = aggregate(tsl, granularity=WeeklyGranularity(), method=python_reducers[name])
+        assert [(element.data, type(element.data)) for element in res] == \
+            [(element.data, type(element.data)) for element in expected_res], f"Unexpected values of '{name}' reducer."
+
+
+def test_aggregate_named_reducers_large_integers():
+    tsl = TimeSeries([TimeSeriesData(day=date(2022, 1, i), data={'a': 2 ** 62, 'b': -2 ** 62}) for i in range(1, 4)])
+    res = aggregate(tsl, granularity=MonthlyGranularity(), method='sum')
+    assert res[0].data == {'a': 3 * 2 ** 62, 'b': -3 * 2 ** 62}, "Integer sums must not overflow."
+
+    res = aggregate(tsl, granularity=MonthlyGranularity(), method='mean')
+    assert res[0].data == {'a': 2.0 ** 62, 'b': -2.0 ** 62}, "Integer means must not overflow."
+
+    res, _ = reduce_segments(np.array([2 ** 62, 2 ** 62, 1]), [0, 2], [2, 3], 'sum')
+    assert res.tolist() == [2 ** 63, 1], "Integer sums must not overflow."
@@ -3,6 +3,7 @@ from datetime import datetime
 from outatime.dataclass.time_series_data import TimeSeriesData
 from outatime.granularity.granularity import MonthlyGranularity, DailyGranularity
 from outatime.timeseries.batches import pick_a_day
+from outatime.timeseries.columnar import ColumnarTimeSeries
 from outatime.timeseries.time_series import TimeSeries
 from outatime.util.relativedelta import relativedelta
 from test.utils import data_generation
@@ -58,3 +59,23 @@ def test_pick_a_day_default_value():
     res = pick_a_day(tsl, day_of_batch=0, granularity=MonthlyGranularity(), default={'missing': 0})
 
     assert res[2].data == {'missing': 0}, "Unexpected default value for missing day."
+
+
+def test_pick_a_day_copy():
+    tsl = data_generation()
+
+    res = pick_a_day(tsl, granularity=MonthlyGranularity())
+    assert res[0] is tsl.get(res[0].day), "Picked elements must be shared."
+
+    res = pick_a_day(tsl, granularity=MonthlyGranularity(), copy=True)
+    assert res[0] == tsl.get(res[0].day) and res[0] is not tsl.get(res[0].day), "Picked elements must be copied."
+
+
+def test_pick_a_day_columnar():
+    tsl = data_generation(empty_data_step=100000)
+    tsl.delete(datetime.strptime("2020-02-29", "%Y-%m-%d").date())
+
+    expected = pick_a_day(tsl, granularity=MonthlyGranularity(), default={})
+    res = pick_a_day(ColumnarTimeSeries.from_time_series(tsl), granularity=MonthlyGranularity(), default={})
+    assert list(res) == list(expected), "Columnar time series must pick the same days."
+    assert res[1].data == {}, "Unexpected default value for missing day."
@@ -86,3 +86,13 @@ def test_pick_a_weekday_default_value():
     res = pick_a_weekday(tsl, day_of_batch=0, granularity=MonthlyGranularity(), default={'missing': 0})
 
     assert res[0].data == {'missing': 0}, "Unexpected default value for missing day."
+
+
+def test_pick_a_weekday_copy():
+    tsl = data_generation()
+
+    res = pick_a_weekday(tsl, granularity=MonthlyGranularity(), weekday=3, day_of_batch=0)
+    assert all(element is tsl.get(element.day) for element in res), "Picked elements must be shared."
+
+    res = pick_a_weekday(tsl, granularity=MonthlyGranularity(), weekday=3, day_of_batch=0, copy=True)
+    assert all(element is not tsl.get(element.day) for element in res), "Picked elements must be copied."
@@ -52,3 +52,10 @@ def test_split_lower_granularity():
         raise AssertionError("Exception not caught.")
     except AssertionError:
         pass
+
+
+def test_split_copies_elements():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-03-31')
+    res = split(tsl, granularity=MonthlyGranularity())
+    res[0][0].data['pippo'] = -1
+    assert tsl[0].data['pippo'] != -1, "Original time series changed."
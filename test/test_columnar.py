@@ -0,0 +1,191 @@
+from datetime import date
+
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import DailyGranularity, MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.batches import aggregate
+from outatime.timeseries.columnar import ColumnarTimeSeries
+from outatime.timeseries.time_series import TimeSeries
+from outatime.util.relativedelta import relativedelta
+from test.utils import data_generation, compare
+
+
+def test_columnar_conversion():
+    tsl = data_generation(empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    assert cts.columns is not None and cts.values is None, "Dict data not stored by columns."
+    assert cts.columns['pippo'].dtype.kind == 'i', "Unexpected column type."
+    assert cts.days.dtype == 'datetime64[D]', "Unexpected days type."
+    assert len(cts) == len(tsl), "Unexpected length."
+    assert compare(tsl, cts) and compare(tsl, cts.to_time_series()), "Unexpected converted elements."
+    assert cts.dates == tsl.dates, "Unexpected dates."
+    assert cts[3] == tsl[3] and cts[-1] == tsl[-1], "Unexpected indexed elements."
+    assert isinstance(cts.data_granularity, DailyGranularity), "Expected DailyGranularity."
+
+
+def test_columnar_fallback():
+    tsl = TimeSeries([TimeSeriesData(day=date(2020, 1, i), data=[i]) for i in range(1, 10)])
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    assert cts.values is not None and cts.values.dtype == object, "Expected object values."
+    assert compare(tsl, cts), "Unexpected converted elements."
+
+    tsl = TimeSeries([TimeSeriesData(day=date(2020, 1, i), data=i / 2) for i in range(1, 10)])
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    assert cts.values.dtype.kind == 'f', "Expected float values."
+    assert cts[1].data == 1.0 and type(cts[1].data) is float, "Unexpected element data."
+
+
+def test_columnar_get_and_cut():
+    tsl = data_generation(empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    assert cts.get(date(2021, 3, 3)) == tsl.get(date(2021, 3, 3)), "Unexpected get result."
+    assert cts.get(date(2030, 1, 1), value=0).data == 0, "Unexpected default value."
+
+    res = cts.cut(date(2020, 1, 11), date(2021, 1, 11))
+    assert res.start_date == date(2020, 1, 11) and res.end_date == date(2021, 1, 11), "Unexpected cut range."
+    assert res.days.base is not None, "Cut arrays are not views."
+
+    cts.cut(date(2020, 1, 11), date(2021, 1, 11), inplace=True)
+    assert compare(res, cts) and len(cts) == len(res), "Unexpected inplace cut result."
+
+
+def test_columnar_query():
+    tsl = data_generation(empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    res = cts.query("month == 2 and day < 3")
+    assert compare(tsl.query("month == 2 and day < 3"), res), "Unexpected query result."
+    assert all(day.month == 2 and day.day < 3 for day in res.dates), "Unexpected query dates."
+
+
+def test_columnar_mutations():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-12-01', step=relativedelta(months=1), empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    assert isinstance(cts.data_granularity, MonthlyGranularity), "Expected MonthlyGranularity."
+
+    cts.append(TimeSeriesData(day=date(2020, 3, 15), data={'pippo': 1, 'pluto': 2}))
+    assert cts.get(date(2020, 3, 15)).data == {'pippo': 1, 'pluto': 2}, "Element not appended."
+    assert cts.dates == sorted(cts.dates), "Time series is not sorted after append."
+    assert not isinstance(cts.data_granularity, MonthlyGranularity), "Granularity not updated."
+
+    cts.update([TimeSeriesData(day=date(2020, 3, 15), data={'pippo': 3, 'pluto': 4})], conflict='keep_old')
+    assert cts.get(date(2020, 3, 15)).data == {'pippo': 1, 'pluto': 2}, "Unexpected 'keep_old' update result."
+
+    cts.update([TimeSeriesData(day=date(2020, 3, 15), data={'pippo': 3, 'pluto': 4})])
+    assert cts.get(date(2020, 3, 15)).data == {'pippo': 3, 'pluto': 4}, "Unexpected 'keep_new' update result."
+    assert len(cts) == 13, "Unexpected length after update."
+
+    cts.delete(date(2020, 3, 15))
+    assert len(cts) == 12 and cts.get(date(2020, 3, 15)).data is None, "Element not deleted."
+
+
+def test_columnar_update_splice():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-03-31', step=relativedelta(days=2), empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    cut = cts.cut(tsl.start_date, tsl.end_date)
+
+    new = [
+        TimeSeriesData(day=date(2020, 1, 2), data={'pippo': 1.5}),
+        TimeSeriesData(day=date(2020, 1, 3), data={'pippo': 7, 'topolino': 'x'}),
+        TimeSeriesData(day=date(2020, 1, 3), data={'pippo': 8, 'pluto': 9}),
+        TimeSeriesData(day=date(2020, 5, 1), data={'pluto': 1}),
+        TimeSeriesData(day=date(2019, 12, 31), data={}),
+    ]
+    for conflict in ['keep_new', 'keep_old']:
+        expected_res = tsl.copy()
+        expected_res.update(new, conflict=conflict)
+        res = cts.copy()
+        res.update(new, conflict=conflict)
+        assert list(res) == list(expected_res), f"Unexpected '{conflict}' update result."
+        assert res.columns['pippo'].dtype.kind == 'f', "Numeric columns must stay typed."
+
+    cts.update(new)
+    assert compare(tsl, cut) and len(cut) == len(tsl), "Arrays shared with other time series must not change."
+
+
+def test_columnar_time_series_methods():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-03-31', empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    assert all(
+        (cts.calendar_fields[field] == tsl.calendar_fields[field]).all() for field in ['year', 'month', 'day']
+    ), "Unexpected calendar fields."
+
+    def pippo(data):
+        return data['pippo']
+
+    for method in ['diff', 'pct_change']:
+        res = getattr(cts, method)(key=pippo)
+        assert list(res) == list(getattr(tsl, method)(key=pippo)), f"Unexpected '{method}' result with a key."
+
+    new = [TimeSeriesData(day=date(2020, 1, 2), data={'pippo': 1, 'pluto': 2})]
+    res = cts.copy()
+    res.update(new, conflict=lambda old, new: {'pippo': old['pippo'] + new['pippo']})
+    expected_res = tsl.copy()
+    expected_res.update(new, conflict=lambda old, new: {'pippo': old['pippo'] + new['pippo']})
+    assert list(res) == list(expected_res), "Unexpected update result with a conflict method."
+
+    res = cts + ColumnarTimeSeries.from_elements(new)
+    assert isinstance(res, ColumnarTimeSeries) and res.get(date(2020, 1, 2)) == new[0], "Unexpected sum of time series."
+    assert len(res) == len(cts) and cts.get(date(2020, 1, 2)) == tsl[1], "Original time series changed."
+
+
+def test_columnar_round_trip_none_and_bool():
+    days = data_generation(start_date='2020-01-01', end_date='2020-01-05').dates
+    payloads = [{'a': None, 'b': 1}, None, {'b': True}, {'a': 2, 'b': 3}, {}]
+    tsl = TimeSeries([TimeSeriesData(day=day, data=payload) for day, payload in zip(days, payloads)])
+
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    assert list(cts) == list(tsl), "Explicit None values and None data must be kept."
+    assert [cts[idx] for idx in range(len(cts))] == list(tsl), "Explicit None values and None data must be kept."
+    assert [type(element.data['b']) for element in cts if element.data and 'b' in element.data] == [int, bool, int], \
+        "Booleans mixed with numbers must be kept."
+    assert list(cts.shift(1)) == list(tsl.shift(1)), "Shifted None data must be kept."
+
+
+def test_columnar_missing_keys():
+    tsl = data_generation()
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    assert set(cts.columns) == {'pippo', 'pluto'}, "Unexpected columns."
+    assert cts.columns['pippo'].dtype.kind == 'i', "Unexpected column type."
+    assert cts.masks['pippo'].tolist() == [bool(element.data) for element in tsl], "Unexpected validity mask."
+    assert compare(tsl, cts) and compare(tsl, cts.to_time_series()), "Unexpected converted elements."
+    assert cts[1].data == {} and cts[0].data == tsl[0].data, "Unexpected indexed elements."
+
+    tsl = TimeSeries([
+        TimeSeriesData(day=date(2020, 1, 1), data={'a': 1}),
+        TimeSeriesData(day=date(2020, 1, 2), data={'b': 'x'}),
+    ])
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    assert cts.columns['b'].dtype == object and cts.masks['b'].tolist() == [False, True], "Unexpected object column."
+    assert compare(tsl, cts), "Unexpected converted elements."
+
+
+def test_columnar_aggregate():
+    tsl = data_generation()
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    res = aggregate(cts, granularity=MonthlyGranularity(), method=sum)
+    expected_res = aggregate(
+        tsl,
+        granularity=MonthlyGranularity(),
+        method=lambda batch: {key: sum(data[key] for data in batch if data) for key in ['pippo', 'pluto']}
+    )
+    assert isinstance(res, ColumnarTimeSeries), "Unexpected aggregate result type."
+    assert compare(expected_res, res) and len(res) == len(expected_res), "Unexpected aggregate result."
+
+
+def test_columnar_resample():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-04-01', step=relativedelta(months=1), empty_data_step=100000)
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+
+    res = cts.resample(granularity=WeeklyGranularity(), method=max)
+    expected_res = tsl.resample(granularity=WeeklyGranularity(), method=lambda batch: batch[0] if batch else {})
+    assert res.dates == expected_res.dates, "Unexpected resample dates."
+    assert compare(expected_res, res), "Unexpected resample data."
+    assert isinstance(res.data_granularity, WeeklyGranularity), "Expected WeeklyGranularity."
+
+    res = cts.resample(granularity=WeeklyGranularity())
+    assert all(element.data is None for element in res), "Unexpected resample data without method."
@@ -1,4 +1,7 @@
-from outatime.timeseries.expr import union, intersection
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.expr import union, intersection, union_all, intersection_all
+from outatime.util.relativedelta import relativedelta
 
 from test.utils import data_generation, compare
 
@@ -30,3 +33,80 @@ def test_intersection():
     expected_res = [ts_dx[0], ts_sx[6], ts_dx[2], ts_sx[8], ts_dx[4]]
     assert len(res) == 5, "Unexpected length of intersection result."
     assert compare(expected_res, res), "Unexpected intersection result."
+
+
+def reference_merge(tsl_a, tsl_b, conflict_method, dates):
+    return [TimeSeriesData(day=day, data=conflict_method(tsl_a.get(day).data, tsl_b.get(day).data)) for day in sorted(dates)]
+
+
+def test_union_merge():
+    ts_sx = data_generation(step=relativedelta(days=2))[:300]
+    ts_dx = data_generation(step=relativedelta(days=3))[50:250]
+
+    res = union(ts_sx, ts_dx, conflict_method=take_first_available)
+    expected_res = reference_merge(ts_sx, ts_dx, take_first_available, set(ts_sx.dates) | set(ts_dx.dates))
+    assert list(res) == expected_res, "Unexpected union result."
+
+    calls = []
+
+    def count_conflicts(a, b):
+        calls.append((a, b))
+        return a
+
+    res = union(ts_sx, ts_dx, conflict_method=count_conflicts, only_conflicts=True)
+    shared_dates = set(ts_sx.dates) & set(ts_dx.dates)
+    assert len(calls) == len(shared_dates), "Method must be applied only to shared days."
+    assert list(res) == expected_res, "Unexpected union result."
+    assert res.get(ts_dx[1].day) is ts_dx[1], "Elements of a single series must be shared."
+
+
+def test_intersection_merge():
+    ts_sx = data_generation(step=relativedelta(days=2))[:300]
+    ts_dx = data_generation(step=relativedelta(days=3))[50:250]
+
+    res = intersection(ts_sx, ts_dx, conflict_method=take_first_available)
+    expected_res = reference_merge(ts_sx, ts_dx, take_first_available, set(ts_sx.dates) & set(ts_dx.dates))
+    assert list(res) == expected_res, "Unexpected intersection result."
+
+    ts_weekly = data_generation(step=relativedelta(days=7))
+    ts_monthly = data_generation(start_date='2020-01-14', step=relativedelta(months=1))
+    assert isinstance(ts_weekly.data_granularity, WeeklyGranularity), "Unexpected granularity."
+    assert isinstance(ts_monthly.data_granularity, MonthlyGranularity), "Unexpected granularity."
+
+    res = intersection(ts_weekly, ts_monthly, conflict_method=take_first_available)
+    assert 'data_granularity' in res.__dict__, "Known granularity must be kept."
+    assert isinstance(res.data_granularity, MonthlyGranularity), "Coarser granularity expected."
+    assert not union(ts_weekly, ts_monthly, conflict_method=take_first_available).__dict__.get('data_granularity'), \
+        "Union granularity must be inferred."
+
+
+def test_union_all():
+    tsl_list = [data_generation(step=relativedelta(days=step))[:100] for step in [2, 3, 5]]
+
+    res = union_all(tsl_list, conflict_method=list)
+    all_dates = sorted(set().union(*[tsl.dates for tsl in tsl_list]))
+    assert res.dates == all_dates, "Unexpected union dates."
+    for element in res:
+        expected_data = [tsl.get(element.day).data for tsl in tsl_list if element.day in tsl.dates]
+        assert element.data == expected_data, "Unexpected union data."
+
+    res = union_all(tsl_list, conflict_method=list, only_conflicts=True)
+    single = [tsl.get(day) for day in all_dates for tsl in tsl_list if day in tsl.dates and
+              sum(day in other.dates for other in tsl_list) == 1]
+    assert all(res.get(element.day) is element for element in single), "Elements of a single series must be shared."
+
+    res = union_all(tsl_list[:2], conflict_method=lambda values: values[0])
+    assert list(res) == list(union(tsl_list[0], tsl_list[1], conflict_method=take_first_available)), \
+        "Unexpected union result."
+
+
+def test_intersection_all():
+    tsl_list = [data_generation(step=relativedelta(days=step))[:300] for step in [2, 3, 5]]
+
+    res = intersection_all(tsl_list, conflict_method=list)
+    shared_dates = sorted(set(tsl_list[0].dates).intersection(*[tsl.dates for tsl in tsl_list[1:]]))
+    assert res.dates == shared_dates, "Unexpected intersection dates."
+    assert all(element.data == [tsl.get(element.day).data for tsl in tsl_list] for element in res), \
+        "Unexpected intersection data."
+
+    assert len(intersection_all([], conflict_method=list)) == 0, "Empty intersection expected."
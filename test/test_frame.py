@@ -0,0 +1,83 @@
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.batches import aggregate, pick_a_day
+from outatime.timeseries.frame import TimeSeriesFrame
+from outatime.timeseries.time_series import TimeSeries
+from outatime.util.relativedelta import relativedelta
+from test.utils import data_generation
+
+
+def numeric(tsl):
+    return TimeSeries([TimeSeriesData(day=element.day, data=element.data['pippo']) for element in tsl])
+
+
+def frame_generation():
+    series = {
+        'a': numeric(data_generation(start_date='2022-01-01', end_date='2022-06-30', empty_data_step=100000)),
+        'b': numeric(data_generation(start_date='2022-02-01', end_date='2022-08-30', step=relativedelta(days=2),
+                                     empty_data_step=100000)),
+        'c': data_generation(start_date='2021-12-01', end_date='2022-07-31', step=relativedelta(days=3),
+                             empty_data_step=100000),
+    }
+    return TimeSeriesFrame.from_series(series), series
+
+
+def test_frame_from_series():
+    frame, series = frame_generation()
+
+    assert frame.names == list(series), "Unexpected names."
+    assert frame.dates == sorted(set().union(*[tsl.dates for tsl in series.values()])), "Unexpected frame dates."
+    for name, tsl in series.items():
+        assert list(frame.series(name)) == list(tsl), f"Unexpected series '{name}'."
+    for element in frame[::17]:
+        expected_data = {name: tsl.get(element.day).data for name, tsl in series.items() if element.day in tsl.dates}
+        assert element.data == expected_data, "Unexpected row data."
+
+
+def test_frame_aggregate():
+    frame, series = frame_generation()
+
+    res = frame.aggregate(lambda values: len(values), MonthlyGranularity())
+    assert isinstance(res, TimeSeriesFrame), "Expected a frame."
+    for name, tsl in series.items():
+        expected_res = aggregate(tsl, lambda values: len(values), MonthlyGranularity())
+        assert list(res.series(name).cut(tsl.start_date, tsl.end_date)) == list(expected_res), \
+            f"Unexpected aggregation of series '{name}'."
+
+    del series['c']
+    frame = TimeSeriesFrame.from_series(series)
+    for method in ["sum", "mean", "first"]:
+        res = frame.aggregate(method, MonthlyGranularity())
+        for name, tsl in series.items():
+            assert list(res.series(name)) == list(aggregate(tsl, method, MonthlyGranularity())), \
+                f"Unexpected '{method}' aggregation of series '{name}'."
+
+
+def test_frame_pick_a_day():
+    frame, series = frame_generation()
+
+    res = frame.pick_a_day(MonthlyGranularity(), day_of_batch=0)
+    for name, tsl in series.items():
+        expected_res = pick_a_day(tsl, MonthlyGranularity(), day_of_batch=0)
+        assert list(res.series(name)) == [element for element in expected_res if element.data is not None], \
+            f"Unexpected days of series '{name}'."
+
+    res = frame.pick_a_day(WeeklyGranularity(), day_of_batch=2, default=0)
+    assert all(len(element.data) == len(series) for element in res), "Default value must be set for missing days."
+    assert res.series('b')[0].data == 0, "Unexpected default value."
+
+
+def test_frame_methods():
+    frame, series = frame_generation()
+
+    res = frame.query("month == 3 and day > 10")
+    assert isinstance(res, TimeSeriesFrame), "Expected a frame."
+    for name, tsl in series.items():
+        assert list(res.series(name)) == list(tsl.query("month == 3 and day > 10")), \
+            f"Unexpected query of series '{name}'."
+
+    res = frame.resample(MonthlyGranularity(), method=len)
+    assert isinstance(res, TimeSeriesFrame) and res.names == frame.names, "Expected a frame."
+    for name, tsl in series.items():
+        assert list(res.series(name)) == list(tsl.resample(MonthlyGranularity(), method=len)), \
+            f"Unexpected resampling of series '{name}'."
@@ -1,4 +1,5 @@
 from datetime import date
+from outatime.util.relativedelta import relativedelta
 
 from outatime.granularity.granularity import DailyGranularity, WeeklyGranularity, MonthlyGranularity, QuarterlyGranularity, YearlyGranularity
 
@@ -139,3 +140,28 @@ def test_daily_granularity():
         raise AssertionError("Uncaught exception.")
     except AttributeError:
         pass
+
+
+def test_period_key():
+    test_date = date(2022, 6, 28)
+    for g in [DailyGranularity(), WeeklyGranularity(), MonthlyGranularity(), QuarterlyGranularity(), YearlyGranularity()]:
+        first_day = g.get_beginning_of_granularity(test_date)
+        last_day = g.get_end_of_granularity(test_date)
+        key = g.period_key(test_date)
+
+        assert g.period_key(first_day) == key, "Bad period key for first day of granularity."
+        assert g.period_key(last_day) == key, "Bad period key for last day of granularity."
+        assert g.period_key(first_day - relativedelta(days=1)) == key - 1, "Bad period key for previous step."
+        assert g.period_key(last_day + relativedelta(days=1)) == key + 1, "Bad period key for next step."
+
+
+def test_n_weekdays_of_granularity():
+    for g in [YearlyGranularity(), QuarterlyGranularity(), MonthlyGranularity(), WeeklyGranularity()]:
+        days = g.get_n_weekdays_of_granularity(date(2021, 11, 17), date(2023, 2, 3), 3, 0)
+
+        expected_days = []
+        day = g.get_beginning_of_granularity(date(2021, 11, 17))
+        while day <= date(2023, 2, 3):
+            expected_days.append(g.get_n_weekday_of_granularity(day, 3, 0))
+            day += g.delta
+        assert days == expected_days, "Bad n weekdays of granularity."
@@ -0,0 +1,95 @@
+from datetime import date
+from typing import Iterator
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from outatime.granularity.granularity import DailyGranularity, MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.batches import iter_split, split
+from outatime.timeseries.columnar import ColumnarTimeSeries
+from outatime.timeseries.frame import TimeSeriesFrame
+from outatime.timeseries.groupby import group_by_granularity
+from outatime.timeseries.view import TimeSeriesView
+from test.utils import data_generation
+
+
+def test_group_by_granularity():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-03-20')
+    batches = group_by_granularity(tsl.dates, MonthlyGranularity())
+
+    assert [(b.first_day, b.last_day) for b in batches] == [
+        (date(2022, 1, 1), date(2022, 1, 31)),
+        (date(2022, 2, 1), date(2022, 2, 28)),
+        (date(2022, 3, 1), date(2022, 3, 31)),
+    ], "Wrong batch ranges."
+    assert [len(b) for b in batches] == [29, 28, 20], "Wrong batch lengths."
+    assert batches[0].start == 0 and batches[-1].stop == len(tsl), "Batches must cover the whole series."
+    assert all(a.stop == b.start for a, b in zip(batches, batches[1:])), "Batches must be contiguous."
+
+
+def test_group_by_granularity_options():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-03-20')
+    batches = group_by_granularity(tsl.dates, MonthlyGranularity(), first_day_of_batch=4, last_day_of_batch=9)
+    assert all(tsl.dates[b.start] == b.first_day and tsl.dates[b.stop - 1] == b.last_day for b in batches), \
+        "Batches must start and end on the chosen days."
+
+    batches = group_by_granularity(tsl.dates, MonthlyGranularity(), drop_tails=True, data_granularity=DailyGranularity())
+    assert [b.first_day for b in batches] == [date(2022, 2, 1)], "Incomplete tails must be dropped."
+
+    assert group_by_granularity([], WeeklyGranularity()) == [], "No batches expected for an empty list."
+
+
+def test_group_by_granularity_keep_empty():
+    tsl = data_generation(start_date='2022-01-01', end_date='2022-12-01', step=relativedelta(months=4))
+    batches = group_by_granularity(tsl.dates, MonthlyGranularity())
+    assert len(batches) == 3, "Empty batches must be skipped."
+
+    batches = group_by_granularity(tsl.dates, MonthlyGranularity(), keep_empty=True)
+    assert len(batches) == 9, "Empty batches must be kept."
+    assert sum(len(b) for b in batches) == 3, "Empty batches must not contain elements."
+
+
+def test_split_shares_engine():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-03-20')
+    batches = group_by_granularity(tsl.dates, WeeklyGranularity())
+    res = split(tsl, WeeklyGranularity())
+
+    assert [ts.dates for ts in res] == [tsl.dates[b.start:b.stop] for b in batches], "Split must follow the batches."
+
+
+def test_iter_split():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-03-20')
+    res = iter_split(tsl, MonthlyGranularity(), first_day_of_batch=2, drop_tails=True)
+
+    assert isinstance(res, Iterator), "A lazy iterator is expected."
+    views = list(res)
+    expected = split(tsl, MonthlyGranularity(), first_day_of_batch=2, drop_tails=True)
+    assert all(isinstance(view, TimeSeriesView) for view in views), "Views are expected."
+    assert [list(view) for view in views] == [list(ts) for ts in expected], "Same batches of split are expected."
+    assert all(view[0] is tsl[view.start] for view in views), "Elements must not be copied."
+
+    sub_views = list(iter_split(tsl.view(), WeeklyGranularity()))
+    assert [view.dates for view in sub_views] == [ts.dates for ts in split(tsl, WeeklyGranularity())], \
+        "A view must be split like its time series."
+
+
+def test_iter_split_columnar():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-03-20')
+    expected = split(tsl, WeeklyGranularity())
+
+    cts = ColumnarTimeSeries.from_time_series(tsl)
+    batches = list(iter_split(cts, WeeklyGranularity()))
+    assert all(isinstance(batch, ColumnarTimeSeries) for batch in batches), "Columnar batches are expected."
+    assert [list(batch) for batch in batches] == [list(ts) for ts in expected], "Same batches of split are expected."
+
+    frame = TimeSeriesFrame.from_series({'a': tsl})
+    batches = list(iter_split(frame, WeeklyGranularity()))
+    assert [batch.series('a') for batch in batches] == [list(ts) for ts in expected], "Same batches of split are expected."
+
+
+def test_iter_split_checks_arguments_on_call():
+    tsl = data_generation(start_date='2020-01-31', end_date='2020-12-31', step=relativedelta(months=1))
+    with pytest.raises(AssertionError):
+        iter_split(tsl, WeeklyGranularity())
+    with pytest.raises(AssertionError):
+        iter_split(tsl, MonthlyGranularity(), first_day_of_batch=-1)
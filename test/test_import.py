@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CODE = """
+import sys, time
+t = time.perf_counter()
+from outatime.timeseries.time_series import TimeSeries
+elapsed = time.perf_counter() - t
+from outatime.timeseries.filter_parser import FilterParserGenerator
+generators = [FilterParserGenerator, *FilterParserGenerator.__subclasses__()]
+print(elapsed)
+print('numpy' in sys.modules)
+print(any(generator.__dict__.get('lark_parser') is not None for generator in generators))
+TimeSeries.query_parser_generator.parse('month == 1')
+print(TimeSeries.query_parser_generator.get_lark_parser() is not None)
+"""
+
+
+def test_import_time():
+    res = subprocess.run([sys.executable, "-c", IMPORT_CODE], cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed, numpy_imported, grammar_built, grammar_built_on_query = res.stdout.split()
+
+    print(f"*** Imported in: {round(float(elapsed), 4)}s.")
+    assert numpy_imported == 'False', "Importing the time series must not import numpy."
+    assert grammar_built == 'False', "Importing the time series must not build the query grammar."
+    assert grammar_built_on_query == 'True', "Query grammar must be built on first use."
@@ -1,5 +1,6 @@
 from outatime.dataclass.time_series_data import TimeSeriesData
 from outatime.granularity.granularity import *
+from outatime.timeseries.inference import has_unique_steps
 from outatime.timeseries.time_series import TimeSeries
 from outatime.util.relativedelta import relativedelta
 from test.utils import data_generation
@@ -109,3 +110,51 @@ def test_granularity_inference_missing_granularity():
         possible_granularity_list=granularity_set
     )
     assert isinstance(tsl.data_granularity, WeeklyGranularity), "Expected WeeklyGranularity because missing MonthlyGranularity."
+
+
+def test_has_unique_steps():
+    dates = [date(2020, 1, 31), date(2020, 2, 1), date(2020, 3, 15)]
+    assert has_unique_steps(dates, MonthlyGranularity()), "Expected unique monthly steps."
+    assert not has_unique_steps(dates, QuarterlyGranularity()), "Expected shared quarterly steps."
+    assert has_unique_steps([], DailyGranularity()), "Expected unique steps for empty dates."
+
+
+def test_granularity_inference_unsorted_data():
+    tsl = TimeSeries(
+        [
+            TimeSeriesData(day=date(2020, 3, 1), data={}),
+            TimeSeriesData(day=date(2020, 1, 1), data={}),
+            TimeSeriesData(day=date(2020, 2, 1), data={}),
+        ]
+    )
+    assert isinstance(tsl.data_granularity, MonthlyGranularity), "Expected MonthlyGranularity."
+
+
+def test_granularity_inference_is_lazy():
+    tsl = data_generation(start_date='2020-01-01', end_date='2021-01-01', step=relativedelta(months=1))
+    assert 'data_granularity' not in tsl.__dict__, "Granularity inferred before first access."
+    assert isinstance(tsl.data_granularity, MonthlyGranularity), "Expected MonthlyGranularity."
+
+    tsl.delete(tsl.start_date)
+    assert 'data_granularity' not in tsl.__dict__, "Granularity not invalidated after delete."
+
+
+def test_granularity_given_at_construction():
+    tsl = data_generation(
+        start_date='2020-01-01',
+        end_date='2021-01-01',
+        step=relativedelta(months=1),
+    )
+    tsl = TimeSeries(list(tsl), data_granularity=DailyGranularity())
+    assert isinstance(tsl.data_granularity, DailyGranularity), "Given granularity not kept."
+
+
+def test_granularity_of_slice():
+    tsl = data_generation(start_date='2020-01-01', end_date='2021-01-01', step=relativedelta(days=1))
+    assert isinstance(tsl.data_granularity, DailyGranularity), "Expected DailyGranularity."
+
+    subset = tsl[0:70:40]
+    assert isinstance(subset.data_granularity, MonthlyGranularity), "Expected MonthlyGranularity for stepped slice."
+
+    subset = tsl[10:20]
+    assert subset.__dict__.get('data_granularity') is tsl.data_granularity, "Granularity not passed to slice."
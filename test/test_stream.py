@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import MonthlyGranularity, WeeklyGranularity
+from outatime.timeseries.batches import aggregate
+from outatime.timeseries.stream import stream_aggregate, astream_aggregate
+from outatime.timeseries.time_series import TimeSeries
+from test.utils import data_generation
+
+
+def sum_pippo(batch):
+    return sum(data.get('pippo', 0) for data in batch)
+
+
+def test_stream_aggregate():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-06-20')
+
+    for kwargs in [
+        dict(granularity=WeeklyGranularity()),
+        dict(granularity=MonthlyGranularity(), first_day_of_batch=3, last_day_of_batch=20, store_day_of_batch=-1),
+        dict(granularity=MonthlyGranularity(), store_day_of_batch=14),
+    ]:
+        expected = aggregate(tsl, method=sum_pippo, **kwargs)
+        res = list(stream_aggregate(iter(tsl), method=sum_pippo, **kwargs))
+        assert res == list(expected), f"Wrong streamed aggregation with {kwargs}."
+
+
+def test_stream_aggregate_named_method():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-06-20')
+    expected = aggregate(tsl, method='mean', granularity=MonthlyGranularity())
+    res = list(stream_aggregate(tsl, method='mean', granularity=MonthlyGranularity()))
+    assert res == list(expected), "Wrong streamed aggregation with a named reducer."
+
+    with pytest.raises(ValueError):
+        list(stream_aggregate(tsl, method='median'))
+
+
+def test_stream_aggregate_is_incremental():
+    received = []
+
+    def feed():
+        for day in range(1, 20):
+            received.append(day)
+            yield TimeSeriesData(day=date(2022, 1, day), data=day)
+
+    res = stream_aggregate(feed(), method=sum, granularity=WeeklyGranularity())
+    first = next(res)
+    assert first == TimeSeriesData(day=date(2021, 12, 27), data=sum(range(1, 3))), "Wrong first batch."
+    assert received == [1, 2], "A batch must be emitted as soon as its last day is received."
+    assert len(list(res)) == 3, "Open batch must be flushed at the end of the stream."
+
+
+def test_stream_aggregate_out_of_order():
+    elements = [TimeSeriesData(day=date(2022, 1, 2), data=1), TimeSeriesData(day=date(2022, 1, 1), data=2)]
+    with pytest.raises(ValueError):
+        list(stream_aggregate(elements, method=sum))
+
+
+def test_astream_aggregate():
+    tsl = data_generation(start_date='2022-01-03', end_date='2022-06-20')
+
+    async def feed():
+        for element in tsl:
+            yield element
+
+    async def collect():
+        return [element async for element in astream_aggregate(feed(), method=sum_pippo, granularity=MonthlyGranularity())]
+
+    res = asyncio.run(collect())
+    assert res == list(aggregate(tsl, method=sum_pippo, granularity=MonthlyGranularity())), "Wrong async aggregation."
+
+
+def test_stream_aggregate_first_last_keep_values():
+    days = data_generation(start_date='2022-01-03', end_date='2022-03-20').dates
+    tsl = TimeSeries([
+        TimeSeriesData(day=day, data={'a': idx if idx % 2 else idx / 2, 'b': idx % 3 == 0}) for idx, day in enumerate(days)
+    ])
+    scalar_tsl = TimeSeries([TimeSeriesData(day=day, data=idx if idx % 2 else idx / 2) for idx, day in enumerate(days)])
+
+    for ts in [tsl, scalar_tsl]:
+        for method in ['first', 'last']:
+            expected = aggregate(ts, method=method, granularity=WeeklyGranularity())
+            res = list(stream_aggregate(ts, method=method, granularity=WeeklyGranularity()))
+            assert [repr(element) for element in res] == [repr(element) for element in expected], \
+                f"Wrong streamed values of '{method}'."
@@ -3,8 +3,10 @@ from copy import deepcopy, copy
 from datetime import datetime, date
 
 from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import DailyGranularity, MonthlyGranularity, WeeklyGranularity
 from outatime.timeseries.time_series import TimeSeries
-from test.utils import data_generation
+from outatime.util.relativedelta import relativedelta
+from test.utils import data_generation, compare
 
 
 def test_deepcopy():
@@ -74,6 +76,9 @@ def test_cut():
     assert y[-1].day == max_date, "Ending date is wrong."
     assert tsl[0].day != min_date and tsl[-1].day != max_date, "Original time series changed."
 
+    y[0].data['pippo'] = -1
+    assert tsl.get(min_date).data['pippo'] != -1, "Original elements changed."
+
 
 def test_cut_inplace():
     min_date = date(2020, 1, 11)
@@ -102,3 +107,116 @@ def test_single_element_timeseries():
         tsl.append(day)
     except:
         raise AssertionError("Unable to append a single element to empty time series.")
+
+
+def test_append_keeps_order():
+    tsl = data_generation(start_date='2021-06-01', end_date='2021-07-01', step=relativedelta(days=2))
+    new_day = TimeSeriesData(day=date(2021, 6, 2), data={'pippo': 1})
+    tsl.append(new_day)
+
+    assert tsl[1] is new_day, "Element not inserted at the expected position."
+    assert tsl.dates == sorted(tsl.dates), "Time series is not sorted after append."
+    assert tsl.dates == [element.day for element in tsl], "Dates cache out of sync after append."
+
+
+def test_append_unsorted_input():
+    d1, d3, d4, d5 = [TimeSeriesData(day=date(2021, 6, day), data={'pippo': day}) for day in (1, 3, 4, 5)]
+    tsl = TimeSeries([d5, d1, d3])
+    tsl.append(d4)
+
+    assert list(tsl) == [d1, d3, d4, d5], "Time series must be sorted by date."
+
+
+def test_append_replaces_existing_day():
+    tsl = data_generation(start_date='2021-06-01', end_date='2021-07-01')
+    length = len(tsl)
+    new_day = TimeSeriesData(day=date(2021, 6, 10), data={'pippo': 1})
+    tsl.append(new_day)
+
+    assert len(tsl) == length, "Unexpected length after replacing an existing day."
+    assert tsl.get(date(2021, 6, 10)) is new_day, "Existing day not replaced."
+
+
+def test_append_granularity():
+    tsl = data_generation(start_date='2021-01-01', end_date='2021-12-01', step=relativedelta(months=1))
+    tsl.append(TimeSeriesData(day=date(2022, 1, 1), data={}))
+    assert isinstance(tsl.data_granularity, MonthlyGranularity), "Expected MonthlyGranularity after append."
+
+    tsl.append(TimeSeriesData(day=date(2021, 6, 20), data={}))
+    assert isinstance(tsl.data_granularity, WeeklyGranularity), "Expected WeeklyGranularity after append."
+
+
+def test_update_conflict_policies():
+    old_day = TimeSeriesData(day=date(2021, 6, 10), data={'pippo': 1})
+    new_day = TimeSeriesData(day=date(2021, 6, 10), data={'pippo': 2})
+
+    tsl = TimeSeries([TimeSeriesData(day=date(2021, 6, 9), data={'pippo': 0}), old_day])
+    tsl.update([new_day])
+    assert len(tsl) == 2 and tsl[-1] is new_day, "Unexpected 'keep_new' update result."
+
+    tsl = TimeSeries([TimeSeriesData(day=date(2021, 6, 9), data={'pippo': 0}), old_day])
+    tsl.update([new_day], conflict='keep_old')
+    assert len(tsl) == 2 and tsl[-1] is old_day, "Unexpected 'keep_old' update result."
+
+    tsl = TimeSeries([TimeSeriesData(day=date(2021, 6, 9), data={'pippo': 0}), old_day])
+    tsl.update([new_day], conflict=lambda a, b: {'pippo': a['pippo'] + b['pippo']})
+    assert len(tsl) == 2 and tsl[-1].data == {'pippo': 3}, "Unexpected combined update result."
+
+    try:
+        tsl.update([new_day], conflict='bad_policy')
+        raise AssertionError("Exception not caught.")
+    except ValueError:
+        pass
+
+
+def test_update_unsorted_input():
+    d1, d3, d4, d5 = [TimeSeriesData(day=date(2021, 6, day), data={'pippo': day}) for day in (1, 3, 4, 5)]
+    tsl = TimeSeries([d5, d1, d3])
+    tsl.update([d4])
+    assert list(tsl) == [d1, d3, d4, d5], "Time series must be sorted by date."
+
+    tsl.sort(key=lambda element: element.data['pippo'], reverse=True)
+    tsl.update([d4])
+    assert list(tsl) == [d1, d3, d4, d5], "Time series must be sorted by date."
+
+
+def test_update_unsorted_batch():
+    tsl = data_generation(start_date='2021-06-01', end_date='2021-06-30', step=relativedelta(days=2))
+    days = [
+        TimeSeriesData(day=date(2021, 7, 2), data={}),
+        TimeSeriesData(day=date(2021, 6, 2), data={}),
+        TimeSeriesData(day=date(2021, 6, 3), data={}),
+    ]
+    tsl.update(days)
+
+    assert tsl.dates == sorted(set(tsl.dates)), "Time series is not sorted or has duplicated days."
+    assert len(tsl) == 17, "Unexpected length after update."
+
+
+def test_possible_granularity_list_per_series():
+    daily = data_generation(start_date='2021-01-01', end_date='2021-03-01', possible_granularity_list=[DailyGranularity])
+    _ = data_generation(start_date='2021-01-01', end_date='2021-12-01', step=relativedelta(months=1),
+                        possible_granularity_list=[MonthlyGranularity])
+    assert daily.possible_granularity_list == [DailyGranularity], "Possible granularities must not be shared."
+    assert isinstance(daily.data_granularity, DailyGranularity), "Unexpected granularity."
+
+
+def test_deepcopy_elements():
+    tsl = data_generation(start_date='2021-06-01', end_date='2021-07-01')
+    x = tsl.copy()
+    assert compare(x, tsl) and len(x) == len(tsl), "Copy differs from the original time series."
+    assert x[0] is not tsl[0] and x[1].data is not tsl[1].data, "Elements not copied."
+
+
+def test_shallow_copy():
+    tsl = data_generation(start_date='2021-06-01', end_date='2021-07-01')
+    x = tsl.copy(deep=False)
+    assert all(a is b for a, b in zip(x, tsl)), "Elements not shared."
+
+    x.append(TimeSeriesData(day=date(2021, 6, 10), data={'pippo': 1}))
+    x.delete(date(2021, 6, 11))
+    assert tsl.get(date(2021, 6, 10)).data != {'pippo': 1}, "Original time series changed by append."
+    assert tsl.get(date(2021, 6, 11)).data is not None, "Original time series changed by delete."
+
+    y = copy(tsl)
+    assert y[0] is tsl[0] and id(y) != id(tsl), "Unexpected copy.copy result."
@@ -0,0 +1,69 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from outatime.timeseries.columnar import ColumnarTimeSeries
+from outatime.timeseries.time_series import TimeSeries
+from outatime.util.bisect import find_lte, find_gte
+from test.utils import gapped_generation
+
+
+def is_gap(idx):
+    return idx % 7 in (2, 3, 4)
+
+
+def query_days(tsl):
+    days = [tsl.start_date + timedelta(days=offset) for offset in range(-10, (tsl.end_date - tsl.start_date).days + 10)]
+    random.shuffle(days)
+    return days
+
+
+def reference_asof(tsl, day, direction):
+    def _find(find):
+        try:
+            return tsl.get(find(tsl.dates, day))
+        except ValueError:
+            return None
+
+    before, after = _find(find_lte), _find(find_gte)
+    if direction == 'backward':
+        return before
+    if direction == 'forward':
+        return after
+    if before is None or after is None:
+        return after if before is None else before
+    return before if day - before.day <= after.day - day else after
+
+
+def test_get_many():
+    tsl = gapped_generation(empty_data_step=100000, is_gap=is_gap)
+    days = query_days(tsl)
+
+    expected_res = [tsl.get(day, value=0) for day in days]
+    assert tsl.get_many(days, value=0) == expected_res, "Unexpected elements."
+    assert ColumnarTimeSeries.from_time_series(tsl).get_many(days, value=0) == expected_res, \
+        "Unexpected columnar elements."
+    assert tsl.get_many(sorted(days)) == [tsl.get(day) for day in sorted(days)], "Unexpected elements."
+    assert all(element is tsl.get(element.day) for element in tsl.get_many(tsl.dates)), "Elements must not be copied."
+
+
+@pytest.mark.parametrize("direction", ['backward', 'forward', 'nearest'])
+def test_asof_many(direction):
+    tsl = gapped_generation(empty_data_step=100000, is_gap=is_gap)
+    days = query_days(tsl)
+
+    expected_res = [reference_asof(tsl, day, direction) for day in days]
+    assert tsl.asof_many(days, direction=direction) == expected_res, "Unexpected elements."
+    assert ColumnarTimeSeries.from_time_series(tsl).asof_many(days, direction=direction) == expected_res, \
+        "Unexpected columnar elements."
+    assert TimeSeries().asof_many(days, direction=direction) == [None] * len(days), "No elements expected."
+
+
+def test_asof_many_direction():
+    tsl = gapped_generation(empty_data_step=100000, is_gap=is_gap)
+
+    with pytest.raises(ValueError):
+        tsl.asof_many(tsl.dates, direction='sideways')
+    with pytest.raises(ValueError):
+        ColumnarTimeSeries.from_time_series(tsl).asof_many(tsl.dates, direction='sideways')
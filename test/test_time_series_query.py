@@ -1,4 +1,10 @@
-from outatime.timeseries.filter_parser import FilterParserError
+from datetime import date
+
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.timeseries.columnar import ColumnarTimeSeries
+from outatime.timeseries.filter_parser import FilterParserError, FilterParserGenerator, BoundsFilterParserGenerator, \
+    CompiledFilterParserGenerator, date_window
+from outatime.timeseries.time_series import TimeSeries
 from test.utils import data_generation
 
 
@@ -162,3 +168,180 @@ def test_time_series_bad_request():
         raise AssertionError("Uncaught exception.")
     except FilterParserError:
         pass
+
+
+def test_query_parser_cache():
+    generator = FilterParserGenerator(cache_size=2)
+
+    filter_a, _ = generator.parse("month > 10 and day < 5")
+    filter_b, _ = generator.parse("  month >  10   and day < 5 ")
+    assert filter_a is filter_b, "Equivalent queries must share the parsed filter."
+    info = generator.cache_info()
+    assert (info.hits, info.misses, info.currsize, info.maxsize) == (1, 1, 1, 2), "Unexpected cache statistics."
+
+    generator.parse("year == 2020")
+    generator.parse("month == 1")
+    filter_c, _ = generator.parse("month > 10 and day < 5")
+    assert filter_c is not filter_a, "Least recently used query must be evicted."
+    assert generator.cache_info().currsize == 2, "Unexpected cache size."
+
+    generator.cache_clear()
+    assert generator.cache_info().hits == 0 and generator.cache_info().currsize == 0, "Cache not cleared."
+
+    generator.set_cache_size(0)
+    filter_a, _ = generator.parse("month > 10")
+    filter_b, _ = generator.parse("month > 10")
+    assert filter_a is not filter_b, "Disabled cache must parse every query."
+
+    try:
+        _ = generator.parse(None)
+        raise AssertionError("Uncaught exception.")
+    except FilterParserError:
+        pass
+
+
+def test_time_series_query_cache():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-02-15')
+    assert len(tsl) < TimeSeries.vectorized_query_threshold, "Query must be evaluated on each element."
+    TimeSeries.query_parser_generator.cache_clear()
+
+    res_a = tsl.query("month == 2")
+    res_b = tsl.query("month ==   2")
+    assert res_a == res_b, "Unexpected result from cached query."
+    assert TimeSeries.query_parser_generator.cache_info().hits == 1, "Query must be read from the cache."
+
+
+def test_time_series_query_cache_size():
+    tsl = data_generation(start_date='1960-01-01', end_date='2025-01-04')
+    assert len(tsl) >= TimeSeries.vectorized_query_threshold, "Query must be evaluated on arrays."
+    try:
+        TimeSeries.set_query_cache_size(2)
+        assert TimeSeries.query_cache_info().maxsize == 6, "All the query caches must be resized."
+
+        tsl.query("month == 2")
+        tsl.query("month ==   2")
+        info = TimeSeries.query_cache_info()
+        assert (info.hits, info.misses) == (2, 2), "Bounds and vectorized parsers must be counted."
+
+        TimeSeries.query_cache_clear()
+        assert TimeSeries.query_cache_info().currsize == 0, "Caches not cleared."
+    finally:
+        TimeSeries.set_query_cache_size(128)
+
+
+def test_time_series_vectorized_query():
+    tsl = data_generation(start_date='1960-01-01', end_date='2025-01-04')
+    small_tsl = tsl[:TimeSeries.vectorized_query_threshold - 1]
+
+    for query in [
+        "month > 10",
+        "month <= 2 and day < 20",
+        "not (year == 2020 or 5 <= day <= 8)",
+        "~ month == 1 ^ day > 15",
+        "2 < month < 4 or day == 31",
+    ]:
+        query_filter, _ = TimeSeries.filter_parser(query)
+        expected = [element for element in tsl if query_filter(element)]
+        assert list(tsl.query(query)) == expected, f"Unexpected vectorized result for {query}."
+        assert list(tsl.view().query(query)) == expected, f"Unexpected view result for {query}."
+        assert list(small_tsl.query(query)) == [element for element in small_tsl if query_filter(element)], \
+            f"Unexpected result for {query}."
+
+
+def test_calendar_fields_cache():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-12-31')
+    fields = tsl.calendar_fields
+    assert fields['month'][40] == 2 and fields['day'][40] == 10, "Unexpected calendar fields."
+
+    tsl.append(TimeSeriesData(day=date(2021, 1, 1), data={}))
+    assert tsl.calendar_fields['year'][-1] == 2021, "Calendar fields not refreshed after append."
+
+    tsl.query("year == 2021", inplace=True)
+    assert list(tsl.calendar_fields['year']) == [2021], "Calendar fields not refreshed after query."
+
+
+def test_query_bounds():
+    generator = BoundsFilterParserGenerator()
+
+    for query, expected_bounds, expected_window in [
+        ("year >= 2021 and year <= 2022", {'year': (2021, 2022)}, (date(2021, 1, 1), date(2022, 12, 31))),
+        ("year == 2023 and month <= 3", {'year': (2023, 2023), 'month': (None, 3)}, (date(2023, 1, 1), date(2023, 3, 31))),
+        ("2019 < year < 2021 and month > 9 and 31 <= day", {'year': (2020, 2020), 'month': (10, None), 'day': (31, None)},
+         (date(2020, 10, 31), date(2020, 12, 31))),
+        ("year == 2020 or year == 2022", {'year': (2020, 2022)}, (date(2020, 1, 1), date(2022, 12, 31))),
+        ("year == 2020 or month == 1", {}, (date.min, date.max)),
+        ("not year == 2020", {}, (date.min, date.max)),
+        ("year == 2020 xor month == 1", {}, (date.min, date.max)),
+        ("year != 2020", {'year': (None, None)}, (date.min, date.max)),
+        ("year == 2020 and year == 2021", {'year': (2021, 2020)}, None),
+    ]:
+        bounds, _ = generator.parse(query)
+        assert bounds == expected_bounds, f"Unexpected bounds for {query}."
+        assert date_window(bounds) == expected_window, f"Unexpected date window for {query}."
+
+
+def test_time_series_query_pushdown():
+    tsl = data_generation(start_date='1960-01-01', end_date='2025-01-04')
+    columnar_tsl = ColumnarTimeSeries.from_time_series(tsl)
+
+    for query in [
+        "year >= 2021 and year <= 2022",
+        "year == 2023 and month <= 3 and day != 4",
+        "year == 2020 or year == 2022 and month == 5",
+        "year < 1962 and not year == 1960",
+        "year == 2020 and year == 2021",
+        "year > 2024 and month == 1 and day > 2",
+    ]:
+        query_filter, _ = TimeSeries.filter_parser(query)
+        expected = [element for element in tsl if query_filter(element)]
+        assert list(tsl.query(query)) == expected, f"Unexpected result for {query}."
+        assert list(tsl.view(date(2020, 3, 1), date(2021, 5, 3)).query(query)) == \
+            [element for element in expected if date(2020, 3, 1) <= element.day <= date(2021, 5, 3)], \
+            f"Unexpected view result for {query}."
+        assert list(columnar_tsl.query(query)) == expected, f"Unexpected columnar result for {query}."
+
+    assert 'calendar_fields' not in tsl.__dict__, "Only the elements in the date window must be evaluated."
+
+
+def test_compiled_query():
+    tsl = data_generation(start_date='2019-11-01', end_date='2021-03-04')
+    generator = CompiledFilterParserGenerator()
+
+    for query in [
+        "month > 10",
+        "month <= 2 and day < 20",
+        "not (year == 2020 or 5 <= day <= 8)",
+        "~ month == 1 ^ day > 15",
+        "3 < month < 6 & day != 2 * 3",
+        "year == 2020 xor month >= 6",
+    ]:
+        query_filter, _ = FilterParserGenerator().parse(query)
+        compiled_filter, _ = generator.parse(query)
+        assert [compiled_filter(x) for x in tsl] == [query_filter(x) for x in tsl], f"Unexpected result for {query}."
+
+    source = CompiledFilterParserGenerator.get_lark_parser().parse("month <= 2 and day < 20")
+    assert source == ("((m <= 2) and (d < 20))", None), "Unexpected query source."
+
+    compiled_filter, _ = generator.parse("month == 1")
+    assert compiled_filter(TimeSeriesData(day=date(2020, 1, 3), data=None)), "Unexpected compiled filter result."
+    assert 'y' not in compiled_filter.__code__.co_varnames, "Unused fields must not be read."
+
+
+def test_time_series_query_after_list_methods():
+    tsl = data_generation(start_date='2020-01-01', end_date='2020-01-10')
+    extra = data_generation(start_date='2020-01-11', end_date='2020-01-14')
+
+    changes = [
+        lambda: tsl.extend([extra[0]]),
+        lambda: tsl.insert(0, extra[1]),
+        lambda: tsl.pop(),
+        lambda: tsl.remove(tsl[0]),
+        lambda: tsl.__iadd__([extra[2], extra[3]]),
+        lambda: tsl.reverse(),
+        lambda: tsl.clear(),
+    ]
+    for change in changes:
+        _ = tsl.query("day >= 1")
+        change()
+        assert tsl.dates == sorted(element.day for element in tsl), "Time series must stay sorted."
+        assert tsl.query("day >= 1") == list(tsl), "Query must see the changed elements."
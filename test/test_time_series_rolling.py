@@ -0,0 +1,71 @@
+import statistics
+
+import pytest
+
+from outatime.granularity.granularity import MonthlyGranularity
+from outatime.timeseries.view import TimeSeriesView
+from outatime.util.relativedelta import relativedelta
+from test.utils import gapped_generation, get_pippo
+
+
+def is_gap(idx):
+    return idx % 5 in (1, 2) or idx % 11 == 0
+
+
+def reference_windows(tsl, size=None, span=None):
+    windows = []
+    for idx, element in enumerate(tsl):
+        if size is not None:
+            window = tsl[max(0, idx - size + 1):idx + 1]
+        else:
+            window = tsl.view(element.day - span + relativedelta(days=1), element.day)
+        windows.append([get_pippo(other.data) for other in window if other.data is not None])
+    return windows
+
+
+@pytest.mark.parametrize("kwargs, reference_kwargs, min_periods", [
+    ({'size': 10}, {'size': 10}, 10),
+    ({'size': 5, 'min_periods': 2}, {'size': 5}, 2),
+    ({'span': 30}, {'span': relativedelta(days=30)}, 1),
+    ({'span': MonthlyGranularity()}, {'span': relativedelta(months=1)}, 1),
+])
+def test_rolling(kwargs, reference_kwargs, min_periods):
+    tsl = gapped_generation(is_gap=is_gap)
+    rolling = tsl.rolling(key=get_pippo, **kwargs)
+    windows = reference_windows(tsl, **reference_kwargs)
+
+    def expected(method):
+        return [method(values) if values and len(values) >= min_periods else None for values in windows]
+
+    assert [element.data for element in rolling.count()] == [len(values) for values in windows], "Unexpected counts."
+    assert [element.data for element in rolling.sum()] == expected(sum), "Unexpected sums."
+    assert [element.data for element in rolling.min()] == expected(min), "Unexpected minimums."
+    assert [element.data for element in rolling.max()] == expected(max), "Unexpected maximums."
+    for method, reference in [('mean', statistics.fmean), ('std', statistics.pstdev)]:
+        res = getattr(rolling, method)()
+        assert res.dates == tsl.dates, "Results must be stored on the days of the time series."
+        assert all(
+            (x is None and y is None) or abs(x - y) < 1e-6
+            for x, y in zip([element.data for element in res], expected(reference))
+        ), f"Unexpected results of '{method}'."
+
+
+def test_rolling_apply():
+    tsl = gapped_generation(is_gap=is_gap)
+
+    windows = []
+    res = tsl.rolling(span=7, min_periods=0).apply(lambda window: windows.append(window) or len(window))
+    assert all(isinstance(window, TimeSeriesView) and window.ts is tsl for window in windows), \
+        "Expected views over the series."
+    for element, window in zip(tsl, windows):
+        assert list(window) == tsl.cut(element.day - relativedelta(days=6), element.day), "Unexpected window."
+    assert [element.data for element in res] == [len(window) for window in windows], "Unexpected results."
+
+
+def test_rolling_arguments():
+    tsl = gapped_generation(is_gap=is_gap)
+
+    with pytest.raises(ValueError):
+        tsl.rolling()
+    with pytest.raises(ValueError):
+        tsl.rolling(size=3, span=3)
@@ -0,0 +1,94 @@
+import pytest
+
+from outatime.dataclass.time_series_data import TimeSeriesData
+from outatime.granularity.granularity import WeeklyGranularity
+from outatime.timeseries.columnar import ColumnarTimeSeries
+from outatime.timeseries.time_series import TimeSeries
+from outatime.util.relativedelta import relativedelta
+from test.utils import data_generation, gapped_generation, get_pippo
+
+
+def reference_source(tsl, idx, periods=None, offset=None):
+    if offset is not None:
+        return tsl.get(tsl[idx].day - offset).data
+    if 0 <= idx - periods < len(tsl):
+        return tsl[idx - periods].data
+    return None
+
+
+OPTIONS = [
+    dict(periods=1),
+    dict(periods=3),
+    dict(periods=-2),
+    dict(offset=7),
+    dict(offset=WeeklyGranularity()),
+    dict(offset=relativedelta(years=1)),
+    dict(offset=relativedelta(months=1, days=2)),
+]
+
+
+def reference_offset(offset):
+    if isinstance(offset, int):
+        return relativedelta(days=offset)
+    if isinstance(offset, WeeklyGranularity):
+        return offset.delta
+    return offset
+
+
+@pytest.mark.parametrize("kwargs", OPTIONS)
+def test_time_series_shift(kwargs):
+    tsl = gapped_generation(end_date='2022-12-31')
+    periods, offset = kwargs.get('periods'), reference_offset(kwargs.get('offset'))
+
+    res = tsl.shift(periods) if periods is not None else tsl.lag(kwargs['offset'])
+    assert res.dates == tsl.dates, "Days must be kept."
+    assert [element.data for element in res] == [
+        reference_source(tsl, idx, periods, offset) for idx in range(len(tsl))
+    ], "Unexpected moved data."
+
+    def expected(method):
+        results = []
+        for idx, element in enumerate(tsl):
+            previous = reference_source(tsl, idx, periods, offset)
+            if element.data is None or previous is None:
+                results.append(None)
+            else:
+                results.append(method(get_pippo(element.data), get_pippo(previous)))
+        return results
+
+    res = tsl.diff(key=get_pippo, **kwargs)
+    assert [element.data for element in res] == expected(lambda a, b: a - b), "Unexpected differences."
+    res = tsl.pct_change(key=get_pippo, **kwargs)
+    assert [element.data for element in res] == expected(lambda a, b: a / b - 1), "Unexpected changes."
+
+
+@pytest.mark.parametrize("kwargs", OPTIONS)
+def test_columnar_shift(kwargs):
+    tsl = gapped_generation(end_date='2022-12-31')
+    numbers = TimeSeries([TimeSeriesData(day=element.day, data=None if element.data is None else get_pippo(element.data))
+                          for element in tsl])
+    dicts = TimeSeries([TimeSeriesData(day=element.day, data=element.data or {}) for element in tsl])
+
+    cts = ColumnarTimeSeries.from_time_series(numbers)
+    if 'periods' in kwargs:
+        assert list(cts.shift(kwargs['periods'])) == list(numbers.shift(kwargs['periods'])), "Unexpected moved data."
+    else:
+        assert list(cts.lag(kwargs['offset'])) == list(numbers.lag(kwargs['offset'])), "Unexpected moved data."
+
+    for method in ['diff', 'pct_change']:
+        assert list(getattr(cts, method)(**kwargs)) == list(getattr(numbers, method)(**kwargs)), \
+            f"Unexpected results of '{method}'."
+
+        res = getattr(ColumnarTimeSeries.from_time_series(dicts), method)(**kwargs)
+        expected_res = getattr(numbers, method)(**kwargs)
+        assert [element.data.get('pippo') for element in res] == [element.data for element in expected_res], \
+            f"Unexpected column results of '{method}'."
+
+
+def test_pct_change_zero():
+    tsl = TimeSeries([TimeSeriesData(day=day, data=value) for day, value in
+                      zip(data_generation().dates, [0, 2, 3, 0, 5])])
+    expected_res = [None, None, 0.5, -1., None]
+    assert [element.data for element in tsl.pct_change()] == expected_res, "Unexpected changes."
+    assert [element.data for element in ColumnarTimeSeries.from_time_series(tsl).pct_change()] == expected_res, \
+        "Unexpected columnar changes."
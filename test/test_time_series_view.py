@@ -0,0 +1,98 @@
+from datetime import date
+
+from outatime.granularity.granularity import MonthlyGranularity, DailyGranularity
+from outatime.timeseries.batches import aggregate, pick_a_day
+from outatime.timeseries.time_series import TimeSeries
+from outatime.timeseries.view import TimeSeriesView
+from test.utils import data_generation, compare
+
+
+def take_first(list_):
+    if list_:
+        return list_[0]
+    return None
+
+
+def test_view():
+    min_date = date(2020, 1, 11)
+    max_date = date(2021, 1, 11)
+
+    tsl = data_generation()
+    view = tsl.view(min_date=min_date, max_date=max_date)
+
+    assert isinstance(view, TimeSeriesView), "Unexpected view type."
+    assert view.start_date == min_date and view.end_date == max_date, "Unexpected view range."
+    assert len(view) == 367, "Unexpected view length."
+    assert view[0] is tsl.get(min_date), "View element is not shared with the time series."
+    assert compare(list(view), tsl.cut(min_date, max_date)), "Unexpected view elements."
+    assert view.dates == tsl.dates[4:371], "Unexpected view dates."
+
+
+def test_view_empty_series():
+    tsl = TimeSeries()
+    for kwargs in [{}, {'min_date': date(2020, 1, 11)}, {'max_date': date(2021, 1, 11)}]:
+        view = tsl.view(**kwargs)
+        assert isinstance(view, TimeSeriesView) and len(view) == 0, "An empty view is expected."
+        assert list(view) == [] and view.dates == [], "Unexpected view elements."
+
+
+def test_view_slicing():
+    tsl = data_generation()
+    view = tsl.view()[10:20]
+
+    assert isinstance(view, TimeSeriesView), "Unexpected slice type."
+    assert compare(list(view), tsl[10:20]), "Unexpected slice elements."
+    assert view[-1] is tsl[19], "Unexpected negative indexing result."
+    assert compare(list(view[2:4]), tsl[12:14]), "Unexpected nested slice elements."
+
+    try:
+        _ = view[10]
+        raise AssertionError("Exception not caught.")
+    except IndexError:
+        pass
+
+
+def test_view_get():
+    tsl = data_generation()
+    view = tsl.view(date(2020, 2, 1), date(2020, 2, 29))
+
+    assert view.get(date(2020, 2, 10)) is tsl.get(date(2020, 2, 10)), "Unexpected get result."
+    assert view.get(date(2020, 3, 1), value=0).data == 0, "Day outside the view was found."
+
+
+def test_view_cut_and_query():
+    tsl = data_generation()
+    view = tsl.view(date(2020, 1, 1), date(2021, 12, 31))
+
+    sub_view = view.cut(date(2021, 1, 1), date(2022, 6, 1))
+    assert sub_view.start_date == date(2021, 1, 1), "Unexpected cut start date."
+    assert sub_view.end_date == date(2021, 12, 31), "Unexpected cut end date."
+
+    res = view.query("month == 2 and day == 1")
+    assert isinstance(res, TimeSeries), "Unexpected query result type."
+    assert res.dates == [date(2020, 2, 1), date(2021, 2, 1)], "Unexpected query result."
+
+
+def test_view_materialize():
+    tsl = data_generation()
+    view = tsl.view(date(2020, 2, 1), date(2020, 2, 29))
+
+    ts = view.materialize()
+    assert isinstance(ts, TimeSeries) and len(ts) == 29, "Unexpected materialized time series."
+    assert ts[0] == view[0] and ts[0] is not view[0], "Elements not copied."
+
+    ts = view.materialize(deep=False)
+    assert ts[0] is view[0], "Elements copied."
+
+
+def test_view_batches():
+    tsl = data_generation()
+    view = tsl.view(date(2020, 2, 1), date(2020, 12, 31))
+    assert isinstance(view.data_granularity, DailyGranularity), "Expected DailyGranularity."
+
+    res = aggregate(view, granularity=MonthlyGranularity(), method=take_first)
+    expected_res = aggregate(view.materialize(), granularity=MonthlyGranularity(), method=take_first)
+    assert compare(expected_res, res) and len(res) == 11, "Unexpected aggregate result."
+
+    res = pick_a_day(view, granularity=MonthlyGranularity(), day_of_batch=0)
+    assert res.dates[0] == date(2020, 2, 1) and len(res) == 11, "Unexpected pick_a_day result."
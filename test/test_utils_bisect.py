@@ -71,3 +71,24 @@ def test_find_delimiters():
     idx_min, idx_max = find_delimiters(_list, 2, 4)
     assert idx_min == 1, "Bad value returned for lower delimiter."
     assert idx_max == 3, "Bad value returned for higher delimiter."
+
+
+def test_indexes_of():
+    _list = [1, 3, 5, 7]
+
+    idxs = indexes_of(_list, [0, 3, 4, 7, 9])
+    assert idxs == [None, 1, None, 3, None], "Bad indexes returned."
+
+    idxs = indexes_of(_list, [1, 5], lo=1)
+    assert idxs == [None, 2], "Bad indexes returned."
+
+
+def test_indexes_lte_gte():
+    _list = [1, 3, 5, 7]
+    values = [0, 1, 2, 5, 6, 7, 9]
+
+    assert indexes_lte(_list, values) == [None, 0, 0, 2, 2, 3, 3], "Bad indexes returned."
+    assert indexes_gte(_list, values) == [0, 0, 1, 2, 3, 3, None], "Bad indexes returned."
+    assert indexes_nearest(_list, values) == [0, 0, 0, 2, 2, 3, 3], "Bad indexes returned."
+    assert indexes_lte(_list, [2, 6], lo=1, hi=3) == [None, 2], "Bad indexes returned."
+    assert indexes_nearest([], values) == [None] * len(values), "No indexes expected."
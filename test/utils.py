@@ -8,7 +8,8 @@ from outatime.timeseries.time_series import TimeSeries
 default_granularity_set = [YearlyGranularity, QuarterlyGranularity, MonthlyGranularity, WeeklyGranularity, DailyGranularity]
 
 
-def data_generation(start_date='2020-01-07', end_date='2025-01-04', step=relativedelta(days=1), empty_data_step=2, empty_data={}, possible_granularity_list=default_granularity_set):
+def data_generation(start_date='2020-01-07', end_date='2025-01-04', step=relativedelta(days=1), empty_data_step=2,
+                    empty_data={}, possible_granularity_list=default_granularity_set):
     z = []
     i = 0
     print("Generating input time series...")
@@ -31,5 +32,16 @@ def data_generation(start_date='2020-01-07', end_date='2025-01-04', step=relativ
     return tsl
 
 
+def gapped_generation(start_date='2020-01-01', end_date='2021-12-31', empty_data_step=7, empty_data=None,
+                      is_gap=lambda idx: idx % 5 in (1, 2)):
+    # dates with gaps of different lengths, dropping the indexes flagged by 'is_gap'
+    tsl = data_generation(start_date=start_date, end_date=end_date, empty_data_step=empty_data_step, empty_data=empty_data)
+    return TimeSeries([element for idx, element in enumerate(tsl) if not is_gap(idx)])
+
+
+def get_pippo(data):
+    return data['pippo']
+
+
 def compare(expected_res, res) -> bool:
     return all([x == y for x, y in zip(res, expected_res)])